@@ -23,6 +23,28 @@ def create_app():
     # Configuration
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
     app.config['UPLOAD_FOLDER'] = 'uploads'
+    # How often each worker polls the data generation counter for search
+    app.config['STUDENT_INDEX_CHECK_SECONDS'] = float(os.environ.get('STUDENT_INDEX_CHECK_SECONDS', 2))
+    # Per-worker LRU of serialised /api/search responses
+    app.config['SEARCH_CACHE_SIZE'] = int(os.environ.get('SEARCH_CACHE_SIZE', 4096))
+    app.config['SEARCH_CACHE_TTL'] = float(os.environ.get('SEARCH_CACHE_TTL', 300))
+    # Static seat lookup shards (flask --app run export-static writes them here)
+    app.config['STATIC_EXPORT_DIR'] = os.environ.get('STATIC_EXPORT_DIR')
+    # Also republish them at the end of every /api/generate (off: generate does not pay for the export)
+    app.config['STATIC_EXPORT_ON_GENERATE'] = os.environ.get('STATIC_EXPORT_ON_GENERATE', '').lower() in ('1', 'true', 'yes')
+    # Text extraction used by parse_pdf: 'pdfminer' (fast) or 'pdfplumber'
+    app.config['PDF_TEXT_BACKEND'] = os.environ.get('PDF_TEXT_BACKEND', 'pdfminer')
+    # Processes extracting pages of large PDFs in parallel (1 = serial)
+    # Opt-in: os.cpu_count() reports host cores, not the container's CPU quota
+    app.config['PDF_PARSE_WORKERS'] = int(os.environ.get('PDF_PARSE_WORKERS', 1))
+    # Processes parsing the files of one /api/upload/batch concurrently (capped at the file count)
+    app.config['BATCH_PARSE_WORKERS'] = int(os.environ.get('BATCH_PARSE_WORKERS', os.cpu_count() or 1))
+    # Parsed rosters of uploaded PDFs, keyed by content hash (0 bytes = disabled; dir defaults to instance/parse_cache)
+    app.config['PARSE_CACHE_DIR'] = os.environ.get('PARSE_CACHE_DIR')
+    app.config['PARSE_CACHE_MAX_BYTES'] = int(os.environ.get('PARSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # Chunked uploads (/api/upload/chunked): total file size cap and how long an abandoned one is kept
+    app.config['CHUNKED_UPLOAD_MAX_BYTES'] = int(os.environ.get('CHUNKED_UPLOAD_MAX_BYTES', 256 * 1024 * 1024))
+    app.config['CHUNKED_UPLOAD_TTL_SECONDS'] = int(os.environ.get('CHUNKED_UPLOAD_TTL_SECONDS', 24 * 3600))
     
     # SECRET KEY - MUST be set in production
     secret_key = os.environ.get('SECRET_KEY')
@@ -59,11 +81,12 @@ def create_app():
     CORS(app, resources={r"/*": {
         "origins": allowed_origins,
         "supports_credentials": True,
-        "allow_headers": ["Content-Type", "Authorization", "X-CSRFToken"],
+        "allow_headers": ["Content-Type", "Authorization", "X-CSRFToken", "X-Content-SHA256"],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     }})
     
-    # Rate Limiting
+    # Rate Limiting (RATELIMIT_ENABLED=false for local load tests only)
+    app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', 'true').lower() != 'false'
     limiter = Limiter(
         app=app,
         key_func=get_remote_address,
@@ -91,6 +114,11 @@ def create_app():
     from app.extensions import db, compress
     db.init_app(app)
     compress.init_app(app)
+
+    # Optional X-DB-Queries response header (diagnostics / load testing)
+    if os.environ.get('DB_QUERY_COUNT_HEADER'):
+        from app.services.query_counter import install_query_counter
+        install_query_counter(app)
     
     # Initialize Flask-Migrate
     migrate.init_app(app, db)
@@ -106,7 +134,14 @@ def create_app():
         # In production, use flask db upgrade
         if not is_production:
             db.create_all()
+            # create_all skips indexes added to existing tables since
+            from app.services.ingest import ensure_exam_entry_index
+            ensure_exam_entry_index()
         
+        # Seed the data generation counter before anything bumps it
+        from app.services.generation import ensure_generation_row
+        ensure_generation_row()
+
         # Auto-seed default halls if empty
         from app.routes.halls import bootstrap_halls
         bootstrap_halls()
@@ -153,14 +188,26 @@ def create_app():
                 db.session.commit()
                 log_info("Super Admin password updated.")
 
+        # Per-worker student lookup index (rebuilt when the data generation moves)
+        from app.services.student_index import warm_student_index
+        warm_student_index()
+
+        from app.services.response_cache import search_cache
+        search_cache.configure(app.config['SEARCH_CACHE_SIZE'], app.config['SEARCH_CACHE_TTL'])
+
     # Register blueprints
-    from app.routes import upload, halls, seating, auth, admin, csrf as csrf_bp
+    from app.routes import upload, halls, seating, auth, admin, transfer, csrf as csrf_bp
     app.register_blueprint(upload.bp)
     app.register_blueprint(halls.bp)
     app.register_blueprint(seating.bp)
     app.register_blueprint(auth.bp)
     app.register_blueprint(admin.bp)
+    app.register_blueprint(transfer.bp)
     app.register_blueprint(csrf_bp.bp)
+
+    # CLI commands
+    from app.commands import register_commands
+    register_commands(app)
     
     # Error Handlers
     from flask_wtf.csrf import CSRFError
@@ -0,0 +1,24 @@
+"""
+Flask CLI commands (run with `flask --app run <command>`)
+"""
+import click
+
+
+def register_commands(app):
+    """Attach the project's CLI commands to the app"""
+
+    @app.cli.command('export-static')
+    @click.option('--output', '-o', default=None,
+                  help='Output directory (defaults to STATIC_EXPORT_DIR or ./static_export)')
+    @click.option('--prefix-length', default=None, type=int,
+                  help='Register-number prefix length used to shard')
+    def export_static(output, prefix_length):
+        """Publish the student seat lookup as static JSON shards."""
+        from app.services.static_export import export_student_shards, DEFAULT_PREFIX_LENGTH
+
+        output = output or app.config.get('STATIC_EXPORT_DIR') or 'static_export'
+        stats = export_student_shards(output, prefix_length or DEFAULT_PREFIX_LENGTH)
+        click.echo(
+            f"Exported {stats['shards']} shards to {output} "
+            f"({stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed)"
+        )
@@ -1,5 +1,6 @@
+import hashlib
 from functools import wraps
-from flask import session, jsonify
+from flask import session, jsonify, request, make_response
 
 def login_required(f):
     """
@@ -34,3 +35,72 @@ def role_required(roles):
             return f(*args, **kwargs)
         return decorated_function
     return decorator
+
+# Flask-Compress appends ":<algorithm>" to ETags of compressed responses
+_ENCODING_SUFFIXES = (':gzip', ':br', ':deflate', ':zstd')
+
+def generation_etag(cache_control='private, no-cache'):
+    """
+    Decorator for read endpoints whose data only changes when the data
+    generation is bumped (upload, generate, clear, hall edits).
+    The strong ETag is derived from the generation this worker's student index
+    last saw plus the request path/query/body, so If-None-Match is answered
+    before the view runs any query: 304 for GET/HEAD; other methods (POST
+    search) get 412 Precondition Failed, as conditional requests require.
+
+    The generation is re-read from the DB at most every
+    STUDENT_INDEX_CHECK_SECONDS per worker (immediately in the worker that
+    made the write), so for up to that long after a write other workers may
+    still answer 304 for the previous data.
+    Args:
+        cache_control (str): Cache-Control header for the data class.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            from app.services.student_index import student_index
+
+            generation = student_index.refresh()
+            digest = hashlib.sha1(request.full_path.encode())
+            if request.method == 'POST':
+                digest.update(request.get_data())
+            etag = f'g{generation}-{digest.hexdigest()[:16]}'
+
+            matched = _matching_etag(etag)
+            if matched and request.method not in ('GET', 'HEAD'):
+                return make_response('', 412)
+            if matched:
+                response = make_response('', 304)
+                # Echo the representation's own tag (e.g. the ":gzip" variant)
+                response.set_etag(matched)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                # Bodies gzipped by the view (streamed JSON) are a different
+                # representation: tag them like Flask-Compress does
+                if response.headers.get('Content-Encoding') == 'gzip':
+                    response.set_etag(f'{etag}:gzip')
+                else:
+                    response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return decorated_function
+    return decorator
+
+def _matching_etag(etag):
+    """The If-None-Match tag that names this representation (with any encoding suffix), or None"""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match.as_set():
+        base = tag
+        for suffix in _ENCODING_SUFFIXES:
+            if tag.endswith(suffix):
+                base = tag[:-len(suffix)]
+                break
+        if base == etag:
+            return tag
+    return None
@@ -1,8 +1,8 @@
 """
 Models package
 """
-from .sql import Hall, Student, Allocation
+from .sql import Hall, Student, Allocation, HallSketch, DataGeneration, DepartmentCode
 from .schemas import Seat, HallSeating, StudentAllocation, SeatingResult
 from app.extensions import db
 
-__all__ = ['Hall', 'Student', 'Allocation', 'Seat', 'HallSeating', 'StudentAllocation', 'SeatingResult', 'db']
+__all__ = ['Hall', 'Student', 'Allocation', 'HallSketch', 'DataGeneration', 'DepartmentCode', 'Seat', 'HallSeating', 'StudentAllocation', 'SeatingResult', 'db']
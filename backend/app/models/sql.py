@@ -32,6 +32,13 @@ class Student(db.Model):
     # Optional: Original file source or timestamp if needed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Keyset order of /api/students pages
+        db.Index('ix_student_date_session_reg', 'exam_date', 'session', 'register_number'),
+        # One row per exam entry; append uploads skip rows that already exist
+        db.Index('uq_student_exam_entry', 'register_number', 'subject_code', 'exam_date', 'session', unique=True),
+    )
+
     @property
     def registerNumber(self): return self.register_number
     @property
@@ -49,6 +56,10 @@ class Allocation(db.Model):
     col_num = db.Column(db.Integer, nullable=False)
     seat_number = db.Column(db.String(10), nullable=False)
     session_key = db.Column(db.String(50), nullable=False) # e.g. "25-05-2024_FN"
+
+    __table_args__ = (
+        db.Index('ix_allocation_session_hall', 'session_key', 'hall_name'),
+    )
     
     @property
     def registerNumber(self): return self.register_number
@@ -93,6 +104,11 @@ class AuditLog(db.Model):
     ip_address = db.Column(db.String(50), nullable=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Newest-first keyset paging of /api/admin/logs
+        db.Index('ix_audit_log_timestamp_id', 'timestamp', 'id'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -102,3 +118,24 @@ class AuditLog(db.Model):
             'details': self.details,
             'timestamp': self.timestamp.isoformat() + 'Z'  # Append Z to indicate UTC
         }
+
+class HallSketch(db.Model):
+    """Serialised hall grid for one (session, hall) pair, built at generation time"""
+    id = db.Column(db.Integer, primary_key=True)
+    session_key = db.Column(db.String(50), nullable=False)
+    hall_name = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False) # JSON: {hall, grid, studentsCount}
+
+    __table_args__ = (
+        db.UniqueConstraint('session_key', 'hall_name', name='uq_hall_sketch_session_hall'),
+    )
+
+class DataGeneration(db.Model):
+    """Version counters: row 1 is bumped by every write to students, allocations or halls, row 2 by department code edits"""
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+class DepartmentCode(db.Model):
+    """Degree code (digits 7-9 of a register number) -> department, overriding the parser defaults"""
+    code = db.Column(db.String(3), primary_key=True)
+    department = db.Column(db.String(50), nullable=False)
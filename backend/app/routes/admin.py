@@ -1,6 +1,11 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify, session
-from app.models.sql import Admin, AuditLog, db
+from sqlalchemy import tuple_
+from app.models.sql import Admin, AuditLog, DepartmentCode, db
 from app.services.audit import log_action
+from app.services.response_cache import search_cache
+from app.services.pagination import parse_limit, encode_cursor, decode_cursor
+from app.services.generation import bump_department_codes_version
 
 bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
@@ -54,15 +59,82 @@ def delete_user(user_id):
     
     return jsonify({'success': True, 'message': 'User deleted'}), 200
 
+LOG_PAGE_DEFAULT = 100
+LOG_PAGE_MAX = 500
+
 @bp.route('/logs', methods=['GET'])
 def get_logs():
-    # Simple limit 100 for MVP
-    logs = AuditLog.query.order_by(AuditLog.timestamp.desc()).limit(100).all()
+    """
+    Newest-first audit log page.
+    Query params: limit, cursor (nextCursor of the previous page), action,
+    admin (id or username), from / to (ISO date or datetime, inclusive).
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'), LOG_PAGE_DEFAULT, LOG_PAGE_MAX)
+        start = _parse_datetime(request.args.get('from'))
+        end = _parse_datetime(request.args.get('to'), end_of_day=True)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': f'Invalid parameter: {e}'}), 400
+
+    # Username comes from the same query (outer join keeps logs of deleted admins)
+    query = db.session.query(
+        AuditLog.id, AuditLog.admin_id, AuditLog.action, AuditLog.details,
+        AuditLog.timestamp, Admin.username
+    ).outerjoin(Admin, AuditLog.admin_id == Admin.id)
+
+    action = request.args.get('action')
+    if action:
+        query = query.filter(AuditLog.action == action)
+
+    admin = request.args.get('admin')
+    if admin:
+        if admin.isdigit():
+            query = query.filter(AuditLog.admin_id == int(admin))
+        else:
+            query = query.filter(Admin.username == admin)
+
+    if start:
+        query = query.filter(AuditLog.timestamp >= start)
+    if end:
+        query = query.filter(AuditLog.timestamp <= end)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_ts, cursor_id = decode_cursor(cursor, 2)
+            cursor_ts = datetime.fromisoformat(cursor_ts)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+        query = query.filter(tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(cursor_ts, cursor_id))
+
+    rows = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor([page[-1].timestamp, page[-1].id])
+
     return jsonify({
         'success': True,
-        'logs': [l.to_dict() for l in logs]
+        'logs': [{
+            'id': r.id,
+            'admin_id': r.admin_id,
+            'admin_username': r.username or 'Unknown/Deleted',
+            'action': r.action,
+            'details': r.details,
+            'timestamp': r.timestamp.isoformat() + 'Z'  # Append Z to indicate UTC
+        } for r in page],
+        'nextCursor': next_cursor
     }), 200
 
+def _parse_datetime(value, end_of_day=False):
+    """ISO date/datetime (optional trailing Z) -> naive UTC datetime"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.rstrip('Z'))
+    if end_of_day and 'T' not in value:
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return parsed
+
 @bp.route('/logs', methods=['DELETE'])
 def delete_logs():
     if session.get('role') != 'super_admin':
@@ -79,3 +151,57 @@ def delete_logs():
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
+
+@bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss/eviction counters of this worker's search response cache"""
+    return jsonify({
+        'success': True,
+        'search': search_cache.stats()
+    }), 200
+
+@bp.route('/department-codes', methods=['GET'])
+def get_department_codes():
+    """Degree code -> department table used by the PDF parser (defaults + overrides)"""
+    from app.services.pdf_parser import department_table, DEFAULT_DEPARTMENTS
+    overrides = {code: dept for code, dept in db.session.query(DepartmentCode.code, DepartmentCode.department)}
+    return jsonify({
+        'success': True,
+        'departments': department_table(),
+        'defaults': DEFAULT_DEPARTMENTS,
+        'overrides': overrides
+    }), 200
+
+@bp.route('/department-codes', methods=['PUT'])
+def update_department_codes():
+    """
+    Body: {"code": "department", ...}; an empty department removes the
+    override (the built-in default, if any, applies again).
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data:
+        return jsonify({'success': False, 'message': 'Expected an object of code: department'}), 400
+    for code, dept in data.items():
+        if not (isinstance(code, str) and len(code) == 3 and code.isdigit()):
+            return jsonify({'success': False, 'message': f'Invalid degree code: {code}'}), 400
+        if dept is not None and not isinstance(dept, str):
+            return jsonify({'success': False, 'message': f'Invalid department for {code}'}), 400
+
+    for code, dept in data.items():
+        dept = (dept or '').strip().upper()
+        row = db.session.get(DepartmentCode, code)
+        if not dept:
+            if row:
+                db.session.delete(row)
+        elif row:
+            row.department = dept
+        else:
+            db.session.add(DepartmentCode(code=code, department=dept))
+    # Parsers in every worker reload the table; seating data is unaffected
+    bump_department_codes_version()
+    db.session.commit()
+
+    log_action(session['user_id'], 'UPDATE_DEPARTMENT_CODES', f'Updated department codes: {", ".join(sorted(data))}')
+
+    from app.services.pdf_parser import department_table
+    return jsonify({'success': True, 'departments': department_table()}), 200
@@ -5,7 +5,9 @@ from flask import Blueprint, request, jsonify
 import uuid
 from app.models import Hall
 from app.extensions import db
-from app.decorators import login_required, role_required
+from app.decorators import login_required, role_required, generation_etag
+from app.services.generation import bump_generation
+from app.services.hall_sketch import invalidate_sketches
 
 bp = Blueprint('halls', __name__, url_prefix='/api')
 
@@ -60,6 +62,7 @@ DEFAULT_HALLS = [
 
 @bp.route('/halls', methods=['GET'])
 @login_required
+@generation_etag()
 def get_halls():
     """Get all halls sorted by priority then block then name"""
     # Sort by priority (asc) then block (asc) then name (asc)
@@ -85,6 +88,7 @@ def create_hall():
     )
     
     db.session.add(hall)
+    bump_generation()
     db.session.commit()
     
     return jsonify(hall.to_dict()), 201
@@ -99,6 +103,7 @@ def update_hall(hall_id):
     if not hall:
         return jsonify({'error': 'Hall not found'}), 404
     
+    old_name = hall.name
     if 'name' in data:
         hall.name = data['name']
     if 'block' in data:
@@ -114,6 +119,9 @@ def update_hall(hall_id):
     elif 'rows' in data or 'columns' in data:
          hall.capacity = hall.rows * hall.columns
     
+    invalidate_sketches([old_name, hall.name])
+    
+    bump_generation()
     db.session.commit()
     return jsonify(hall.to_dict()), 200
 
@@ -132,7 +140,10 @@ def update_capacity_bulk():
         with open("backend_log.txt", "a") as f:
             f.write(f"DEBUG: Bulk update for IDs: {hall_ids} with capacity: {capacity}\n")
             
+        hall_names = [name for (name,) in db.session.query(Hall.name).filter(Hall.id.in_(hall_ids))]
         updated_count = Hall.query.filter(Hall.id.in_(hall_ids)).update({'capacity': capacity}, synchronize_session=False)
+        invalidate_sketches(hall_names)
+        bump_generation()
         db.session.commit()
         
         with open("backend_log.txt", "a") as f:
@@ -170,6 +181,9 @@ def update_dimensions_bulk():
                 hall.columns = columns
             hall.capacity = hall.rows * hall.columns
         
+        invalidate_sketches([hall.name for hall in halls])
+        
+        bump_generation()
         db.session.commit()
         return jsonify({'success': True, 'updated': len(halls)}), 200
     except Exception as e:
@@ -185,6 +199,8 @@ def delete_hall(hall_id):
         return jsonify({'error': 'Hall not found'}), 404
     
     db.session.delete(hall)
+    invalidate_sketches([hall.name])
+    bump_generation()
     db.session.commit()
     return jsonify({'message': 'Hall deleted successfully'}), 200
 
@@ -194,6 +210,8 @@ def initialize_default_halls():
     """Initialize default hall configuration (Force Reset)"""
     # Clear existing halls
     Hall.query.delete()
+    invalidate_sketches()
+    bump_generation()
     db.session.commit()
     
     # Re-seed
@@ -240,6 +258,7 @@ def reorder_halls():
             # if hall.block != first_hall.block: ...
             hall.priority = base_priority + index
             
+    bump_generation()
     db.session.commit()
     return jsonify({'success': True}), 200
 
@@ -267,5 +286,6 @@ def bootstrap_halls(force=False):
         halls_to_add.append(hall)
     
     db.session.add_all(halls_to_add)
+    bump_generation()
     db.session.commit()
     return halls_to_add
@@ -1,13 +1,24 @@
 """
 Seating Route - Generate seating arrangements and download results
 """
-from flask import Blueprint, request, jsonify, send_file, session
+from flask import Blueprint, request, jsonify, send_file, session, current_app
 from app.services.audit import log_action
 from app.models import db, Student, Hall, Allocation, SeatingResult, HallSeating, Seat
 from app.services import allocate_session_strict, generate_hall_wise_excel, generate_student_wise_excel
+from app.services.generation import bump_generation
+from app.services.hall_sketch import store_session_sketches, invalidate_sketches, get_sketch_payloads, split_session_key
+from app.services.student_index import student_index
+from app.services.response_cache import search_cache
+from app.services.static_export import export_student_shards
+from app.services.compact_seating import build_compact_session, dumps as compact_dumps
+from app.services.json_stream import stream_json_response, encode as json_encode
 from collections import defaultdict
-from app.decorators import role_required
+from sqlalchemy import func, tuple_
+from app.decorators import role_required, generation_etag
 import uuid
+import json
+import csv
+import io
 
 bp = Blueprint('seating', __name__, url_prefix='/api')
 
@@ -17,8 +28,34 @@ def generate_seating():
     """
     Generate seating arrangements for all sessions found in student data.
     Groups students by (ExamDate, Session) and runs allocation for each group.
+    Optional JSON body limits the run (other sessions keep their allocations):
+    - {"sessions": ["05-Jan-2026_FN", ...]}
+    - {"pendingOnly": true}: sessions with students but no allocations
+      (e.g. those touched by an append upload)
     """
-    students = Student.query.all()
+    data = request.get_json(silent=True) or {}
+    target_keys = None
+    if data.get('pendingOnly'):
+        target_keys = pending_session_keys()
+        if not target_keys:
+            return jsonify({'success': True, 'sessions': [], 'message': 'No sessions need regeneration'}), 200
+    elif data.get('sessions') is not None:
+        requested = data['sessions']
+        if not isinstance(requested, list) or not requested or not all(isinstance(k, str) for k in requested):
+            return jsonify({'error': 'sessions must be a non-empty list of session keys'}), 400
+        known = {f'{exam_date}_{sess}' for exam_date, sess in
+                 db.session.query(Student.exam_date, Student.session).distinct()}
+        unknown = [k for k in requested if k not in known]
+        if unknown:
+            return jsonify({'error': f'Unknown sessions: {", ".join(unknown)}'}), 400
+        target_keys = list(dict.fromkeys(requested))
+
+    query = Student.query
+    if target_keys is not None:
+        query = query.filter(tuple_(Student.exam_date, Student.session).in_(
+            [split_session_key(k) for k in target_keys]
+        ))
+    students = query.all()
     if not students:
         return jsonify({'error': 'No student data available. Please upload student data first.'}), 400
     
@@ -42,7 +79,14 @@ def generate_seating():
         # But if we call generate multiple times without upload (e.g. changing settings),
         # we should probably wipe allocations for the sessions we are generating.
         # For simplicity and safety, let's wipe ALL allocations when generating new ones.
-        Allocation.query.delete()
+        if target_keys is None:
+            Allocation.query.delete()
+            invalidate_sketches()
+        else:
+            keys = list(session_groups)
+            Allocation.query.filter(Allocation.session_key.in_(keys)).delete(synchronize_session=False)
+            invalidate_sketches(session_keys=keys)
+        bump_generation()
         db.session.commit()
         
         for session_key, group_students in session_groups.items():
@@ -64,6 +108,7 @@ def generate_seating():
                 allocations_to_add.append(alloc)
             
             db.session.add_all(allocations_to_add)
+            store_session_sketches(session_key, [hs.hall for hs in result.halls], allocations_to_add)
             
             # Format for Response
             # We can use the 'result' object directly as it has the structure we need
@@ -123,10 +168,19 @@ def generate_seating():
                 ]
             }
 
+        bump_generation()
         db.session.commit()
         
         log_action(session['user_id'], 'GENERATE_SEATING', f'Generated seating for {len(results)} sessions')
 
+        export_dir = current_app.config.get('STATIC_EXPORT_DIR')
+        if export_dir and current_app.config.get('STATIC_EXPORT_ON_GENERATE'):
+            try:
+                export_student_shards(export_dir)
+            except Exception:
+                # The allocation itself succeeded; the static copy can be re-run from the CLI
+                current_app.logger.exception('Static export after generate failed')
+
         return jsonify({
             'success': True, 
             'sessions': list(results.keys())
@@ -136,8 +190,15 @@ def generate_seating():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def pending_session_keys():
+    """Session keys that have students but no allocations (need (re)generation)"""
+    student_keys = {f'{d}_{s}' for d, s in db.session.query(Student.exam_date, Student.session).distinct()}
+    allocated = {k for (k,) in db.session.query(Allocation.session_key).distinct()}
+    return sorted(student_keys - allocated)
+
 @bp.route('/sessions', methods=['GET'])
 @role_required(['admin', 'super_admin'])
+@generation_etag()
 def get_sessions():
     """
     Get list of available sessions from existing allocations.
@@ -145,7 +206,7 @@ def get_sessions():
     try:
         distinct_sessions = db.session.query(Allocation.session_key).distinct().all()
         sessions = sorted([s[0] for s in distinct_sessions])
-        return jsonify({'success': True, 'sessions': sessions}), 200
+        return jsonify({'success': True, 'sessions': sessions, 'pending': pending_session_keys()}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -159,6 +220,8 @@ def clear_allocations():
     try:
         Allocation.query.delete()
         Student.query.delete()
+        invalidate_sketches()
+        bump_generation()
         db.session.commit()
         
         log_action(session['user_id'], 'CLEAR_SEATING', 'Cleared all allocations and student data')
@@ -170,83 +233,138 @@ def clear_allocations():
 
 @bp.route('/seating/<session_key>', methods=['GET'])
 @role_required(['admin', 'super_admin'])
+@generation_etag()
 def get_session_seating(session_key):
     """
     Get detailed seating result for a specific session.
+    ?format=compact returns the columnar payload (see services/compact_seating.py).
     """
     try:
-        # Check if session exists
-        exists = db.session.query(Allocation).filter_by(session_key=session_key).first()
-        if not exists:
+        # Hall order follows allocation order, as in reconstruct_seating_result
+        hall_order = [name for name, _ in db.session.query(
+            Allocation.hall_name, func.min(Allocation.id)
+        ).filter_by(session_key=session_key).group_by(Allocation.hall_name).order_by(func.min(Allocation.id))]
+        if not hall_order:
              return jsonify({'error': 'Session not found'}), 404
 
-        result = reconstruct_seating_result(session_key)
-        if not result:
-             return jsonify({'error': 'Failed to reconstruct results'}), 500
-             
-        # Convert to JSON response format
-        halls_response = []
-        for hs in result.halls:
-            grid_response = []
-            for row in hs.grid:
-                row_response = []
-                for seat in row:
-                    seat_data = {
-                        'row': seat.row,
-                        'col': seat.col,
-                        'subject': seat.subject,
-                        'department': seat.department,
-                        'seatNumber': seat.seatNumber,
-                        'student': None
-                    }
-                    if seat.student:
-                        seat_data['student'] = {
-                            'registerNumber': seat.student.registerNumber,
-                            'subjectCode': seat.student.subjectCode,
-                            'department': seat.student.department,
-                            'examDate': seat.student.examDate,
-                            'session': seat.student.session
-                        }
-                    row_response.append(seat_data)
-                grid_response.append(row_response)
-            
-            halls_response.append({
-                'hall': {
-                    'id': hs.hall.id,
-                    'name': hs.hall.name,
-                    'block': hs.hall.block,
-                    'rows': hs.hall.rows,
-                    'columns': hs.hall.columns,
-                    'capacity': hs.hall.capacity
-                },
-                'grid': grid_response,
-                'studentsCount': hs.studentsCount
-            })
-
-        response_data = {
-            'totalStudents': result.totalStudents,
-            'hallsUsed': result.hallsUsed,
-            'halls': halls_response,
-            'studentAllocation': [
-                {
-                    'registerNumber': sa.registerNumber,
-                    'department': sa.department,
-                    'subject': sa.subject,
-                    'hallName': sa.hallName,
-                    'row': sa.row,
-                    'col': sa.col,
-                    'seatNumber': sa.seatNumber
-                }
-                for sa in result.studentAllocation
-            ]
-        }
-        
-        return jsonify(response_data), 200
+        if request.args.get('format') == 'compact':
+            allocations = db.session.query(
+                Allocation.register_number, Allocation.department, Allocation.subject_code,
+                Allocation.hall_name, Allocation.row_num, Allocation.col_num
+            ).filter_by(session_key=session_key).order_by(Allocation.id).all()
+            hall_map = {}
+            for hall in Hall.query.all():
+                hall_map.setdefault(hall.name, hall)
+            return _json_response(compact_dumps(build_compact_session(session_key, allocations, hall_map)), 200)
+
+        return stream_json_response(_iter_session_seating(session_key, hall_order))
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/seating/<session_key>/halls', methods=['GET'])
+@role_required(['admin', 'super_admin'])
+@generation_etag()
+def get_session_halls(session_key):
+    """
+    Light per-hall summary of a session (no grids): name, block, student count
+    and subject/department breakdown, in allocation order.
+    """
+    rows = db.session.query(
+        Allocation.hall_name, Allocation.subject_code, Allocation.department,
+        func.count(Allocation.id), func.min(Allocation.id)
+    ).filter_by(session_key=session_key).group_by(
+        Allocation.hall_name, Allocation.subject_code, Allocation.department
+    ).all()
+    if not rows:
+        return jsonify({'error': 'Session not found'}), 404
+
+    hall_blocks = {}
+    for name, block in db.session.query(Hall.name, Hall.block):
+        hall_blocks.setdefault(name, block)
+
+    summaries = {}
+    first_ids = {}
+    for hall_name, subject, department, count, first_id in rows:
+        summary = summaries.setdefault(hall_name, {
+            'name': hall_name,
+            'block': hall_blocks.get(hall_name, ''),
+            'studentsCount': 0,
+            'subjects': defaultdict(int),
+            'departments': defaultdict(int)
+        })
+        summary['studentsCount'] += count
+        summary['subjects'][subject] += count
+        summary['departments'][department] += count
+        first_ids[hall_name] = min(first_ids.get(hall_name, first_id), first_id)
+
+    halls = sorted(summaries.values(), key=lambda h: first_ids[h['name']])
+    return jsonify({
+        'success': True,
+        'session': session_key,
+        'totalStudents': sum(h['studentsCount'] for h in halls),
+        'hallsUsed': len(halls),
+        'halls': halls
+    }), 200
+
+@bp.route('/seating/<session_key>/halls/<hall_name>', methods=['GET'])
+@role_required(['admin', 'super_admin'])
+@generation_etag()
+def get_session_hall_seating(session_key, hall_name):
+    """Grid of one hall in one session (same shape as an entry of /seating/<key> halls)"""
+    payload = get_sketch_payloads([(session_key, hall_name)]).get((session_key, hall_name))
+    if not payload:
+        return jsonify({'error': 'No seating found for this hall and session'}), 404
+    return _json_response(payload, 200)
+
+
+STREAM_BATCH_ROWS = 1000
+STREAM_BATCH_HALLS = 20
+
+def _iter_session_seating(session_key, hall_order):
+    """
+    Yield the session seating JSON piece by piece: the flat allocation list
+    in row batches, then the stored hall sketches a few halls at a time.
+    """
+    yield '{"studentAllocation":['
+    total = 0
+    rows = db.session.query(
+        Allocation.register_number, Allocation.department, Allocation.subject_code,
+        Allocation.hall_name, Allocation.row_num, Allocation.col_num, Allocation.seat_number
+    ).filter_by(session_key=session_key).order_by(Allocation.id).yield_per(STREAM_BATCH_ROWS)
+    for a in rows:
+        if total:
+            yield ','
+        yield json_encode({
+            'registerNumber': a.register_number,
+            'department': a.department,
+            'subject': a.subject_code,
+            'hallName': a.hall_name,
+            'row': a.row_num,
+            'col': a.col_num,
+            'seatNumber': a.seat_number
+        })
+        total += 1
+
+    # Stored sketches are spliced in without re-encoding them
+    yield '],"halls":['
+    halls_used = 0
+    for i in range(0, len(hall_order), STREAM_BATCH_HALLS):
+        batch = hall_order[i:i + STREAM_BATCH_HALLS]
+        payloads = get_sketch_payloads([(session_key, name) for name in batch])
+        for name in batch:
+            payload = payloads.get((session_key, name))
+            if not payload:
+                continue
+            if halls_used:
+                yield ','
+            yield payload
+            halls_used += 1
+
+    yield f'],"totalStudents":{total},"hallsUsed":{halls_used}}}'
+
+
 # Helper import moved to top-level to avoid circular dependency issues inside function
 from app.services.seating_algorithm import get_snake_seat_number
 
@@ -409,6 +527,7 @@ def download_student_wise():
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/search', methods=['POST'])
+@generation_etag('no-cache')
 def search_student():
     """
     Search for a student's allocation details by register number.
@@ -420,89 +539,160 @@ def search_student():
     if not reg_no:
         return jsonify({'error': 'Register number is required'}), 400
 
-    # Query Allocation table
-    allocations = Allocation.query.filter_by(register_number=reg_no).all()
-    
+    # The full hall grid is opt-in; by default only the seat facts are sent
+    include_grid = 'grid' in request.args.get('include', '').split(',')
+
+    # Keyed on the generation the index is at, so any write invalidates it
+    cache_key = (reg_no, student_index.refresh(), include_grid)
+    cached = search_cache.get(cache_key)
+    if cached is None:
+        cached = _render_search(reg_no, include_grid)
+        search_cache.put(cache_key, cached)
+
+    body, status = cached
+    return _json_response(body, status)
+
+
+def _render_search(reg_no, include_grid=False):
+    """Serialise the search response for one register number as (body, status)"""
+    # Served from the per-worker index; SQL is only touched when the data
+    # generation moved on or a hall sketch is not memoised yet
+    entries = student_index.lookup(reg_no)
+    payloads = {}
+    if include_grid:
+        payloads = student_index.sketch_payloads((e.session_key, e.hall_name) for e in entries)
+
     matches = []
+    for entry in entries:
+        match = {
+            'session': entry.session_key,
+            'formattedSession': entry.session_key.replace('_', ' '),
+            'subject': entry.subject_code,
+            'hallName': entry.hall_name,
+            'block': student_index.hall_block(entry.hall_name),
+            'seatNumber': entry.seat_number,
+            'row': entry.row,
+            'col': entry.col
+        }
+        if include_grid:
+            payload = payloads.get((entry.session_key, entry.hall_name))
+            if not payload:
+                continue
+            matches.append(_splice_json(match, 'hallSeating', payload))
+        else:
+            matches.append(json.dumps(match, separators=(',', ':')))
     
-    for alloc in allocations:
-        # We need to construct the 'hallSeating' grid view for the frontend
-        # This is expensive if we do it for every search, but necessary for the UI "Sketch" view.
-        # Ideally, we reconstruct ONLY the hall this student is in.
-        
-        hall = Hall.query.filter_by(name=alloc.hall_name).first()
-        if not hall:
-            continue
-            
-        # Get all allocations for THIS hall and THIS session to build grid
-        hall_allocs = Allocation.query.filter_by(
-            session_key=alloc.session_key, 
-            hall_name=alloc.hall_name
-        ).all()
-        
-        # Build Grid
-        from app.services.seating_algorithm import get_snake_seat_number
-        grid_data = []
-        students_count = len(hall_allocs)
-        
-        # Fill map: (row, col) -> alloc
-        seat_map = {(a.row_num, a.col_num): a for a in hall_allocs}
-        
-        for r in range(hall.rows):
-            row_data = []
-            for c in range(hall.columns):
-                seat_num = get_snake_seat_number(r, c, hall.rows)
-                cell_alloc = seat_map.get((r, c))
-                
-                seat_obj = {
-                    'row': r,
-                    'col': c,
-                    'seatNumber': str(seat_num),
-                    'student': None,
-                    'subject': None,
-                    'department': None
+    if not matches:
+        return json.dumps({'error': 'No allocation found for this register number'}), 404
+
+    return '{"success":true,"allocations":[' + ','.join(matches) + ']}', 200
+
+
+@bp.route('/halls/<hall_name>/sketch', methods=['GET'])
+@generation_etag('public, max-age=60')
+def get_hall_sketch(hall_name):
+    """
+    Hall grid (sketch) of one hall in one session, as shown on the student page.
+    Query: ?session=<session_key>
+    """
+    session_key = request.args.get('session')
+    if not session_key:
+        return jsonify({'error': 'session is required'}), 400
+
+    payload = student_index.sketch_payloads([(session_key, hall_name)]).get((session_key, hall_name))
+    if not payload:
+        return jsonify({'error': 'No seating found for this hall and session'}), 404
+
+    return _json_response(payload, 200)
+
+
+MAX_BATCH_SEARCH = 5000
+BATCH_CSV_COLUMNS = ['registerNumber', 'session', 'subject', 'hallName', 'seatNumber']
+
+@bp.route('/search/batch', methods=['POST'])
+@role_required(['admin', 'super_admin'])
+def search_students_batch():
+    """
+    Resolve many register numbers in one request (no hall grids).
+    Admins only: a single request can list a whole department's seats.
+    Body: {"registerNumbers": [...]} or {"range": {"from": "...", "to": "..."}}
+    Optional: "format": "csv" (or ?format=csv) for a notice-board friendly file.
+    """
+    data = request.get_json(silent=True) or {}
+    reg_nos = data.get('registerNumbers')
+    reg_range = data.get('range')
+
+    if reg_nos is not None:
+        if not isinstance(reg_nos, list):
+            return jsonify({'error': 'registerNumbers must be a list'}), 400
+        reg_nos = list(dict.fromkeys(str(r).strip() for r in reg_nos if str(r).strip()))
+        if not reg_nos:
+            return jsonify({'error': 'Register numbers are required'}), 400
+        if len(reg_nos) > MAX_BATCH_SEARCH:
+            return jsonify({'error': f'At most {MAX_BATCH_SEARCH} register numbers per request'}), 400
+        found = student_index.lookup_many(reg_nos)
+    elif isinstance(reg_range, dict):
+        first = str(reg_range.get('from', '')).strip()
+        last = str(reg_range.get('to', '')).strip()
+        if not (first.isdigit() and last.isdigit() and len(first) == len(last)):
+            return jsonify({'error': 'Range bounds must be register numbers of equal length'}), 400
+        if first > last:
+            return jsonify({'error': 'Range start must not exceed range end'}), 400
+        if int(last) - int(first) >= MAX_BATCH_SEARCH:
+            return jsonify({'error': f'Range may span at most {MAX_BATCH_SEARCH} register numbers'}), 400
+        found = student_index.lookup_range(first, last)
+        # Only register numbers of the same width belong to the range
+        found = {r: e for r, e in found.items() if len(r) == len(first)}
+        reg_nos = list(found)
+    else:
+        return jsonify({'error': 'Provide registerNumbers or range'}), 400
+
+    results = [
+        {
+            'registerNumber': reg_no,
+            'allocations': [
+                {
+                    'session': e.session_key,
+                    'subject': e.subject_code,
+                    'hallName': e.hall_name,
+                    'seatNumber': e.seat_number
                 }
-                
-                if cell_alloc:
-                    parts = cell_alloc.session_key.rsplit('_', 1)
-                    e_date = parts[0]
-                    sess = parts[1] if len(parts) > 1 else ""
-                    seat_obj['student'] = {
-                        'registerNumber': cell_alloc.register_number,
-                        'subjectCode': cell_alloc.subject_code,
-                        'department': cell_alloc.department,
-                        'examDate': e_date,
-                        'session': sess
-                    }
-                    seat_obj['subject'] = cell_alloc.subject_code
-                    seat_obj['department'] = cell_alloc.department
-                
-                row_data.append(seat_obj)
-            grid_data.append(row_data)
-
-        hall_data = {
-            'hall': {
-                'id': hall.id,
-                'name': hall.name,
-                'block': hall.block,
-                'rows': hall.rows,
-                'columns': hall.columns,
-                'capacity': hall.capacity
-            },
-            'grid': grid_data,
-            'studentsCount': students_count
+                for e in found.get(reg_no, ())
+            ]
         }
+        for reg_no in reg_nos
+    ]
+
+    output_format = request.args.get('format') or data.get('format')
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(BATCH_CSV_COLUMNS)
+        for item in results:
+            if not item['allocations']:
+                writer.writerow([item['registerNumber'], '', '', '', ''])
+            for a in item['allocations']:
+                writer.writerow([item['registerNumber'], a['session'], a['subject'], a['hallName'], a['seatNumber']])
+        return current_app.response_class(
+            buffer.getvalue(), status=200, mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename="Seat Allocation.csv"'}
+        )
+
+    return jsonify({
+        'success': True,
+        'count': len(results),
+        'notFound': [item['registerNumber'] for item in results if not item['allocations']],
+        'results': results
+    }), 200
+
+
+def _splice_json(data, key, raw_value):
+    """Encode a dict and append one already-serialised JSON value under key"""
+    body = json.dumps(data, separators=(',', ':'))
+    separator = ',' if len(data) else ''
+    return f'{body[:-1]}{separator}{json.dumps(key)}:{raw_value}}}'
 
-        matches.append({
-            'session': alloc.session_key,
-            'subject': alloc.subject_code,
-            'hallName': alloc.hall_name,
-            'seatNumber': alloc.seat_number,
-            'formattedSession': alloc.session_key.replace('_', ' '),
-            'hallSeating': hall_data
-        })
-    
-    if not matches:
-        return jsonify({'error': 'No allocation found for this register number'}), 404
 
-    return jsonify({'success': True, 'allocations': matches}), 200
+def _json_response(body, status):
+    """Wrap an already-serialised JSON body in a response"""
+    return current_app.response_class(body, status=status, mimetype='application/json')
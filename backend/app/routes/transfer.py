@@ -0,0 +1,93 @@
+"""
+Transfer Route - Parquet export / import of students and allocations
+"""
+import io
+import tempfile
+from flask import Blueprint, request, jsonify, session, send_file
+from app.decorators import role_required
+from app.services.audit import log_action
+from app.services.ingest import replace_students, append_students, first_row_or_error
+from app.services.parquet_io import (
+    TABLES, parquet_available, export_parquet, iter_parquet_rows, import_allocations
+)
+
+bp = Blueprint('transfer', __name__, url_prefix='/api')
+
+PARQUET_MIMETYPE = 'application/vnd.apache.parquet'
+UPLOAD_MODES = ('replace', 'append')
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # Larger uploads are spooled to disk
+
+
+def _unavailable():
+    return jsonify({'error': 'Parquet support requires the pyarrow package on the server'}), 501
+
+
+@bp.route('/export/<kind>.parquet', methods=['GET'])
+@role_required(['admin', 'super_admin'])
+def export_table(kind):
+    """Download all students or allocations as a Parquet file"""
+    if kind not in TABLES:
+        return jsonify({'error': f'Unknown table: {kind}'}), 404
+    if not parquet_available():
+        return _unavailable()
+
+    buffer = io.BytesIO()
+    export_parquet(kind, buffer)
+    buffer.seek(0)
+    return send_file(buffer, mimetype=PARQUET_MIMETYPE, as_attachment=True, download_name=f'{kind}.parquet')
+
+
+@bp.route('/import/<kind>.parquet', methods=['POST'])
+@role_required(['admin', 'super_admin'])
+def import_table(kind):
+    """
+    Load students or allocations from an uploaded Parquet file (form field
+    "file"). Students: mode=replace (default, clears allocations) or append.
+    Allocations always replace the current ones, so import students first.
+    """
+    if kind not in TABLES:
+        return jsonify({'error': f'Unknown table: {kind}'}), 404
+    if not parquet_available():
+        return _unavailable()
+
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        return jsonify({'error': 'No file provided'}), 400
+    mode = (request.form.get('mode') or request.args.get('mode') or 'replace').lower()
+    if mode not in UPLOAD_MODES or (kind == 'allocations' and mode != 'replace'):
+        return jsonify({'error': 'mode must be "replace" or "append" (allocations: "replace")'}), 400
+
+    # Parquet needs a seekable source (the footer is at the end of the file)
+    source = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        file.save(source)
+        source.seek(0)
+        rows = iter_parquet_rows(source, kind)
+        if kind == 'students':
+            # An empty file must not wipe the roster
+            rows = first_row_or_error(rows)
+            result = append_students(rows) if mode == 'append' else replace_students(rows)
+            count = result['count']
+            response = {
+                'success': True,
+                'mode': mode,
+                'studentsCount': count,
+                'warnings': result['warnings'],
+                'validation': result['validation']
+            }
+            if mode == 'append':
+                response['skipped'] = result['skipped']
+                response['affectedSessions'] = result['affectedSessions']
+        else:
+            count = import_allocations(rows)
+            response = {'success': True, 'mode': mode, 'allocationsCount': count}
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        source.close()
+
+    log_action(session['user_id'], 'IMPORT_DATA', f'Imported {count} {kind} from {file.filename} ({mode})')
+    response['message'] = f'Successfully imported {count} {kind}'
+    return jsonify(response), 200
@@ -3,15 +3,32 @@ Upload Route - Handle file uploads and student data parsing
 """
 from flask import Blueprint, request, jsonify, current_app, session
 import os
+import io
+import csv
+import time
+import shutil
+import tempfile
 from werkzeug.utils import secure_filename
 from app.services.audit import log_action
 from app.models import db, Student
-from app.services import parse_file, validate_student_data
-from app.decorators import role_required
+from app.services import iter_tabular_rows
+from app.services.generation import bump_generation
+from app.services.hall_sketch import invalidate_sketches
+from app.services.ingest import replace_students, append_students, first_row_or_error
+from app.services.parse_cache import ParseCache, RowCollector, save_and_hash, cache_key
+from app.services.batch_upload import parse_uploads, BATCH_EXTENSIONS
+from app.services.chunked_upload import ChunkedUploads, ChunkOffsetError, CHUNK_BYTES
+from app.decorators import role_required, generation_etag
+from app.services.json_stream import stream_json_response, iter_json_array, encode as json_encode
+from app.services.pagination import parse_limit, encode_cursor, decode_cursor
+from sqlalchemy import tuple_
 
 bp = Blueprint('upload', __name__, url_prefix='/api')
 
-ALLOWED_EXTENSIONS = {'pdf'}
+ALLOWED_EXTENSIONS = {'pdf', 'csv', 'xlsx'}
+TABULAR_EXTENSIONS = {'csv', 'xlsx'}
+STREAM_BATCH_ROWS = 1000
+UPLOAD_MODES = ('replace', 'append')
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -19,7 +36,7 @@ def allowed_file(filename):
 @bp.route('/upload', methods=['POST'])
 @role_required(['admin', 'super_admin'])
 def upload_file():
-    """Upload and parse Excel/CSV file with student data"""
+    """Upload and parse a PDF nominal roll or an Excel/CSV file with student data"""
     # Removed manual session check, handled by decorator
         
     if 'file' not in request.files:
@@ -34,79 +51,367 @@ def upload_file():
         return jsonify({'error': 'No file selected'}), 400
     
     if not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Please upload a .pdf file'}), 400
+        return jsonify({'error': 'Invalid file type. Please upload a .pdf, .csv or .xlsx file'}), 400
+    
+    mode, error = _upload_mode()
+    if error:
+        return error
     
     try:
-        # Save file temporarily
+        # Save file temporarily (hashed on the way to disk)
         filename = secure_filename(file.filename)
         upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
         os.makedirs(upload_folder, exist_ok=True)
         file_path = os.path.join(upload_folder, filename)
-        file.save(file_path)
-        
-        # Parse file - returns list of Student objects (transient)
-        from app.services import parse_pdf
-        students = parse_pdf(file_path)
+        content_hash = save_and_hash(file, file_path)
         
-        # Validate data
-        warnings = validate_student_data(students)
+        return _ingest_saved_file(file_path, filename, content_hash, mode)
         
-        # Auto-Wipe: Clear existing data for fresh start
-        # This matches the requirement: "Show only till next exam hall allocation"
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _ingest_saved_file(file_path, filename, content_hash, mode):
+    """
+    Parse a saved upload (PDF via the parse cache, or CSV/XLSX) into the
+    roster; returns the JSON response for /upload. The file is removed
+    whether or not the ingest succeeds (chunked uploads can be 256MB).
+    """
+    try:
+        return _ingest_file(file_path, filename, content_hash, mode)
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+def _ingest_file(file_path, filename, content_hash, mode):
+    # replace: new roster (default); append: add only new exam entries
+    write_students = append_students if mode == 'append' else replace_students
+    
+    from app.services.pdf_parser import iter_pdf_students, ParseStats, PARSER_VERSION, department_table
+    if filename.rsplit('.', 1)[-1].lower() in TABULAR_EXTENSIONS:
+        # Spreadsheets are cheap to re-read: cleaned chunk by chunk
+        # straight into the batched inserts, no parse cache
+        cached = None
         try:
-            # Delete all allocations first (foreign key conceptual dependency)
-            from app.models import Allocation, Student
-            Allocation.query.delete()
-            Student.query.delete()
-            
-            # Add new students
-            db.session.add_all(students)
-            db.session.commit()
-            
-        except Exception as db_err:
-            db.session.rollback()
-            raise db_err
-        
-        # Clean up file
-        os.remove(file_path)
-        
-        log_action(session['user_id'], 'UPLOAD_DATA', f'Uploaded {len(students)} students from {filename}')
+            rows = first_row_or_error(iter_tabular_rows(file_path, department_table()))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        result = write_students(rows)
+        parse_summary = {'rows': result['validation']['rows']}
+        cache_status = None
+    else:
+        cache = ParseCache.from_config()
+        key = cache_key(content_hash, PARSER_VERSION, department_table())
+        cached = cache.get(key)
         
+        if cached:
+            # Known file: straight to the DB write
+            rows, parse_summary = cached
+            result = write_students(rows)
+        else:
+            # Stream pages -> student rows -> validation -> batched inserts;
+            # the old roster is swapped out in the same transaction
+            stats = ParseStats()
+            rows = iter_pdf_students(file_path, stats=stats)
+            if cache.enabled:
+                rows = RowCollector(rows)  # Compact copy for the parse cache
+            result = write_students(rows)
+            parse_summary = stats.summary()
+            if cache.enabled and rows.packable:
+                try:
+                    cache.put(key, rows, parse_summary)
+                except OSError as cache_err:
+                    current_app.logger.warning(f"Could not write parse cache: {cache_err}")
+        cache_status = 'hit' if cached else 'miss'
+    current_app.logger.info(f"Parsed {filename} ({'cached' if cached else 'parsed'}): {parse_summary}")
+    
+    log_action(session['user_id'], 'UPLOAD_DATA', f'Uploaded {result["count"]} students from {filename} ({mode})')
+    
+    response = {
+        'success': True,
+        'message': f'Successfully uploaded {result["count"]} students',
+        'mode': mode,
+        'studentsCount': result['count'],
+        'students': result['preview'],  # First 10 as preview
+        'warnings': result['warnings'],
+        'validation': result['validation'],
+        'parseStats': parse_summary,
+        'parseCache': cache_status
+    }
+    if mode == 'append':
+        response['skipped'] = result['skipped']
+        response['affectedSessions'] = result['affectedSessions']
+    
+    return jsonify(response), 200
+
+@bp.route('/upload/batch', methods=['POST'])
+@role_required(['admin', 'super_admin'])
+def upload_batch():
+    """
+    Upload several roster files (PDF / CSV / XLSX) as one dataset.
+    Files are parsed concurrently, merged in upload order with repeated
+    (register number, subject, date, session) rows dropped, and replace the
+    current roster in a single transaction. Nothing is written if any file
+    fails to parse.
+    """
+    files = request.files.getlist('files') or request.files.getlist('file')
+    files = [f for f in files if f.filename]
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+    bad = [f.filename for f in files if f.filename.rsplit('.', 1)[-1].lower() not in BATCH_EXTENSIONS]
+    if bad:
+        return jsonify({'error': f'Unsupported file type: {", ".join(bad)}. Allowed: .pdf, .csv, .xlsx'}), 400
+    mode, error = _upload_mode()
+    if error:
+        return error
+
+    upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
+    os.makedirs(upload_folder, exist_ok=True)
+    batch_dir = tempfile.mkdtemp(prefix='batch_', dir=upload_folder)
+    started = time.perf_counter()
+    try:
+        saved = []
+        for i, file in enumerate(files):
+            # Index prefix keeps same-named files apart
+            path = os.path.join(batch_dir, f'{i}_{secure_filename(file.filename)}')
+            saved.append((file.filename, path, save_and_hash(file, path)))
+
+        rows, reports = parse_uploads(saved)
+        failed = [r for r in reports if 'error' in r]
+        if failed:
+            return jsonify({'error': 'Some files could not be parsed; nothing was saved', 'files': reports}), 422
+        if not rows:
+            return jsonify({'error': 'No student records found in the uploaded files', 'files': reports}), 400
+
+        result = append_students(rows) if mode == 'append' else replace_students(rows)
+        names = ', '.join(f.filename for f in files)
+        log_action(session['user_id'], 'UPLOAD_DATA', f'Uploaded {result["count"]} students from {len(files)} files ({mode}): {names}')
+
         response = {
             'success': True,
-            'message': f'Successfully uploaded {len(students)} students',
-            'studentsCount': len(students),
-            'students': [
-                {
-                    'registerNumber': s.registerNumber,
-                    'subjectCode': s.subjectCode,
-                    'department': s.department,
-                    'examDate': s.examDate,
-                    'session': s.session
-                } for s in students[:10]  # Return first 10 as preview
-            ],
-            'warnings': warnings
+            'message': f'Successfully uploaded {result["count"]} students from {len(files)} files',
+            'mode': mode,
+            'studentsCount': result['count'],
+            'students': result['preview'],
+            'warnings': result['warnings'],
+            'validation': result['validation'],
+            'files': reports,
+            'seconds': round(time.perf_counter() - started, 3)
         }
-        
+        if mode == 'append':
+            response['skipped'] = result['skipped']
+            response['affectedSessions'] = result['affectedSessions']
         return jsonify(response), 200
-        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+@bp.route('/upload/chunked', methods=['POST'])
+@role_required(['admin', 'super_admin'])
+def initiate_chunked_upload():
+    """
+    Start a resumable upload. Body: {filename, size, mode?}.
+    Returns uploadId, the suggested chunkSize and the current offset (0).
+    """
+    data = request.get_json(silent=True) or {}
+    filename = secure_filename(str(data.get('filename') or ''))
+    if not filename or not allowed_file(filename):
+        return jsonify({'error': 'Invalid file type. Please upload a .pdf, .csv or .xlsx file'}), 400
+    mode = str(data.get('mode') or 'replace').lower()
+    if mode not in UPLOAD_MODES:
+        return jsonify({'error': 'mode must be "replace" or "append"'}), 400
+    try:
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'size must be a positive number of bytes'}), 400
+    try:
+        state = ChunkedUploads.from_config().create(filename, size, session['user_id'], mode)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(_chunked_state(state)), 201
+
+def _chunked_state(state):
+    return {'uploadId': state['id'], 'filename': state['filename'], 'size': state['size'],
+            'offset': state['offset'], 'mode': state['mode'], 'chunkSize': CHUNK_BYTES}
+
+def _own_chunked_upload(uploads, upload_id):
+    """The upload's state if it exists and belongs to the current admin"""
+    state = uploads.get(upload_id)
+    if state is None or state['owner'] != session['user_id']:
+        return None
+    return state
+
+@bp.route('/upload/chunked/<upload_id>', methods=['GET'])
+@role_required(['admin', 'super_admin'])
+def chunked_upload_status(upload_id):
+    """Bytes received so far: resume by sending the next chunk at `offset`"""
+    state = _own_chunked_upload(ChunkedUploads.from_config(), upload_id)
+    if state is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    return jsonify(_chunked_state(state)), 200
+
+@bp.route('/upload/chunked/<upload_id>', methods=['PUT'])
+@role_required(['admin', 'super_admin'])
+def put_upload_chunk(upload_id):
+    """
+    Append the raw request body at ?offset=N. A wrong offset answers 409
+    with the server's offset, so a retried or lost chunk is resent from there.
+    An X-Content-SHA256 header (hex digest of the chunk) is verified; a
+    mismatching chunk is dropped with 400.
+    """
+    uploads = ChunkedUploads.from_config()
+    if _own_chunked_upload(uploads, upload_id) is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    try:
+        offset = int(request.args.get('offset', ''))
+    except ValueError:
+        return jsonify({'error': 'offset query parameter is required'}), 400
+
+    try:
+        new_offset = uploads.write_chunk(upload_id, offset, request.stream, request.headers.get('X-Content-SHA256'))
+    except ChunkOffsetError as e:
+        return jsonify({'error': str(e), 'offset': e.offset}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e), 'offset': offset}), 400
+    return jsonify({'uploadId': upload_id, 'offset': new_offset}), 200
+
+@bp.route('/upload/chunked/<upload_id>/complete', methods=['POST'])
+@role_required(['admin', 'super_admin'])
+def complete_chunked_upload(upload_id):
+    """
+    Body: {sha256} (optional: chunks may carry their own checksums instead).
+    Verifies the assembled file and parses it exactly like POST /upload (same
+    response); a checksum mismatch discards the upload.
+    """
+    uploads = ChunkedUploads.from_config()
+    state = _own_chunked_upload(uploads, upload_id)
+    if state is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    sha256 = (request.get_json(silent=True) or {}).get('sha256')
+
+    try:
+        upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
+        file_path = os.path.join(upload_folder, f'{upload_id}_{state["filename"]}')
+        try:
+            state = uploads.finish(upload_id, str(sha256) if sha256 else None, file_path)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return _ingest_saved_file(file_path, state['filename'], state['sha256'], state['mode'])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/upload/chunked/<upload_id>', methods=['DELETE'])
+@role_required(['admin', 'super_admin'])
+def abort_chunked_upload(upload_id):
+    """Discard an unfinished upload"""
+    uploads = ChunkedUploads.from_config()
+    if _own_chunked_upload(uploads, upload_id) is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    uploads.discard(upload_id)
+    return jsonify({'success': True}), 200
+
+def _upload_mode():
+    """'replace' or 'append' from the form field / query string; (mode, error response)"""
+    mode = (request.form.get('mode') or request.args.get('mode') or 'replace').lower()
+    if mode not in UPLOAD_MODES:
+        return None, (jsonify({'error': 'mode must be "replace" or "append"'}), 400)
+    return mode, None
+
+STUDENT_PAGE_DEFAULT = 100
+STUDENT_PAGE_MAX = 1000
+STUDENT_CSV_COLUMNS = ['registerNumber', 'subjectCode', 'department', 'examDate', 'session']
 
 @bp.route('/students', methods=['GET'])
 @role_required(['admin', 'super_admin'])
+@generation_etag()
 def get_students():
-    """Get current student data"""
-    students = [
-        {
-            'registerNumber': s.registerNumber,
-            'subjectCode': s.subjectCode,
-            'department': s.department,
-            'examDate': s.examDate,
-            'session': s.session
-        } for s in Student.query.all()
-    ]
-    return jsonify(students), 200
+    """
+    Get current student data.
+    Filters: examDate, session, department, subject.
+    - ?limit=N[&cursor=...]: one keyset page ordered by (examDate, session,
+      registerNumber) as {"students": [...], "nextCursor": ... | null}
+    - ?format=ndjson|csv: streamed full export in the same order
+    - otherwise: streamed JSON array of every matching student
+    """
+    query = db.session.query(
+        Student.register_number, Student.subject_code, Student.department,
+        Student.exam_date, Student.session, Student.id
+    )
+    filters = {
+        'examDate': Student.exam_date,
+        'session': Student.session,
+        'department': Student.department,
+        'subject': Student.subject_code
+    }
+    for param, column in filters.items():
+        value = request.args.get(param)
+        if value:
+            query = query.filter(column == value)
+
+    keyset = (Student.exam_date, Student.session, Student.register_number, Student.id)
+    output_format = request.args.get('format')
+
+    if 'limit' in request.args or 'cursor' in request.args:
+        try:
+            limit = parse_limit(request.args.get('limit'), STUDENT_PAGE_DEFAULT, STUDENT_PAGE_MAX)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                after = decode_cursor(cursor, len(keyset))
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(tuple_(*keyset) > tuple_(*after))
+
+        rows = query.order_by(*keyset).limit(limit + 1).all()
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor([last.exam_date, last.session, last.register_number, last.id])
+        return jsonify({
+            'students': [_student_dict(s) for s in page],
+            'nextCursor': next_cursor
+        }), 200
+
+    if output_format == 'ndjson':
+        rows = query.order_by(*keyset).yield_per(STREAM_BATCH_ROWS)
+        return stream_json_response(
+            (json_encode(_student_dict(s)) + '\n' for s in rows),
+            mimetype='application/x-ndjson'
+        )
+
+    if output_format == 'csv':
+        rows = query.order_by(*keyset).yield_per(STREAM_BATCH_ROWS)
+        response = stream_json_response(_iter_student_csv(rows), mimetype='text/csv')
+        response.headers['Content-Disposition'] = 'attachment; filename="Students.csv"'
+        return response
+
+    rows = query.order_by(Student.id).yield_per(STREAM_BATCH_ROWS)
+    return stream_json_response(iter_json_array(_student_dict(s) for s in rows))
+
+def _student_dict(s):
+    return {
+        'registerNumber': s.register_number,
+        'subjectCode': s.subject_code,
+        'department': s.department,
+        'examDate': s.exam_date,
+        'session': s.session
+    }
+
+def _iter_student_csv(rows):
+    """Yield CSV text one line at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(STUDENT_CSV_COLUMNS)
+    for s in rows:
+        writer.writerow([s.register_number, s.subject_code, s.department, s.exam_date, s.session])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
 
 @bp.route('/reset', methods=['DELETE'])
 @role_required(['admin', 'super_admin'])
@@ -117,6 +422,8 @@ def reset_data():
     Student.query.delete()
     from app.models import Allocation
     Allocation.query.delete()
+    invalidate_sketches()
+    bump_generation()
     db.session.commit()
     
     log_action(session['user_id'], 'RESET_DATA', 'Cleared all student and allocation data')
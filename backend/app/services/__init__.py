@@ -1,11 +1,13 @@
 
-from .parser import parse_file, validate_student_data
+from .parser import parse_file, parse_file_rows, iter_tabular_rows, validate_student_data
 from .pdf_parser import parse_pdf
 from .seating_algorithm import allocate_seats, allocate_session_strict, validate_no_adjacent_conflict
 from .excel_generator import generate_hall_wise_excel, generate_student_wise_excel
 
 __all__ = [
     'parse_file', 
+    'parse_file_rows',
+    'iter_tabular_rows',
     'validate_student_data', 
     'parse_pdf', 
     'allocate_seats', 
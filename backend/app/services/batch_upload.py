@@ -0,0 +1,114 @@
+"""
+Multi-File Roster Upload
+
+Parses several roster files (PDF / CSV / XLSX) of one upload concurrently
+in a process pool (BATCH_PARSE_WORKERS), then merges them in upload order, dropping repeated
+(register_number, subject_code, exam_date, session) rows, so the caller can
+write the whole semester as one dataset in one transaction.
+
+PDFs whose parse is already in the parse cache are not sent to the pool.
+"""
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from app.services.parser import parse_file_rows
+from app.services.validation import StudentValidator
+from app.services.parse_cache import ParseCache, cache_key
+from app.services.pdf_parser import (
+    iter_pdf_students, ParseStats, PARSER_VERSION, department_table, resolve_backend
+)
+
+BATCH_EXTENSIONS = {'pdf', 'csv', 'xlsx'}
+
+
+def parse_uploads(files):
+    """
+    Args:
+        files: list of (display_name, saved_path, content_hash) in upload order
+    Returns:
+        (merged rows, per-file report list); a report has filename, students,
+        duplicates, seconds, cached, warnings and, if parsing failed, error
+    """
+    backend = resolve_backend()
+    departments = department_table()
+    cache = ParseCache.from_config()
+
+    results = [None] * len(files)
+    tasks = []
+    for i, (name, path, content_hash) in enumerate(files):
+        if path.lower().endswith('.pdf'):
+            cached = cache.get(cache_key(content_hash, PARSER_VERSION, departments))
+            if cached:
+                rows, _ = cached
+                results[i] = {'rows': rows, 'seconds': 0.0, 'cached': True}
+                continue
+        tasks.append((i, (path, backend, departments)))
+
+    workers = min(len(tasks), max(configured_batch_workers(), 1))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (i, _), result in zip(tasks, pool.map(parse_one_file, [task for _, task in tasks])):
+                results[i] = result
+    else:
+        for i, task in tasks:
+            results[i] = parse_one_file(task)
+
+    merged, seen, reports = [], set(), []
+    for (name, path, content_hash), result in zip(files, results):
+        report = {
+            'filename': name,
+            'students': 0,
+            'duplicates': 0,
+            'seconds': round(result['seconds'], 3),
+            'cached': result.get('cached', False),
+            'warnings': []
+        }
+        reports.append(report)
+        if 'error' in result:
+            report['error'] = result['error']
+            continue
+
+        validator = StudentValidator(departments.keys())
+        for row in result['rows']:
+            validator.add(row)
+            key = (row[0], row[1], row[3], row[4])
+            if key in seen:
+                report['duplicates'] += 1
+                continue
+            seen.add(key)
+            merged.append(row)
+            report['students'] += 1
+        report['warnings'] = validator.warnings()
+
+        if path.lower().endswith('.pdf') and not report['cached'] and cache.enabled:
+            try:
+                cache.put(cache_key(content_hash, PARSER_VERSION, departments), result['rows'], result.get('stats'))
+            except (OSError, ValueError) as e:
+                current_app.logger.warning(f"Could not write parse cache for {name}: {e}")
+
+    return merged, reports
+
+
+def configured_batch_workers():
+    """BATCH_PARSE_WORKERS, separate from PDF_PARSE_WORKERS (pages of one PDF)"""
+    if getattr(sys, 'frozen', False):
+        return 1  # Desktop build: no re-entrant child processes
+    return current_app.config.get('BATCH_PARSE_WORKERS', 1)
+
+
+def parse_one_file(task):
+    """Worker: parse one saved upload into student tuples (runs without an app context)"""
+    path, backend, departments = task
+    started = time.perf_counter()
+    try:
+        if path.lower().endswith('.pdf'):
+            stats = ParseStats()
+            # Files are already spread over the pool, so each is parsed serially;
+            # the configured backend keeps /upload's pdfplumber fallback
+            rows = list(iter_pdf_students(path, backend=backend, workers=1, stats=stats, departments=departments,
+                                          fallback=True))
+            return {'rows': rows, 'stats': stats.summary(), 'seconds': time.perf_counter() - started}
+        return {'rows': parse_file_rows(path, departments), 'seconds': time.perf_counter() - started}
+    except Exception as e:
+        return {'error': str(e), 'seconds': time.perf_counter() - started}
@@ -0,0 +1,183 @@
+"""
+Chunked, Resumable Roster Uploads
+
+Large rolls are sent as a sequence of small requests instead of one
+multipart body, so a dropped connection only costs the chunk in flight:
+
+1. initiate: POST filename + total size -> upload id (state on disk)
+2. chunks:   PUT raw bytes at an offset; the offset must equal the bytes
+             received so far (a mismatch answers with the server's offset,
+             which is also what GET returns when resuming). An optional
+             sha256 of the chunk is checked as it is written, so the
+             client never has to hash the whole file in memory
+3. complete: the assembled file is hashed (and checked against the whole
+             file's sha256 if the client sent one) and handed to the
+             normal parse/ingest path
+
+State lives in <UPLOAD_FOLDER>/chunked/<id>/ (meta.json + data.part) so
+every worker process sees the same upload. Chunks are streamed to disk and
+never held in memory whole; abandoned uploads are purged after
+CHUNKED_UPLOAD_TTL_SECONDS.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from flask import current_app
+
+CHUNK_BYTES = 4 * 1024 * 1024       # Suggested chunk size (well under MAX_CONTENT_LENGTH)
+COPY_BUFFER_BYTES = 1024 * 1024
+META_NAME = 'meta.json'
+DATA_NAME = 'data.part'
+UPLOAD_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ChunkOffsetError(Exception):
+    """A chunk did not start where the received data ends"""
+
+    def __init__(self, offset):
+        super().__init__(f'Expected offset {offset}')
+        self.offset = offset
+
+
+class ChunkedUploads:
+    """Upload sessions kept as directories under `directory`"""
+
+    def __init__(self, directory, max_bytes, ttl_seconds):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_config(cls):
+        upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
+        return cls(
+            os.path.join(upload_folder, 'chunked'),
+            current_app.config.get('CHUNKED_UPLOAD_MAX_BYTES', 0),
+            current_app.config.get('CHUNKED_UPLOAD_TTL_SECONDS', 24 * 3600)
+        )
+
+    def _dir(self, upload_id):
+        if not UPLOAD_ID_RE.match(upload_id or ''):
+            raise KeyError(upload_id)
+        return os.path.join(self.directory, upload_id)
+
+    def create(self, filename, size, owner, mode):
+        """Start an upload of `size` bytes; returns its state dict"""
+        if size <= 0:
+            raise ValueError('size must be a positive number of bytes')
+        if size > self.max_bytes:
+            raise ValueError(f'File too large (limit {self.max_bytes} bytes)')
+        self.purge_stale()
+
+        upload_id = uuid.uuid4().hex
+        path = self._dir(upload_id)
+        os.makedirs(path)
+        open(os.path.join(path, DATA_NAME), 'wb').close()
+        meta = {'id': upload_id, 'filename': filename, 'size': size, 'owner': owner, 'mode': mode,
+                'created': time.time()}
+        with open(os.path.join(path, META_NAME), 'w') as f:
+            json.dump(meta, f)
+        return self._state(meta, 0)
+
+    def get(self, upload_id):
+        """State dict (meta + received offset) or None if unknown/expired"""
+        try:
+            path = self._dir(upload_id)
+            with open(os.path.join(path, META_NAME)) as f:
+                meta = json.load(f)
+            offset = os.path.getsize(os.path.join(path, DATA_NAME))
+        except (KeyError, OSError, ValueError):
+            return None
+        return self._state(meta, offset)
+
+    @staticmethod
+    def _state(meta, offset):
+        return dict(meta, offset=offset)
+
+    def write_chunk(self, upload_id, offset, stream, sha256=None):
+        """
+        Stream a chunk from `stream` into the upload at `offset`.
+        Returns the new received offset. Raises ChunkOffsetError if offset is
+        not the current end of the data, ValueError if the chunk overruns size
+        or does not match `sha256` (hex digest of the chunk, optional).
+        """
+        state = self.get(upload_id)
+        if state is None:
+            raise KeyError(upload_id)
+        if offset != state['offset']:
+            raise ChunkOffsetError(state['offset'])
+
+        data_path = os.path.join(self._dir(upload_id), DATA_NAME)
+        remaining = state['size'] - offset
+        written = 0
+        digest = hashlib.sha256()
+        with open(data_path, 'r+b') as f:
+            f.seek(offset)
+            while True:
+                block = stream.read(COPY_BUFFER_BYTES)
+                if not block:
+                    break
+                written += len(block)
+                if written > remaining:
+                    f.truncate(offset)  # Drop the partial chunk; the client retries from offset
+                    raise ValueError('Chunk runs past the declared file size')
+                digest.update(block)
+                f.write(block)
+            if sha256 and digest.hexdigest() != sha256.lower():
+                f.truncate(offset)
+                raise ValueError('Chunk checksum mismatch: please resend it')
+        # Touch the meta so active uploads are not purged
+        os.utime(os.path.join(self._dir(upload_id), META_NAME))
+        return offset + written
+
+    def finish(self, upload_id, sha256, destination):
+        """
+        Verify the assembled file (size, and sha256 unless it is None) and
+        move it to destination. Returns the state dict with the file's sha256.
+        Raises ValueError if it is incomplete or the checksum differs (a
+        corrupt upload is discarded).
+        """
+        state = self.get(upload_id)
+        if state is None:
+            raise KeyError(upload_id)
+        if state['offset'] != state['size']:
+            raise ValueError(f'Upload incomplete: {state["offset"]} of {state["size"]} bytes received')
+
+        data_path = os.path.join(self._dir(upload_id), DATA_NAME)
+        digest = hashlib.sha256()
+        with open(data_path, 'rb') as f:
+            for block in iter(lambda: f.read(COPY_BUFFER_BYTES), b''):
+                digest.update(block)
+        if sha256 is not None and digest.hexdigest() != sha256.lower():
+            self.discard(upload_id)
+            raise ValueError('Checksum mismatch: the upload was corrupted, please upload the file again')
+
+        os.replace(data_path, destination)
+        self.discard(upload_id)
+        return dict(state, sha256=digest.hexdigest())
+
+    def discard(self, upload_id):
+        try:
+            shutil.rmtree(self._dir(upload_id), ignore_errors=True)
+        except KeyError:
+            pass
+
+    def purge_stale(self):
+        """Remove uploads untouched for longer than ttl_seconds"""
+        if not os.path.isdir(self.directory):
+            return
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                # meta.json is touched by every chunk; a bare directory is judged by its own age
+                meta_path = os.path.join(path, META_NAME)
+                touched = os.path.getmtime(meta_path if os.path.exists(meta_path) else path)
+            except OSError:
+                continue
+            if touched < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,98 @@
+"""
+Compact (Columnar) Session Seating Payload
+
+Alternative to the seat-dict grid returned by /api/seating/<session_key>:
+- departments / subjects are sent once as dictionaries,
+- students are a columnar table (register number, department idx, subject idx),
+- each hall is a flat int array in snake order: seats[n - 1] is the student
+  index sitting in seat number n, or -1 for an empty seat.
+
+Row/column of seat n follow from the vertical snake (see get_snake_seat_number).
+"""
+import json
+from app.services.seating_algorithm import get_snake_seat_number
+from app.services.hall_sketch import split_session_key
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library encoder
+    orjson = None
+
+EMPTY_SEAT = -1
+
+
+def build_compact_session(session_key, allocations, hall_map):
+    """
+    Args:
+        session_key: e.g. "25-05-2024_FN"
+        allocations: rows with register_number, department, subject_code,
+            hall_name, row_num, col_num (in allocation order)
+        hall_map: {hall_name: Hall}
+    Returns:
+        dict ready for dumps()
+    """
+    departments, dept_index = [], {}
+    subjects, subject_index = [], {}
+    reg_col, dept_col, subject_col = [], [], []
+    hall_seats = {}
+
+    for student_idx, a in enumerate(allocations):
+        d = dept_index.get(a.department)
+        if d is None:
+            d = dept_index[a.department] = len(departments)
+            departments.append(a.department)
+        s = subject_index.get(a.subject_code)
+        if s is None:
+            s = subject_index[a.subject_code] = len(subjects)
+            subjects.append(a.subject_code)
+        reg_col.append(a.register_number)
+        dept_col.append(d)
+        subject_col.append(s)
+
+        hall = hall_map.get(a.hall_name)
+        if not hall:
+            continue
+        seats = hall_seats.get(a.hall_name)
+        if seats is None:
+            seats = hall_seats[a.hall_name] = [EMPTY_SEAT] * (hall.rows * hall.columns)
+        if 0 <= a.row_num < hall.rows and 0 <= a.col_num < hall.columns:
+            seats[get_snake_seat_number(a.row_num, a.col_num, hall.rows) - 1] = student_idx
+
+    halls = []
+    for hall_name, seats in hall_seats.items():
+        hall = hall_map[hall_name]
+        halls.append({
+            'id': hall.id,
+            'name': hall.name,
+            'block': hall.block,
+            'rows': hall.rows,
+            'columns': hall.columns,
+            'capacity': hall.capacity,
+            'studentsCount': sum(1 for idx in seats if idx != EMPTY_SEAT),
+            'seats': seats
+        })
+
+    exam_date, sess = split_session_key(session_key)
+    return {
+        'format': 'compact',
+        'session': session_key,
+        'examDate': exam_date,
+        'sessionName': sess,
+        'totalStudents': len(reg_col),
+        'hallsUsed': len(halls),
+        'departments': departments,
+        'subjects': subjects,
+        'students': {
+            'registerNumber': reg_col,
+            'department': dept_col,
+            'subject': subject_col
+        },
+        'halls': halls
+    }
+
+
+def dumps(payload):
+    """Encode with orjson when installed (bytes), else json (str)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'))
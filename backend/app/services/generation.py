@@ -0,0 +1,94 @@
+"""
+Data Generation Counter
+
+A single DB row that every write to students, allocations or halls bumps
+in the same transaction. Workers compare it against what they last saw to
+decide whether their in-memory state (student index, caches) is stale.
+
+A second row versions the department_code overrides on its own, so editing
+the degree code table reloads the parsers' table without invalidating every
+student index, search cache, sketch and ETag.
+"""
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.sql import DataGeneration
+
+GENERATION_ROW_ID = 1
+DEPARTMENT_CODES_ROW_ID = 2
+
+# Callbacks run once a bumping transaction commits, so this worker's caches
+# drop at once instead of waiting for their next poll of the counter
+_listeners = []
+
+
+def on_generation_bump(callback):
+    """Register a no-argument callback invoked whenever this worker bumps the counter"""
+    _listeners.append(callback)
+    return callback
+
+
+def current_generation():
+    """Return the current generation value (0 if never bumped)"""
+    value = db.session.query(DataGeneration.value).filter_by(id=GENERATION_ROW_ID).scalar()
+    return value or 0
+
+
+def department_codes_version():
+    """Return the department_code table's version (0 if never edited)"""
+    value = db.session.query(DataGeneration.value).filter_by(id=DEPARTMENT_CODES_ROW_ID).scalar()
+    return value or 0
+
+
+def ensure_generation_row():
+    """
+    Seed the counter rows (migrations 8c4e2b9f1a07 and c58f0a3e7d16 do the
+    same) so workers booting together on an empty database never race to
+    insert them. Idempotent; a concurrent insert by another worker is ignored.
+    """
+    for row_id in (GENERATION_ROW_ID, DEPARTMENT_CODES_ROW_ID):
+        if db.session.get(DataGeneration, row_id) is not None:
+            continue
+        try:
+            db.session.add(DataGeneration(id=row_id, value=0))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
+
+def bump_generation():
+    """
+    Increment the generation counter. Caller owns the transaction, so the bump
+    commits (or rolls back) together with the data change.
+    """
+    updated = DataGeneration.query.filter_by(id=GENERATION_ROW_ID).update(
+        {'value': DataGeneration.value + 1}, synchronize_session=False
+    )
+    if not updated:
+        # Only if the row seeded at startup was removed by hand
+        db.session.add(DataGeneration(id=GENERATION_ROW_ID, value=1))
+    db.session.info['generation_bumped'] = True
+
+
+def bump_department_codes_version():
+    """
+    Increment the department_code version (caller commits). Leaves the data
+    generation alone: stored students keep the department they were parsed with.
+    """
+    updated = DataGeneration.query.filter_by(id=DEPARTMENT_CODES_ROW_ID).update(
+        {'value': DataGeneration.value + 1}, synchronize_session=False
+    )
+    if not updated:
+        db.session.add(DataGeneration(id=DEPARTMENT_CODES_ROW_ID, value=1))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _notify_after_commit(sess):
+    if sess.info.pop('generation_bumped', False):
+        for callback in _listeners:
+            callback()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_after_rollback(sess):
+    sess.info.pop('generation_bumped', None)
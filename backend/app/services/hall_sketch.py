@@ -0,0 +1,171 @@
+"""
+Hall Sketch Cache
+
+Every read endpoint (session view, student search) renders the same
+per-(session, hall) grid. The grids are serialised once at generation time
+into the HallSketch table and served as stored JSON afterwards.
+
+Invalidation:
+- Regeneration, upload, clear and reset drop every sketch.
+- Hall edits drop the sketches of the affected hall names.
+Missing sketches are rebuilt on the fly from allocation rows.
+"""
+import json
+from collections import defaultdict
+from sqlalchemy import tuple_
+from app.extensions import db
+from app.models.sql import Hall, Allocation, HallSketch
+from app.services.seating_algorithm import get_snake_seat_number
+
+
+def split_session_key(session_key):
+    """Split "25-05-2024_FN" into ("25-05-2024", "FN")"""
+    parts = session_key.rsplit('_', 1)
+    return parts[0], parts[1] if len(parts) > 1 else ""
+
+
+def build_hall_sketch(hall, hall_allocs, session_key):
+    """Build the JSON hall sketch (hall + grid) from one hall's allocation rows"""
+    hall_allocs = list(hall_allocs)
+    seat_map = {(a.row_num, a.col_num): a for a in hall_allocs}
+    e_date, sess = split_session_key(session_key)
+
+    grid_data = []
+    for r in range(hall.rows):
+        row_data = []
+        for c in range(hall.columns):
+            cell_alloc = seat_map.get((r, c))
+            seat_obj = {
+                'row': r,
+                'col': c,
+                'seatNumber': str(get_snake_seat_number(r, c, hall.rows)),
+                'student': None,
+                'subject': None,
+                'department': None
+            }
+            if cell_alloc:
+                seat_obj['student'] = {
+                    'registerNumber': cell_alloc.register_number,
+                    'subjectCode': cell_alloc.subject_code,
+                    'department': cell_alloc.department,
+                    'examDate': e_date,
+                    'session': sess
+                }
+                seat_obj['subject'] = cell_alloc.subject_code
+                seat_obj['department'] = cell_alloc.department
+            row_data.append(seat_obj)
+        grid_data.append(row_data)
+
+    return {
+        'hall': {
+            'id': hall.id,
+            'name': hall.name,
+            'block': hall.block,
+            'rows': hall.rows,
+            'columns': hall.columns,
+            'capacity': hall.capacity
+        },
+        'grid': grid_data,
+        'studentsCount': len(hall_allocs)
+    }
+
+
+def dump_sketch(sketch):
+    """Serialise a sketch dict to its stored JSON form"""
+    return json.dumps(sketch, separators=(',', ':'))
+
+
+def store_session_sketches(session_key, halls, allocations):
+    """
+    Add a HallSketch row for every hall used in a session.
+    Caller owns the transaction.
+
+    Args:
+        session_key: e.g. "25-05-2024_FN"
+        halls: Hall objects used by the session
+        allocations: Allocation objects of the session (may be unflushed)
+    """
+    hall_allocs = defaultdict(list)
+    for alloc in allocations:
+        hall_allocs[alloc.hall_name].append(alloc)
+
+    seen = set()
+    for hall in halls:
+        allocs = hall_allocs.get(hall.name)
+        if not allocs or hall.name in seen:
+            continue
+        seen.add(hall.name)
+        db.session.add(HallSketch(
+            session_key=session_key,
+            hall_name=hall.name,
+            payload=dump_sketch(build_hall_sketch(hall, allocs, session_key))
+        ))
+
+
+def invalidate_sketches(hall_names=None, session_keys=None):
+    """
+    Drop cached sketches. Caller owns the transaction.
+
+    Args:
+        hall_names: Only drop sketches for these halls (None drops all)
+        session_keys: Only drop sketches for these sessions (None drops all)
+    """
+    query = HallSketch.query
+    if hall_names is not None:
+        hall_names = [n for n in hall_names if n]
+        if not hall_names:
+            return
+        query = query.filter(HallSketch.hall_name.in_(hall_names))
+    if session_keys is not None:
+        session_keys = list(session_keys)
+        if not session_keys:
+            return
+        query = query.filter(HallSketch.session_key.in_(session_keys))
+    query.delete(synchronize_session=False)
+
+
+def get_sketch_payloads(pairs):
+    """
+    Return {(session_key, hall_name): payload JSON string} for the given pairs.
+    Pairs without a cached sketch are rebuilt from allocation rows with one
+    joined query and returned as well (they are not persisted).
+    """
+    pairs = list(set(pairs))
+    if not pairs:
+        return {}
+
+    payloads = {}
+    cached = db.session.query(
+        HallSketch.session_key, HallSketch.hall_name, HallSketch.payload
+    ).filter(
+        tuple_(HallSketch.session_key, HallSketch.hall_name).in_(pairs)
+    ).all()
+    for session_key, hall_name, payload in cached:
+        payloads[(session_key, hall_name)] = payload
+
+    missing = [p for p in pairs if p not in payloads]
+    if missing:
+        payloads.update(_build_missing(missing))
+    return payloads
+
+
+def _build_missing(pairs):
+    """Build sketches for uncached pairs from allocations joined with halls"""
+    rows = db.session.query(Allocation, Hall).join(
+        Hall, Hall.name == Allocation.hall_name
+    ).filter(
+        tuple_(Allocation.session_key, Allocation.hall_name).in_(pairs)
+    ).all()
+
+    hall_by_pair = {}
+    seats_by_pair = defaultdict(dict)
+    for alloc, hall in rows:
+        pair = (alloc.session_key, alloc.hall_name)
+        # Hall names are not unique; keep the first match like filter_by().first()
+        hall_by_pair.setdefault(pair, hall)
+        seats_by_pair[pair][alloc.id] = alloc
+
+    return {
+        pair: dump_sketch(build_hall_sketch(hall, seats_by_pair[pair].values(), pair[0]))
+        for pair, hall in hall_by_pair.items()
+    }
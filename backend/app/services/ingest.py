@@ -0,0 +1,185 @@
+"""
+Streaming Student Ingestion
+
+Loads the student roster from an iterable of
+(register_number, subject_code, department, exam_date, session) tuples
+without materialising it: rows are validated incrementally and written with
+Core executemany inserts of INSERT_BATCH_ROWS at a time.
+
+Two modes:
+- replace_students: the wipe of the old roster and all inserts run in one
+  transaction, which acts as the staging generation: other workers keep
+  reading the previous roster until the single commit at the end swaps it
+  in, and any failure part way through rolls back to it.
+- append_students: keeps the roster and inserts only exam entries that are
+  not there yet. The unique index on (register_number, subject_code,
+  exam_date, session) does the de-duplication in the database
+  (INSERT OR IGNORE / ON CONFLICT DO NOTHING), and only the sessions that
+  gained students lose their allocations and need regenerating.
+"""
+import itertools
+from sqlalchemy import func, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models.sql import Student, Allocation
+from app.services.validation import StudentValidator
+from app.services.generation import bump_generation
+from app.services.hall_sketch import invalidate_sketches
+
+INSERT_BATCH_ROWS = 2000
+PREVIEW_ROWS = 10
+STUDENT_COLUMNS = ('register_number', 'subject_code', 'department', 'exam_date', 'session')
+STUDENT_KEY = ('register_number', 'subject_code', 'exam_date', 'session')
+
+
+def first_row_or_error(rows):
+    """Peek so an empty roster fails before the old one is wiped"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError("No valid student records found in file")
+    return itertools.chain([first], rows)
+
+
+def replace_students(rows, batch_rows=INSERT_BATCH_ROWS):
+    """
+    Swap the student roster for `rows` (allocations are cleared too).
+    Repeated exam entries within `rows` are stored once.
+
+    Returns:
+        dict with count (students stored), preview (first PREVIEW_ROWS as
+        API dicts), warnings and validation (StudentValidator report)
+    """
+    try:
+        Allocation.query.delete()
+        Student.query.delete()
+        invalidate_sketches()
+        bump_generation()
+
+        preview, validator = _insert_rows(rows, batch_rows)
+        count = db.session.query(func.count(Student.id)).scalar()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    report = validator.report()
+    return {'count': count, 'preview': preview, 'warnings': validator.warnings(report), 'validation': report}
+
+
+def append_students(rows, batch_rows=INSERT_BATCH_ROWS):
+    """
+    Add the exam entries of `rows` that are not stored yet.
+
+    Returns:
+        dict with count (new students), skipped (already present or
+        repeated), preview, warnings, validation and affectedSessions
+        (session keys that gained students; their allocations are cleared
+        for regeneration)
+    """
+    try:
+        before = _session_counts()
+        preview, validator = _insert_rows(rows, batch_rows)
+        after = _session_counts()
+
+        affected = sorted(f'{exam_date}_{sess}' for (exam_date, sess), n in after.items()
+                          if n > before.get((exam_date, sess), 0))
+        inserted = sum(after.values()) - sum(before.values())
+        if affected:
+            Allocation.query.filter(Allocation.session_key.in_(affected)).delete(synchronize_session=False)
+            invalidate_sketches(session_keys=affected)
+            bump_generation()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    report = validator.report()
+    return {
+        'count': inserted,
+        'skipped': validator.rows - inserted,
+        'preview': preview,
+        'warnings': validator.warnings(report),
+        'validation': report,
+        'affectedSessions': affected
+    }
+
+
+def _insert_rows(rows, batch_rows):
+    """
+    Validate and batch-insert rows, skipping exam entries that already exist.
+    Returns (preview, validator).
+    """
+    from app.services.pdf_parser import department_table
+    validator = StudentValidator(department_table().keys())
+    insert = insert_ignore_statement()
+    preview = []
+
+    batch = []
+    for row in rows:
+        validator.add(row)
+        record = dict(zip(STUDENT_COLUMNS, row))
+        if len(preview) < PREVIEW_ROWS:
+            preview.append({
+                'registerNumber': record['register_number'],
+                'subjectCode': record['subject_code'],
+                'department': record['department'],
+                'examDate': record['exam_date'],
+                'session': record['session']
+            })
+        batch.append(record)
+        if len(batch) >= batch_rows:
+            db.session.execute(insert, batch)
+            batch = []
+    if batch:
+        db.session.execute(insert, batch)
+
+    return preview, validator
+
+
+def insert_ignore_statement():
+    """INSERT into student that silently skips rows violating uq_student_exam_entry"""
+    table = Student.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing(index_elements=list(STUDENT_KEY))
+    if dialect == 'sqlite':
+        return table.insert().prefix_with('OR IGNORE')
+    if dialect in ('mysql', 'mariadb'):
+        return table.insert().prefix_with('IGNORE')
+    return table.insert()
+
+
+def ensure_exam_entry_index():
+    """
+    Create uq_student_exam_entry on a student table that predates it.
+    db.create_all() (dev / desktop installs) never adds indexes to existing
+    tables, and without this index append uploads store repeats. Exact
+    repeats are dropped first, keeping the earliest row, as migration
+    f19d6b2a4c83 does. Safe to call at every start.
+    """
+    index = next(i for i in Student.__table__.indexes if i.name == 'uq_student_exam_entry')
+    if any(i['name'] == index.name for i in inspect(db.engine).get_indexes('student')):
+        return False
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                'DELETE FROM student WHERE id NOT IN ('
+                'SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM student '
+                'GROUP BY register_number, subject_code, exam_date, session) AS firsts)'
+            ))
+            index.create(conn, checkfirst=True)
+    except SQLAlchemyError:
+        # Another worker created it first
+        if not any(i['name'] == index.name for i in inspect(db.engine).get_indexes('student')):
+            raise
+    return True
+
+
+def _session_counts():
+    """{(exam_date, session): students} using the (exam_date, session, ...) index"""
+    rows = db.session.query(Student.exam_date, Student.session, func.count(Student.id)).group_by(
+        Student.exam_date, Student.session
+    )
+    return {(exam_date, sess): n for exam_date, sess, n in rows}
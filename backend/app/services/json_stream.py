@@ -0,0 +1,72 @@
+"""
+Streaming JSON Responses
+
+Large read endpoints (session seating, student lists) are emitted as a
+sequence of JSON text chunks instead of one jsonify() string, so worker
+memory per request stays bounded by the chunk size rather than the
+session size. When the client accepts gzip the chunks are compressed on
+the fly (Flask-Compress would buffer the whole stream to compress it).
+"""
+import json
+import zlib
+from flask import current_app, request, stream_with_context
+
+CHUNK_BYTES = 64 * 1024
+GZIP_LEVEL = 6
+
+
+def encode(value):
+    """Compact JSON encoding used for every streamed fragment"""
+    return json.dumps(value, separators=(',', ':'))
+
+
+def iter_json_array(items, encode_item=encode):
+    """Yield '[', the encoded items separated by commas, then ']'"""
+    yield '['
+    first = True
+    for item in items:
+        if first:
+            first = False
+        else:
+            yield ','
+        yield encode_item(item)
+    yield ']'
+
+
+def stream_json_response(chunks, status=200, mimetype='application/json'):
+    """
+    Wrap a generator of str fragments in a streamed (optionally gzipped) response.
+    The generator runs inside the request context, so it may query the DB.
+    """
+    use_gzip = request.accept_encodings['gzip'] > 0
+    body = _buffered(chunks)
+    if use_gzip:
+        body = _gzipped(body)
+
+    response = current_app.response_class(stream_with_context(body), status=status, mimetype=mimetype)
+    response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def _buffered(chunks):
+    """Coalesce small fragments into ~CHUNK_BYTES byte blocks"""
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def _gzipped(blocks):
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
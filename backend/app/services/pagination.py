@@ -0,0 +1,34 @@
+"""
+Keyset Pagination Helpers
+
+Cursors are the sort-key values of the last row of a page, JSON encoded and
+base64url'd so clients treat them as opaque strings.
+"""
+import base64
+import json
+from datetime import datetime
+
+
+def parse_limit(value, default, maximum):
+    """Clamp ?limit= to [1, maximum]; raises ValueError for non-integers"""
+    if value is None:
+        return default
+    return min(max(int(value), 1), maximum)
+
+
+def encode_cursor(values):
+    """Encode a list of sort-key values (datetimes become ISO strings)"""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Decode a cursor back into a list of `size` values; raises ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    return values
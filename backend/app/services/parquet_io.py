@@ -0,0 +1,142 @@
+"""
+Parquet Import / Export of Students and Allocations
+
+Moves a whole term between deployments (e.g. Render <-> desktop app) as
+columnar Parquet files instead of PDFs in / Excel out:
+- export writes EXPORT_BATCH_ROWS rows per record batch from a streamed
+  Core select; department, subject, date, session and hall columns are
+  dictionary-encoded, so repeated strings are stored once per row group
+- import reads record batches back into tuples for the Core insert path
+  (ingest.replace_students / append_students, import_allocations)
+
+Requires pyarrow (in requirements.txt); builds without it (e.g. a trimmed
+desktop bundle) keep working and the endpoints report 501.
+"""
+from app.extensions import db
+from app.models.sql import Student, Allocation
+from app.services.generation import bump_generation, current_generation
+from app.services.hall_sketch import invalidate_sketches
+from app.services.ingest import STUDENT_COLUMNS, INSERT_BATCH_ROWS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # The Parquet endpoints answer 501 without it
+    pa = pq = None
+
+EXPORT_BATCH_ROWS = 50000
+ALLOCATION_COLUMNS = ('register_number', 'department', 'subject_code', 'hall_name',
+                      'row_num', 'col_num', 'seat_number', 'session_key')
+DICTIONARY_COLUMNS = {'subject_code', 'department', 'exam_date', 'session', 'hall_name', 'session_key'}
+INTEGER_COLUMNS = {'row_num', 'col_num'}
+
+# kind -> (model, exported columns)
+TABLES = {
+    'students': (Student, STUDENT_COLUMNS),
+    'allocations': (Allocation, ALLOCATION_COLUMNS),
+}
+
+
+def parquet_available():
+    return pq is not None
+
+
+def _schema(kind, generation):
+    _, columns = TABLES[kind]
+    fields = []
+    for name in columns:
+        if name in DICTIONARY_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string()), nullable=False))
+        elif name in INTEGER_COLUMNS:
+            fields.append(pa.field(name, pa.int32(), nullable=False))
+        else:
+            fields.append(pa.field(name, pa.string(), nullable=False))
+    return pa.schema(fields, metadata={'kind': kind, 'generation': str(generation)})
+
+
+def export_parquet(kind, out):
+    """
+    Write every row of `kind` ('students' / 'allocations'), in id order, as
+    Parquet to the binary file object `out`. Returns the row count.
+    """
+    model, columns = TABLES[kind]
+    schema = _schema(kind, current_generation())
+    query = db.session.query(*(getattr(model, c) for c in columns)).order_by(model.id)
+
+    count = 0
+    with pq.ParquetWriter(out, schema, compression='zstd') as writer:
+        batch = []
+        for row in query.yield_per(EXPORT_BATCH_ROWS):
+            batch.append(row)
+            if len(batch) >= EXPORT_BATCH_ROWS:
+                writer.write_batch(_record_batch(batch, schema))
+                count += len(batch)
+                batch = []
+        if batch or not count:
+            writer.write_batch(_record_batch(batch, schema))
+            count += len(batch)
+    return count
+
+
+def _record_batch(rows, schema):
+    columns = list(zip(*rows)) if rows else [[] for _ in schema.names]
+    return pa.record_batch([pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                           schema=schema)
+
+
+def iter_parquet_rows(source, kind):
+    """
+    Yield `kind` rows (tuples in TABLES column order) from a Parquet file
+    path or binary file object, a record batch at a time.
+    Raises ValueError if the file is not Parquet, lacks a column or has
+    empty (null) cells.
+    """
+    _, columns = TABLES[kind]
+    try:
+        parquet_file = pq.ParquetFile(source)
+    except pa.ArrowInvalid as e:
+        raise ValueError(f'Not a Parquet file: {e}')
+    missing = [c for c in columns if c not in parquet_file.schema_arrow.names]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    for batch in parquet_file.iter_batches(batch_size=INSERT_BATCH_ROWS, columns=list(columns)):
+        values = [_column_values(batch.column(c), c) for c in columns]
+        yield from zip(*values)
+
+
+def _column_values(array, name):
+    if array.null_count:
+        raise ValueError(f'Column {name} has {array.null_count} empty cells')
+    if name in INTEGER_COLUMNS:
+        return array.cast(pa.int32()).to_pylist()
+    return [str(v).strip() for v in array.cast(pa.string()).to_pylist()]
+
+
+def import_allocations(rows, batch_rows=INSERT_BATCH_ROWS):
+    """
+    Replace all allocations with `rows` (ALLOCATION_COLUMNS tuples) in one
+    transaction using Core executemany inserts. Returns the row count.
+    """
+    insert = Allocation.__table__.insert()
+    count = 0
+    try:
+        Allocation.query.delete()
+        invalidate_sketches()
+        bump_generation()
+
+        batch = []
+        for row in rows:
+            batch.append(dict(zip(ALLOCATION_COLUMNS, row)))
+            if len(batch) >= batch_rows:
+                db.session.execute(insert, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(insert, batch)
+            count += len(batch)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return count
@@ -0,0 +1,225 @@
+"""
+Content-Hash Parse Cache for Uploaded Rosters
+
+Re-uploading a PDF that was parsed before skips text extraction entirely:
+the upload is hashed while it streams to disk and the parsed student tuples
+are kept under <PARSE_CACHE_DIR>/<key>.roll, where key covers the file's
+sha256, PARSER_VERSION and the department table in effect (so a parser
+change or a department override never serves stale rows).
+
+File format (packed binary, zlib-compressed, columnar):
+    MAGIC | zlib( header_len:u32 | header JSON | reg_no column | index columns )
+- header: row count, the distinct subject/department/date/session strings
+  (dictionary encoding) and the parse summary
+- reg_no column: u64 per row (register numbers are 12 digits)
+- index columns: u32 per row into the dictionaries, one column per field
+
+The directory is capped at PARSE_CACHE_MAX_BYTES; least recently used
+entries (by mtime, refreshed on every hit) are evicted first.
+"""
+import hashlib
+import json
+import logging
+import os
+import struct
+import zlib
+from array import array
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'HAPC1'
+SUFFIX = '.roll'
+HASH_CHUNK_BYTES = 1024 * 1024
+REG_NO_DIGITS = 12
+DICT_FIELDS = ('subject_code', 'department', 'exam_date', 'session')
+
+
+def save_and_hash(file_storage, path):
+    """Stream an uploaded FileStorage to path, returning its sha256 hex digest"""
+    digest = hashlib.sha256()
+    with open(path, 'wb') as out:
+        while True:
+            chunk = file_storage.stream.read(HASH_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash, parser_version, departments):
+    """Key for a file parsed by parser_version under a degree-code -> department table"""
+    table = hashlib.sha1(json.dumps(sorted(departments.items())).encode()).hexdigest()[:12]
+    return f'{content_hash}-p{parser_version}-d{table}'
+
+
+class ParseCache:
+    """Size-capped directory of packed roll files"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_config(cls):
+        directory = current_app.config.get('PARSE_CACHE_DIR') or os.path.join(current_app.instance_path, 'parse_cache')
+        return cls(directory, current_app.config.get('PARSE_CACHE_MAX_BYTES', 0))
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """Return (rows, summary) for a cached parse, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            rows, summary = unpack_rows(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error, struct.error) as e:
+            logger.warning(f"Discarding unreadable parse cache entry {key}: {e}")
+            self._remove(path)
+            return None
+        os.utime(path)  # Mark as recently used
+        return rows, summary
+
+    def put(self, key, rows, summary):
+        """Store rows (a RowCollector or list of tuples), then evict down to max_bytes"""
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        data = pack_rows(rows, summary)
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the directory fits max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class RowCollector:
+    """
+    Pass-through over student tuples that keeps a compact columnar copy
+    (u64 register numbers + u32 dictionary indexes) for the parse cache.
+    """
+
+    def __init__(self, rows):
+        self._rows = rows
+        self.reg_nos = array('Q')
+        self.columns = [array('I') for _ in DICT_FIELDS]
+        self.dictionaries = [{} for _ in DICT_FIELDS]
+        self.packable = True
+
+    def __iter__(self):
+        reg_nos, columns, dictionaries = self.reg_nos, self.columns, self.dictionaries
+        for row in self._rows:
+            if self.packable:
+                reg_no = row[0]
+                if len(reg_no) == REG_NO_DIGITS and reg_no.isdigit():
+                    reg_nos.append(int(reg_no))
+                    for column, dictionary, value in zip(columns, dictionaries, row[1:]):
+                        index = dictionary.get(value)
+                        if index is None:
+                            index = dictionary[value] = len(dictionary)
+                        column.append(index)
+                else:
+                    self.packable = False  # Not a PDF register number: don't cache
+            yield row
+
+
+def pack_rows(rows, summary):
+    """Serialise a RowCollector (or list of tuples) into the cache format"""
+    if not isinstance(rows, RowCollector):
+        collector = RowCollector(rows)
+        for _ in collector:
+            pass
+        rows = collector
+    if not rows.packable:
+        raise ValueError('Rows cannot be packed')
+
+    header = json.dumps({
+        'rows': len(rows.reg_nos),
+        'dictionaries': [list(d) for d in rows.dictionaries],
+        'summary': summary
+    }, separators=(',', ':')).encode('utf-8')
+    body = [struct.pack('<I', len(header)), header, _le_bytes(rows.reg_nos)]
+    body.extend(_le_bytes(column) for column in rows.columns)
+    return MAGIC + zlib.compress(b''.join(body), 6)
+
+
+def unpack_rows(data):
+    """Inverse of pack_rows: (list of student tuples, summary)"""
+    if not data.startswith(MAGIC):
+        raise ValueError('Not a parse cache file')
+    body = zlib.decompress(data[len(MAGIC):])
+    (header_len,) = struct.unpack_from('<I', body, 0)
+    offset = 4 + header_len
+    header = json.loads(body[4:offset])
+    count = header['rows']
+
+    reg_nos = _from_le_bytes('Q', body, offset, count)
+    offset += count * 8
+    columns = []
+    for values in header['dictionaries']:
+        indexes = _from_le_bytes('I', body, offset, count)
+        offset += count * 4
+        columns.append([values[i] for i in indexes])
+    if offset != len(body):
+        raise ValueError('Truncated parse cache file')
+
+    reg_strings = [str(n).zfill(REG_NO_DIGITS) for n in reg_nos]
+    return list(zip(reg_strings, *columns)), header.get('summary')
+
+
+def _le_bytes(values):
+    if values.itemsize not in (4, 8):
+        raise ValueError('Unexpected array item size')
+    if struct.pack('=I', 1) != struct.pack('<I', 1):
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode, buffer, offset, count):
+    values = array(typecode)
+    values.frombytes(buffer[offset:offset + count * values.itemsize])
+    if len(values) != count:
+        raise ValueError('Truncated parse cache file')
+    if struct.pack('=I', 1) != struct.pack('<I', 1):
+        values.byteswap()
+    return values
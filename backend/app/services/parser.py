@@ -1,9 +1,28 @@
 """
 Excel and CSV Parser for Student Data
+
+Rows are cleaned with vectorised pandas string ops a chunk at a time (CSV is
+read CSV_CHUNK_ROWS rows per chunk) and come out as insert-ready
+(register_number, subject_code, department, exam_date, session) tuples.
 """
 import pandas as pd
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 from app.models import Student
+from app.services.validation import StudentValidator
+
+# Map possible column name variations (after lower-casing, spaces -> _)
+COLUMN_MAPPING = {
+    'register_number': ['register_number', 'registration_number', 'reg_no', 'regno', 'reg_number'],
+    'subject_code': ['subject_code', 'subject', 'sub_code', 'subcode'],
+    'department': ['department', 'dept', 'branch'],
+    'exam_date': ['exam_date', 'date', 'exam_day'],
+    'session': ['session', 'time', 'shift']
+}
+OUTPUT_COLUMNS = ['register_number', 'subject_code', 'department', 'exam_date', 'session']
+# Department may be omitted: it is then derived from the register number's degree code
+REQUIRED_COLUMNS = ['register_number', 'subject_code', 'exam_date', 'session']
+CSV_CHUNK_ROWS = 50000
+ISO_DATE_PATTERN = r'^\d{4}-\d{2}-\d{2}(?:[ T]00:00:00)?$'
 
 def parse_file(file_path: str) -> List[Student]:
     """
@@ -12,7 +31,7 @@ def parse_file(file_path: str) -> List[Student]:
     Expected columns:
     - Register Number / Registration Number
     - Subject Code / Subject
-    - Department / Dept
+    - Department / Dept (optional)
     - Exam Date / Date
     - Session
     
@@ -22,80 +41,95 @@ def parse_file(file_path: str) -> List[Student]:
     Returns:
         List of Student objects
     """
-    # Read file based on extension
-    if file_path.endswith('.csv'):
-        df = pd.read_csv(file_path)
+    return [
+        Student(register_number=reg_no, subject_code=subject_code, department=department,
+                exam_date=exam_date, session=session)
+        for reg_no, subject_code, department, exam_date, session in parse_file_rows(file_path)
+    ]
+
+def parse_file_rows(file_path: str, departments: Optional[Dict[str, str]] = None) -> List[Tuple[str, str, str, str, str]]:
+    """
+    Parse an Excel/CSV roster into
+    (register_number, subject_code, department, exam_date, session) tuples
+    """
+    rows = list(iter_tabular_rows(file_path, departments))
+    if not rows:
+        raise ValueError("No valid student records found in file")
+    return rows
+
+def iter_tabular_rows(file_path: str, departments: Optional[Dict[str, str]] = None) -> Iterator[Tuple[str, str, str, str, str]]:
+    """
+    Stream insert-ready student tuples from a CSV (read CSV_CHUNK_ROWS at a
+    time) or Excel file. Cleaning is done with vectorised pandas string ops
+    per chunk; rows missing a register number, subject code, exam date or
+    session are dropped (they would form a bogus '' session when seating).
+
+    departments: degree code -> department, used when the file has no
+    department column (default: the parser's department table)
+    """
+    if file_path.lower().endswith('.csv'):
+        # dtype=str keeps register numbers exact (no floats / lost leading zeros)
+        chunks = pd.read_csv(file_path, dtype=str, keep_default_na=False, chunksize=CSV_CHUNK_ROWS,
+                             skipinitialspace=True)
     else:
-        df = pd.read_excel(file_path)
-    
+        chunks = [pd.read_excel(file_path, dtype=str, keep_default_na=False)]
+
+    columns = None
+    for chunk in chunks:
+        if columns is None:
+            columns = _resolve_columns(chunk.columns)
+            if 'department' not in columns and departments is None:
+                from app.services.pdf_parser import department_table
+                departments = department_table()
+        cleaned = _clean_chunk(chunk, columns, departments)
+        yield from zip(*(cleaned[c].tolist() for c in OUTPUT_COLUMNS))
+
+def _resolve_columns(raw_columns) -> Dict[str, str]:
+    """{canonical name: column label in the file}; raises on missing columns"""
     # Normalize column names (case-insensitive, strip whitespace)
-    df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
-    
-    # Map possible column name variations
-    column_mapping = {
-        'register_number': ['register_number', 'registration_number', 'reg_no', 'regno', 'reg_number'],
-        'subject_code': ['subject_code', 'subject', 'sub_code', 'subcode'],
-        'department': ['department', 'dept', 'branch'],
-        'exam_date': ['exam_date', 'date', 'exam_day'],
-        'session': ['session', 'time', 'shift']
-    }
-    
-    # Find actual column names
+    normalised = pd.Index(raw_columns).astype(str).str.strip().str.lower().str.replace(' ', '_')
     actual_columns = {}
-    for key, variations in column_mapping.items():
-        for col in df.columns:
+    for key, variations in COLUMN_MAPPING.items():
+        for raw, col in zip(raw_columns, normalised):
             if col in variations:
-                actual_columns[key] = col
+                actual_columns[key] = raw
                 break
-    
-    # Validate required columns
-    required = ['register_number', 'subject_code', 'department', 'exam_date', 'session']
-    missing = [k for k in required if k not in actual_columns]
-    
+
+    missing = [k for k in REQUIRED_COLUMNS if k not in actual_columns]
     if missing:
         raise ValueError(f"Missing required columns: {', '.join(missing)}")
-    
-    # Parse students
-    students = []
-    for _, row in df.iterrows():
-        try:
-            student = Student(
-                registerNumber=str(row[actual_columns['register_number']]).strip().upper(),
-                subjectCode=str(row[actual_columns['subject_code']]).strip().upper(),
-                department=str(row[actual_columns['department']]).strip().upper(),
-                examDate=str(row[actual_columns['exam_date']]).strip(),
-                session=str(row[actual_columns['session']]).strip().upper()
-            )
-            students.append(student)
-        except Exception as e:
-            # Skip invalid rows
-            print(f"Skipping invalid row: {e}")
-            continue
-    
-    if not students:
-        raise ValueError("No valid student records found in file")
-    
-    return students
+    return actual_columns
+
+def _clean_chunk(chunk: pd.DataFrame, columns: Dict[str, str], departments: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Vectorised clean-up of one chunk into the OUTPUT_COLUMNS frame"""
+    out = pd.DataFrame({key: chunk[col].astype(str).str.strip() for key, col in columns.items()})
+
+    out['register_number'] = out['register_number'].str.upper().str.replace(r'\.0$', '', regex=True)
+    out['subject_code'] = out['subject_code'].str.upper()
+    out['session'] = out['session'].str.upper()
+
+    # Spreadsheet dates arrive as ISO timestamps; use the roll's DD-Mon-YYYY
+    iso = out['exam_date'].str.match(ISO_DATE_PATTERN)
+    if iso.any():
+        out.loc[iso, 'exam_date'] = pd.to_datetime(out.loc[iso, 'exam_date'].str[:10]).dt.strftime('%d-%b-%Y')
+
+    if 'department' in out:
+        out['department'] = out['department'].str.upper()
+    else:
+        codes = out['register_number'].str[6:9]
+        out['department'] = codes.map(departments).fillna(codes)
+
+    return out[(out[REQUIRED_COLUMNS] != '').all(axis=1)]
 
 def validate_student_data(students: List[Student]) -> List[str]:
     """
     Validate student data and return list of warnings/errors
+    (single pass; see app.services.validation for the structured report)
     
     Returns:
         List of warning messages (empty if all valid)
     """
-    warnings = []
-    
-    # Check for duplicate registration numbers
-    reg_numbers = [s.registerNumber for s in students]
-    duplicates = set([x for x in reg_numbers if reg_numbers.count(x) > 1])
-    if duplicates:
-        warnings.append(f"Duplicate registration numbers found: {', '.join(duplicates)}")
-    
-    # Check session values
-    valid_sessions = ['FN', 'AN']
-    invalid_sessions = set([s.session for s in students if s.session not in valid_sessions])
-    if invalid_sessions:
-        warnings.append(f"Invalid session values found: {', '.join(invalid_sessions)}. Expected FN or AN")
-    
-    return warnings
+    validator = StudentValidator()
+    for s in students:
+        validator.add((s.register_number, s.subject_code, s.department, s.exam_date, s.session))
+    return validator.warnings()
@@ -1,86 +1,257 @@
-
-import pdfplumber
 import re
+import sys
+import logging
+import itertools
+import collections
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, has_app_context
 from app.models import Student, db
 from app.services import validate_student_data
+from app.services.pdf_text import iter_page_texts, resolve_backend, count_pages
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change alters the students parsed from a given PDF (invalidates the parse cache)
+PARSER_VERSION = 2
+
+# Regex patterns (compiled once; the literal prefixes let most lines skip them)
+DATE_SESSION_PREFIX = 'Exam Date:'
+SUBJECT_PREFIX = 'Subject:'
+DATE_SESSION_RE = re.compile(r"Exam Date:\s*(\d{2}-[A-Za-z]{3}-\d{4})\s*/\s*(FN|AN)")
+SUBJECT_RE = re.compile(r"Subject:\s*([A-Z0-9]+):(.+?)(?:\s+Question Paper Code|$)")
+REG_NO_RE = re.compile(r"\b\d{12}\b") # Matches 12 digit register numbers
+
+# Anna University degree codes (register number digits 7-9) -> department.
+# Rows in the department_code table override / extend these.
+DEFAULT_DEPARTMENTS = {
+    '102': 'AUTO',
+    '103': 'CIVIL',
+    '104': 'CSE',
+    '105': 'EEE',
+    '106': 'ECE',
+    '114': 'MECH',
+    '159': 'CSE(DS)',
+    '205': 'IT',
+}
+_department_cache = {'version': None, 'table': DEFAULT_DEPARTMENTS}
+
+# Page events produced by the tokeniser (stage 1) and consumed by the stitch pass (stage 2)
+PageTokens = namedtuple('PageTokens', ['lines', 'events'])
+EVENT_DATE = 'D'      # ('D', exam_date, session)
+EVENT_SUBJECT = 'S'   # ('S', subject_code)
+EVENT_REG_NOS = 'R'   # ('R', [register numbers...])
 
-def parse_pdf(file_path):
+# Rolls shorter than this are parsed in-process (pool start-up would dominate)
+MIN_PARALLEL_PAGES = 24
+# Contiguous page ranges handed to each worker = workers * CHUNKS_PER_WORKER
+CHUNKS_PER_WORKER = 4
+
+def parse_pdf(file_path, backend=None, workers=None):
     """
     Parses student data from University Exam PDF format.
     Ref: 19.11.25.pdf
     Expected format:
     - Text blocks containing "Institution:", "Exam Date:", "Subject:", "Question Paper Code :"
     - List of registration numbers below the subject details.
+
+    Returns a list of (transient) Student objects; see iter_pdf_students
+    for the streaming form and the backend / workers arguments.
+    """
+    return _to_students(iter_pdf_students(file_path, backend, workers))
+
+def iter_pdf_students(file_path, backend=None, workers=None, stats=None, departments=None, fallback=None):
+    """
+    Lazily yield (register_number, subject_code, department, exam_date, session)
+    tuples in roll order, holding only a few pages in memory at a time.
+
+    backend: text extraction backend (see pdf_text.TEXT_BACKENDS); defaults
+    to PDF_TEXT_BACKEND.
+    fallback: if the backend fails on a page, extract that page and the rest
+    of the file with pdfplumber instead of giving up (pages already parsed
+    are kept). Defaults to on when no backend is given, so an explicitly
+    chosen backend (e.g. by the benchmark) is used alone.
+    workers: processes used to extract/tokenise pages; defaults to
+    PDF_PARSE_WORKERS. Exam/subject context that carries across page breaks
+    is resolved afterwards by a sequential stitch pass, so the result is the
+    same as a serial parse.
+    stats: optional ParseStats filled with per-page counters.
+    departments: degree code -> department table (default: department_table()).
+    """
+    if workers is None:
+        workers = configured_parse_workers()
+    if fallback is None:
+        fallback = backend is None
+    backend = resolve_backend(backend)
+    if not fallback or backend == 'pdfplumber':
+        yield from iter_stitched(_iter_page_events(file_path, backend, workers), stats, departments)
+        return
+
+    yield from iter_stitched(_iter_page_events_with_fallback(file_path, backend, workers), stats, departments)
+
+def _iter_page_events_with_fallback(file_path, backend, workers):
+    """_iter_page_events, resuming with pdfplumber from the page `backend` failed on"""
+    done = 0
+    try:
+        for events in _iter_page_events(file_path, backend, workers):
+            yield events
+            done += 1
+    except Exception as e:
+        # Pages come out whole and in order, so the first `done` pages are good
+        logger.warning(f"PDF text extraction failed after {done} pages ({e}); continuing with pdfplumber")
+        for text in iter_page_texts(file_path, 'pdfplumber', range(done, count_pages(file_path))):
+            yield tokenise_page(text)
+
+def _iter_page_events(file_path, backend, workers):
+    """Yield each page's tokenised events in page order"""
+    page_count = count_pages(file_path) if workers > 1 else 0
+
+    if workers <= 1 or page_count < MIN_PARALLEL_PAGES:
+        for text in iter_page_texts(file_path, backend):
+            yield tokenise_page(text)
+        return
+
+    chunk_count = min(page_count, workers * CHUNKS_PER_WORKER)
+    bounds = [page_count * i // chunk_count for i in range(chunk_count + 1)]
+    tasks = iter([(file_path, backend, bounds[i], bounds[i + 1]) for i in range(chunk_count)])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # At most 2 ranges per worker in flight, consumed in page order, so a
+        # slow consumer (DB inserts) does not let finished pages pile up
+        pending = collections.deque(pool.submit(_tokenise_page_range, t) for t in itertools.islice(tasks, workers * 2))
+        while pending:
+            chunk = pending.popleft().result()
+            for task in itertools.islice(tasks, 1):
+                pending.append(pool.submit(_tokenise_page_range, task))
+            yield from chunk
+
+def configured_parse_workers():
+    if getattr(sys, 'frozen', False):
+        return 1  # Desktop build: no re-entrant child processes
+    if has_app_context():
+        return current_app.config.get('PDF_PARSE_WORKERS', 1)
+    return 1
+
+def _tokenise_page_range(task):
+    """Worker: extract and tokenise pages [start, stop) of the file"""
+    file_path, backend, start, stop = task
+    return [tokenise_page(text) for text in iter_page_texts(file_path, backend, range(start, stop))]
+
+def tokenise_page(text):
     """
-    students = []
+    Stage 1: turn one page's text into PageTokens(line count, header /
+    register-number events). Needs no state from earlier pages, so pages
+    can be tokenised independently.
+    """
+    events = []
+    if not text:
+        return PageTokens(0, events)
+
+    lines = text.split('\n')
+    for line in lines:
+        # Extract Exam Date and Session
+        if DATE_SESSION_PREFIX in line:
+            date_match = DATE_SESSION_RE.search(line)
+            if date_match:
+                events.append((EVENT_DATE, date_match.group(1), date_match.group(2)))
+                continue
+
+        # Extract Subject Code and Name
+        if SUBJECT_PREFIX in line:
+            subject_match = SUBJECT_RE.search(line)
+            if subject_match:
+                events.append((EVENT_SUBJECT, subject_match.group(1).strip()))
+                continue
+
+        # Find all 12-digit numbers in the line
+        reg_nos = REG_NO_RE.findall(line)
+        if reg_nos:
+            events.append((EVENT_REG_NOS, reg_nos))
+    return PageTokens(len(lines), events)
+
+def stitch_page_events(page_tokens, stats=None):
+    """Stage 2 as a list of (transient) Student objects"""
+    return _to_students(iter_stitched(page_tokens, stats))
+
+def _to_students(rows):
+    return [
+        Student(register_number=reg_no, subject_code=subject_code, department=department,
+                exam_date=exam_date, session=sess)
+        for reg_no, subject_code, department, exam_date, sess in rows
+    ]
+
+def iter_stitched(page_tokens, stats=None, departments=None):
+    """
+    Stage 2: walk the events of every page in page order, carrying the
+    current exam date/session/subject across pages, and yield student tuples.
+    stats: optional ParseStats collecting per-page counters.
+    """
+    if departments is None:
+        departments = department_table()
     current_exam_date = None
     current_session = None
     current_subject_code = None
-    current_subject_name = None
-    
-    # Regex patterns
-    date_session_pattern = r"Exam Date:\s*(\d{2}-[A-Za-z]{3}-\d{4})\s*/\s*(FN|AN)"
-    subject_pattern = r"Subject:\s*([A-Z0-9]+):(.+?)(?:\s+Question Paper Code|$)"
-    reg_no_pattern = r"\b\d{12}\b" # Matches 12 digit register numbers
-
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-            
-            lines = text.split('\n')
-            
-            for line in lines:
-                # Extract Exam Date and Session
-                date_match = re.search(date_session_pattern, line)
-                if date_match:
-                    current_exam_date = date_match.group(1)
-                    current_session = date_match.group(2)
-                    continue
-
-                # Extract Subject Code and Name
-                subject_match = re.search(subject_pattern, line)
-                if subject_match:
-                    current_subject_code = subject_match.group(1).strip()
-                    current_subject_name = subject_match.group(2).strip()
-                    continue
-
-                # Extract Register Numbers
-                # Only proceed if we have active context
+
+    for page in page_tokens:
+        headers = reg_nos_seen = students = 0
+        for event in page.events:
+            kind = event[0]
+            if kind == EVENT_DATE:
+                current_exam_date, current_session = event[1], event[2]
+                headers += 1
+            elif kind == EVENT_SUBJECT:
+                current_subject_code = event[1]
+                headers += 1
+            else:
+                reg_nos_seen += len(event[1])
+                # Register numbers only count once there is active context
                 if current_exam_date and current_session and current_subject_code:
-                    # Find all 12-digit numbers in the line
-                    reg_nos = re.findall(reg_no_pattern, line)
-                    for reg_no in reg_nos:
-                        # Determine department from reg_no or other logic if needed.
-                        # For now, simplistic department extraction (e.g., 5th-8th chars)
-                        # Example: 731120104024 -> 104 -> Mapping needed or just use code
+                    students += len(event[1])
+                    for reg_no in event[1]:
                         # Standard Anna Univ: CollegeCode(4) + Year(2) + DegCode(3) + Serial(3)
-                        # Degree Codes: 104=CSE, 106=ECE, 105=EEE, 103=Civil, 114=Mech etc.
                         dept_code = reg_no[6:9]
-                        department = get_dept_from_code(dept_code)
-                        
-                        student = Student(
-                            register_number=reg_no,
-                            subject_code=current_subject_code,
-                            department=department,
-                            exam_date=current_exam_date,
-                            session=current_session
-                        )
-                        students.append(student)
-
-    return students
+                        yield (reg_no, current_subject_code, departments.get(dept_code, dept_code),
+                               current_exam_date, current_session)
+        if stats is not None:
+            stats.add_page(page.lines, headers, reg_nos_seen, students)
+
+class ParseStats:
+    """Per-page counters of a parse: lines, header matches, register numbers, students"""
+
+    def __init__(self):
+        self.pages = []
+
+    def add_page(self, lines, headers, reg_nos, students):
+        self.pages.append({'page': len(self.pages) + 1, 'lines': lines, 'headers': headers,
+                           'regNos': reg_nos, 'students': students})
+
+    def summary(self):
+        totals = {'pages': len(self.pages), 'lines': 0, 'headers': 0, 'regNos': 0, 'students': 0}
+        for page in self.pages:
+            for key in ('lines', 'headers', 'regNos', 'students'):
+                totals[key] += page[key]
+        # Pages with register numbers but no students lost their exam context
+        totals['orphanPages'] = [p['page'] for p in self.pages if p['regNos'] and not p['students']]
+        return totals
+
+def department_table():
+    """
+    Degree code -> department: DEFAULT_DEPARTMENTS overlaid with the
+    department_code table. Cached per process and reloaded when the table's
+    version changes (edits through /api/admin/department-codes bump it).
+    """
+    if not has_app_context():
+        return _department_cache['table']
+    from app.models.sql import DepartmentCode
+    from app.services.generation import department_codes_version
+
+    version = department_codes_version()
+    if _department_cache['version'] != version:
+        table = dict(DEFAULT_DEPARTMENTS)
+        table.update(db.session.query(DepartmentCode.code, DepartmentCode.department).all())
+        _department_cache.update(version=version, table=table)
+    return _department_cache['table']
 
 def get_dept_from_code(code):
     """Maps Anna University degree codes to Department names"""
-    mapping = {
-        '102': 'AUTO',
-        '103': 'CIVIL',
-        '104': 'CSE',
-        '105': 'EEE',
-        '106': 'ECE',
-        '114': 'MECH',
-        '159': 'CSE(DS)',
-        '205': 'IT',
-    }
-    return mapping.get(code, str(code))
+    return department_table().get(code, str(code))
@@ -0,0 +1,146 @@
+"""
+PDF Text Extraction Backends
+
+parse_pdf only needs the text lines of each page, in reading order. Two
+interchangeable backends yield one str per page:
+
+- pdfminer:   drives pdfminer.six directly with layout analysis disabled and
+              groups the raw glyphs into lines itself (baseline clustering,
+              gap-based word breaks). Skips the per-glyph dict objects that
+              pdfplumber builds, so it is several times faster.
+- pdfplumber: page.extract_text(); the original behaviour, kept as fallback.
+
+The backend is picked per call, else by the PDF_TEXT_BACKEND setting
+(default 'pdfminer'). If pdfminer fails on a page, parse_pdf continues
+from that page with 'pdfplumber'.
+"""
+from flask import current_app, has_app_context
+
+DEFAULT_BACKEND = 'pdfminer'
+
+# Same tolerances as pdfplumber's extract_text defaults, so both backends
+# break lines and words in the same places
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+
+def iter_pdfminer_pages(file_path, pages=None):
+    """Yield the text of each page (or only `pages`) via pdfminer.six, no layout analysis"""
+    from pdfminer.converter import PDFLayoutAnalyzer
+    from pdfminer.layout import LTChar, LTContainer
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    class _CharCollector(PDFLayoutAnalyzer):
+        """Receives each laid-out page (no LAParams: a flat tree of glyphs)"""
+
+        def __init__(self, rsrcmgr):
+            super().__init__(rsrcmgr, laparams=None)
+            self.chars = []
+
+        def receive_layout(self, ltpage):
+            height = ltpage.y1
+            stack = [ltpage]
+            chars = self.chars
+            while stack:
+                for item in stack.pop():
+                    if isinstance(item, LTChar):
+                        chars.append((height - item.y1, item.x0, item.x1, item.get_text()))
+                    elif isinstance(item, LTContainer):
+                        stack.append(item)
+
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = _CharCollector(rsrcmgr)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    with open(file_path, 'rb') as f:
+        for page in PDFPage.get_pages(f, pagenos=set(pages) if pages is not None else None):
+            device.chars = []
+            interpreter.process_page(page)
+            yield chars_to_text(device.chars)
+
+
+def iter_pdfplumber_pages(file_path, pages=None):
+    """Yield page.extract_text() for each page (empty string for blank pages)"""
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        selected = pdf.pages if pages is None else [pdf.pages[n] for n in pages]
+        for page in selected:
+            yield page.extract_text() or ''
+            # Free the parsed objects of finished pages on long rolls
+            page.flush_cache()
+
+
+def chars_to_text(chars):
+    """
+    Group (top, x0, x1, text) glyphs into lines of words.
+    Lines: glyphs whose tops lie within Y_TOLERANCE of the previous one.
+    Words: split on blank glyphs and on horizontal gaps > X_TOLERANCE.
+    """
+    if not chars:
+        return ''
+    chars.sort(key=lambda c: c[0])
+
+    lines, line, last_top = [], [], None
+    for char in chars:
+        if last_top is not None and char[0] - last_top > Y_TOLERANCE:
+            lines.append(line)
+            line = []
+        line.append(char)
+        last_top = char[0]
+    lines.append(line)
+
+    out = []
+    for line in lines:
+        line.sort(key=lambda c: c[1])
+        words, word, prev_x1 = [], [], None
+        for _, x0, x1, text in line:
+            if text.isspace():
+                if word:
+                    words.append(''.join(word))
+                    word = []
+                prev_x1 = None
+                continue
+            if word and prev_x1 is not None and x0 - prev_x1 > X_TOLERANCE:
+                words.append(''.join(word))
+                word = []
+            word.append(text)
+            prev_x1 = x1
+        if word:
+            words.append(''.join(word))
+        out.append(' '.join(words))
+    return '\n'.join(out)
+
+
+TEXT_BACKENDS = {
+    'pdfminer': iter_pdfminer_pages,
+    'pdfplumber': iter_pdfplumber_pages,
+}
+
+
+def resolve_backend(backend=None):
+    """Validate a backend name, defaulting to the PDF_TEXT_BACKEND setting"""
+    if backend is None:
+        backend = current_app.config.get('PDF_TEXT_BACKEND', DEFAULT_BACKEND) if has_app_context() else DEFAULT_BACKEND
+    if backend not in TEXT_BACKENDS:
+        raise ValueError(f'Unknown PDF text backend: {backend}')
+    return backend
+
+
+def iter_page_texts(file_path, backend=None, pages=None):
+    """
+    Yield one text string per page with the chosen (or configured) backend.
+    pages: optional iterable of 0-based page numbers (ascending) to extract.
+    """
+    return TEXT_BACKENDS[resolve_backend(backend)](file_path, pages)
+
+
+def count_pages(file_path):
+    """Number of pages, from the page tree only (no content is parsed)"""
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    with open(file_path, 'rb') as f:
+        document = PDFDocument(PDFParser(f))
+        return sum(1 for _ in PDFPage.create_pages(document))
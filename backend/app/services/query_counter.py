@@ -0,0 +1,27 @@
+"""
+Per-request SQL statement counter (diagnostics / load testing)
+
+When enabled (DB_QUERY_COUNT_HEADER=1), every response carries an
+X-DB-Queries header with the number of statements the request executed.
+"""
+from flask import g, has_request_context
+from sqlalchemy import event
+from app.extensions import db
+
+HEADER_NAME = 'X-DB-Queries'
+
+
+def install_query_counter(app):
+    """Count statements per request and report them in a response header"""
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.db_query_count = g.get('db_query_count', 0) + 1
+
+    @app.after_request
+    def _add_header(response):
+        response.headers[HEADER_NAME] = str(g.get('db_query_count', 0))
+        return response
@@ -0,0 +1,97 @@
+"""
+Bounded LRU Response Cache
+
+Thread-safe LRU of fully serialised responses with a per-entry TTL and
+hit/miss/eviction counters. Keys include the data generation, so a bump
+makes every older entry unreachable; they are then dropped lazily or by
+clear().
+"""
+import threading
+import time
+from collections import OrderedDict
+from app.services.generation import on_generation_bump
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL_SECONDS = 300
+
+
+class LRUCache:
+    """Least-recently-used cache with TTL; safe to share between threads"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL_SECONDS):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def configure(self, maxsize=None, ttl=None):
+        """Change size/TTL (shrinking evicts the oldest entries)"""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._trim()
+
+    def get(self, key):
+        """Return the cached value or None"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Insert or refresh an entry"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            self._trim()
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hitRate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _trim(self):
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+# Per-worker cache of serialised /api/search responses, keyed by
+# (register number, data generation)
+search_cache = LRUCache()
+on_generation_bump(search_cache.clear)
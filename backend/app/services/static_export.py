@@ -0,0 +1,148 @@
+"""
+Static Seat Lookup Export
+
+Publishes the student seat lookup as static JSON shards so the student page
+can be served from any static host/CDN on exam morning.
+
+Layout of the output directory:
+- manifest.json             shard list with sha256 of each shard's JSON
+- shards/<prefix>.json      {registerNumber: [seat, ...]} for one prefix
+- shards/<prefix>.json.gz   precompressed copies (.br when brotli is installed)
+
+A client looks up register number R by fetching shards/<R[:prefixLength]>.json.
+The export is incremental: shards whose hash is unchanged are not rewritten,
+and shards for prefixes that disappeared are removed.
+"""
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from app.extensions import db
+from app.models.sql import Allocation, Hall
+from app.services.generation import current_generation
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip copies are written without it
+    brotli = None
+
+DEFAULT_PREFIX_LENGTH = 9  # College(4) + Year(2) + Degree(3)
+MANIFEST_NAME = 'manifest.json'
+SHARD_DIR = 'shards'
+
+
+def export_student_shards(output_dir, prefix_length=DEFAULT_PREFIX_LENGTH):
+    """
+    Write (or refresh) the sharded seat lookup under output_dir.
+
+    Returns:
+        dict with counts: shards, written, unchanged, removed
+    """
+    generation = current_generation()
+    shards = _build_shards(prefix_length)
+
+    shard_dir = os.path.join(output_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    previous = _read_manifest(output_dir)
+    previous_shards = previous.get('shards', {}) if previous.get('prefixLength') == prefix_length else {}
+
+    manifest_shards = {}
+    written = unchanged = 0
+    for prefix, students in sorted(shards.items()):
+        body = json.dumps(students, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+        file_name = f'{SHARD_DIR}/{prefix}.json'
+        manifest_shards[prefix] = {
+            'file': file_name,
+            'sha256': digest,
+            'bytes': len(body),
+            'students': len(students)
+        }
+
+        if previous_shards.get(prefix, {}).get('sha256') == digest and _shard_files_exist(output_dir, file_name):
+            unchanged += 1
+            continue
+        _write_shard(output_dir, file_name, body)
+        written += 1
+
+    removed = 0
+    for prefix, entry in previous_shards.items():
+        if prefix not in manifest_shards:
+            for path in _shard_paths(output_dir, entry['file']):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed += 1
+
+    if written or removed or previous.get('generation') != generation or previous.get('shards') != manifest_shards:
+        _atomic_write(os.path.join(output_dir, MANIFEST_NAME), json.dumps({
+            'version': 1,
+            'generation': generation,
+            'prefixLength': prefix_length,
+            'generatedAt': datetime.utcnow().isoformat() + 'Z',
+            'encodings': ['gzip', 'br'] if brotli else ['gzip'],
+            'shards': manifest_shards
+        }, indent=2, sort_keys=True).encode('utf-8'))
+
+    return {'shards': len(manifest_shards), 'written': written, 'unchanged': unchanged, 'removed': removed}
+
+
+def _build_shards(prefix_length):
+    """Group every allocation into {prefix: {registerNumber: [seat, ...]}}"""
+    hall_blocks = {}
+    for name, block in db.session.query(Hall.name, Hall.block):
+        hall_blocks.setdefault(name, block)
+
+    rows = db.session.query(
+        Allocation.register_number, Allocation.session_key, Allocation.subject_code,
+        Allocation.hall_name, Allocation.seat_number, Allocation.row_num, Allocation.col_num
+    ).order_by(Allocation.register_number, Allocation.session_key, Allocation.id)
+
+    shards = defaultdict(lambda: defaultdict(list))
+    for reg_no, session_key, subject, hall_name, seat_number, row, col in rows:
+        # Same fields as a lightweight /api/search match
+        shards[reg_no[:prefix_length]][reg_no].append({
+            'session': session_key,
+            'formattedSession': session_key.replace('_', ' '),
+            'subject': subject,
+            'hallName': hall_name,
+            'block': hall_blocks.get(hall_name, ''),
+            'seatNumber': seat_number,
+            'row': row,
+            'col': col
+        })
+    return shards
+
+
+def _read_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def _shard_paths(output_dir, file_name):
+    base = os.path.join(output_dir, file_name)
+    return [base, base + '.gz'] + ([base + '.br'] if brotli else [])
+
+
+def _shard_files_exist(output_dir, file_name):
+    return all(os.path.exists(path) for path in _shard_paths(output_dir, file_name))
+
+
+def _write_shard(output_dir, file_name, body):
+    base = os.path.join(output_dir, file_name)
+    _atomic_write(base, body)
+    # mtime=0 keeps the gzip bytes deterministic for identical content
+    _atomic_write(base + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli:
+        _atomic_write(base + '.br', brotli.compress(body, quality=11))
+
+
+def _atomic_write(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
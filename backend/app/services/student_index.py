@@ -0,0 +1,150 @@
+"""
+In-Memory Student Index
+
+Per-worker map of register number -> seat entries, so /api/search can be
+answered without touching SQL. The index is tagged with the data generation
+it was built from and rebuilt (off to the side, then swapped in) when the
+DB counter moves on.
+
+- Writes in this worker mark the index stale immediately (see generation.py).
+- Writes in other workers are noticed by polling the counter at most every
+  STUDENT_INDEX_CHECK_SECONDS.
+"""
+import bisect
+import threading
+import time
+from collections import defaultdict, namedtuple
+from flask import current_app
+from app.extensions import db
+from app.models.sql import Allocation, Hall
+from app.services.generation import current_generation, on_generation_bump
+from app.services.hall_sketch import get_sketch_payloads
+
+DEFAULT_CHECK_SECONDS = 2.0
+
+SeatEntry = namedtuple('SeatEntry', [
+    'session_key', 'hall_name', 'row', 'col', 'seat_number', 'subject_code', 'department'
+])
+
+
+class StudentIndex:
+    """Register number -> tuple of SeatEntry, plus memoised hall sketches"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._entries = {}
+        self._sorted_keys = ()
+        self._hall_blocks = {}
+        self._sketches = {}
+        self._checked_at = 0.0
+        self._stale = True
+
+    @property
+    def generation(self):
+        """Generation the current index was built from (None before first build)"""
+        return self._generation
+
+    def mark_stale(self):
+        """Force a generation check on the next lookup"""
+        self._stale = True
+
+    def lookup(self, register_number):
+        """Return the student's seat entries (empty tuple if unknown)"""
+        self.refresh()
+        return self._entries.get(register_number, ())
+
+    def hall_block(self, hall_name):
+        """Block of a hall as of the index generation ('' if unknown)"""
+        return self._hall_blocks.get(hall_name, '')
+
+    def lookup_many(self, register_numbers):
+        """Return {register_number: entries} for every requested number (missing -> ())"""
+        self.refresh()
+        entries = self._entries
+        return {reg_no: entries.get(reg_no, ()) for reg_no in register_numbers}
+
+    def lookup_range(self, first, last):
+        """Return {register_number: entries} for indexed numbers in [first, last]"""
+        self.refresh()
+        entries, keys = self._entries, self._sorted_keys
+        lo = bisect.bisect_left(keys, first)
+        hi = bisect.bisect_right(keys, last)
+        # .get(): a concurrent swap may pair new keys with old entries for an instant
+        return {reg_no: entries.get(reg_no, ()) for reg_no in keys[lo:hi] if reg_no in entries}
+
+    def sketch_payloads(self, pairs):
+        """Return {(session_key, hall_name): payload} for pairs, memoised per generation"""
+        sketches = self._sketches
+        missing = [p for p in set(pairs) if p not in sketches]
+        if missing:
+            generation = self._generation
+            fetched = get_sketch_payloads(missing)
+            with self._lock:
+                # Only memoise if no rebuild happened meanwhile
+                if generation == self._generation:
+                    self._sketches.update(fetched)
+            return {**sketches, **fetched}
+        return sketches
+
+    def rebuild(self):
+        """Rebuild the index from the database and swap it in"""
+        with self._lock:
+            self._build()
+
+    def refresh(self):
+        """Rebuild if the data generation moved on; return the index generation"""
+        interval = current_app.config.get('STUDENT_INDEX_CHECK_SECONDS', DEFAULT_CHECK_SECONDS)
+        now = time.monotonic()
+        if not self._stale and now - self._checked_at < interval:
+            return self._generation
+
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            if not self._stale and time.monotonic() - self._checked_at < interval:
+                return self._generation
+            self._stale = False
+            if current_generation() != self._generation:
+                self._build()
+            self._checked_at = time.monotonic()
+            return self._generation
+
+    def _build(self):
+        # Read the counter first: a write landing mid-build then shows up as a
+        # newer generation on the next check instead of being masked.
+        generation = current_generation()
+        rows = db.session.query(
+            Allocation.register_number, Allocation.session_key, Allocation.hall_name,
+            Allocation.row_num, Allocation.col_num, Allocation.seat_number,
+            Allocation.subject_code, Allocation.department
+        ).order_by(Allocation.id).all()
+
+        hall_blocks = {}
+        for name, block in db.session.query(Hall.name, Hall.block):
+            # Hall names are not unique; keep the first like filter_by().first()
+            hall_blocks.setdefault(name, block)
+
+        entries = defaultdict(list)
+        for reg_no, *seat in rows:
+            entries[reg_no].append(SeatEntry(*seat))
+
+        self._entries = {reg_no: tuple(seats) for reg_no, seats in entries.items()}
+        self._sorted_keys = tuple(sorted(self._entries))
+        self._hall_blocks = hall_blocks
+        self._sketches = {}
+        self._generation = generation
+        self._checked_at = time.monotonic()
+
+
+# Per-worker instance
+student_index = StudentIndex()
+on_generation_bump(student_index.mark_stale)
+
+
+def warm_student_index():
+    """Build the index at worker boot; tolerate a not-yet-migrated database"""
+    try:
+        student_index.rebuild()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Student index not built at startup: {e}")
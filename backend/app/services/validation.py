@@ -0,0 +1,134 @@
+"""
+Student Roster Validation
+
+Single-pass, hash-map based checks over
+(register_number, subject_code, department, exam_date, session) rows, fed
+one at a time by the parsers / ingest so nothing has to be materialised:
+
+- duplicate:          the same register number twice in one (exam_date, session);
+                      several papers on different sessions are normal
+- invalid_session:    session other than FN / AN
+- malformed_reg_no:   register number that is not exactly 12 digits
+- unknown_department: degree code (digits 7-9) missing from the department table
+- session_outlier:    session far larger / smaller than the median session
+
+report() returns counts plus at most SAMPLE_LIMIT samples per issue;
+warnings() renders the same as short messages for the upload response.
+"""
+from statistics import median
+
+SAMPLE_LIMIT = 10
+VALID_SESSIONS = ('FN', 'AN')
+REG_NO_DIGITS = 12
+
+# A session is an outlier if it is OUTLIER_FACTOR times larger, or smaller,
+# than the median session (only judged with MIN_SESSIONS_FOR_OUTLIERS sessions)
+OUTLIER_FACTOR = 4
+MIN_SESSIONS_FOR_OUTLIERS = 3
+
+ISSUE_MESSAGES = {
+    'duplicate': 'Register numbers listed more than once in the same session',
+    'invalid_session': 'Invalid session values (expected FN or AN)',
+    'malformed_reg_no': 'Register numbers that are not 12 digits',
+    'unknown_department': 'Register numbers with an unknown degree code',
+    'session_outlier': 'Sessions with an unusual number of students',
+}
+
+
+class StudentValidator:
+    """
+    Incremental roster validator.
+
+    Args:
+        department_codes: known degree codes (e.g. department_table().keys());
+            None skips the unknown-department check
+    """
+
+    def __init__(self, department_codes=None):
+        self.department_codes = set(department_codes) if department_codes is not None else None
+        self.rows = 0
+        self._seats = set()             # (register_number, exam_date, session)
+        self._session_sizes = {}        # (exam_date, session) -> rows
+        self._issues = {name: {'count': 0, 'samples': []} for name in ISSUE_MESSAGES}
+
+    def _flag(self, issue, sample):
+        entry = self._issues[issue]
+        entry['count'] += 1
+        if len(entry['samples']) < SAMPLE_LIMIT:
+            entry['samples'].append(sample)
+
+    def add(self, row):
+        """Check one (register_number, subject_code, department, exam_date, session) row"""
+        reg_no, subject_code, _, exam_date, session = row
+        self.rows += 1
+
+        seat = (reg_no, exam_date, session)
+        if seat in self._seats:
+            self._flag('duplicate', {'registerNumber': reg_no, 'examDate': exam_date,
+                                     'session': session, 'subjectCode': subject_code})
+        else:
+            self._seats.add(seat)
+
+        key = (exam_date, session)
+        self._session_sizes[key] = self._session_sizes.get(key, 0) + 1
+
+        if session not in VALID_SESSIONS:
+            self._flag('invalid_session', {'registerNumber': reg_no, 'session': session})
+
+        if len(reg_no) != REG_NO_DIGITS or not reg_no.isdigit():
+            self._flag('malformed_reg_no', {'registerNumber': reg_no})
+        elif self.department_codes is not None and reg_no[6:9] not in self.department_codes:
+            self._flag('unknown_department', {'registerNumber': reg_no, 'code': reg_no[6:9]})
+
+    def add_many(self, rows):
+        for row in rows:
+            self.add(row)
+        return self
+
+    def _session_outliers(self):
+        sizes = self._session_sizes
+        if len(sizes) < MIN_SESSIONS_FOR_OUTLIERS:
+            return []
+        typical = median(sizes.values())
+        return [
+            {'session': f'{exam_date}_{session}', 'students': n, 'median': typical}
+            for (exam_date, session), n in sorted(sizes.items())
+            if n > typical * OUTLIER_FACTOR or n * OUTLIER_FACTOR < typical
+        ]
+
+    def report(self):
+        """Structured result: totals, per-issue counts and capped samples"""
+        issues = {name: {'count': entry['count'], 'samples': list(entry['samples'])}
+                  for name, entry in self._issues.items()}
+        outliers = self._session_outliers()
+        issues['session_outlier'] = {'count': len(outliers), 'samples': outliers[:SAMPLE_LIMIT]}
+        return {
+            'rows': self.rows,
+            'sessions': len(self._session_sizes),
+            'issueCount': sum(entry['count'] for entry in issues.values()),
+            'issues': issues
+        }
+
+    def warnings(self, report=None):
+        """One message per issue found, with a few examples"""
+        report = report or self.report()
+        warnings = []
+        for name, entry in report['issues'].items():
+            if not entry['count']:
+                continue
+            examples = ', '.join(_describe(name, s) for s in entry['samples'][:5])
+            more = '' if entry['count'] <= 5 else f' and {entry["count"] - 5} more'
+            warnings.append(f'{ISSUE_MESSAGES[name]}: {examples}{more}')
+        return warnings
+
+
+def _describe(issue, sample):
+    if issue == 'duplicate':
+        return f'{sample["registerNumber"]} ({sample["examDate"]} {sample["session"]})'
+    if issue == 'invalid_session':
+        return f'{sample["registerNumber"]} ({sample["session"]})'
+    if issue == 'unknown_department':
+        return f'{sample["registerNumber"]} ({sample["code"]})'
+    if issue == 'session_outlier':
+        return f'{sample["session"]} ({sample["students"]} vs median {sample["median"]:g})'
+    return str(sample['registerNumber'])
@@ -0,0 +1,31 @@
+"""Add hall_sketch table
+
+Revision ID: 3f9a1c2d7e41
+Revises: b024c68c8828
+Create Date: 2026-10-19 10:12:40.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2d7e41'
+down_revision = 'b024c68c8828'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('hall_sketch',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_key', sa.String(length=50), nullable=False),
+        sa.Column('hall_name', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_key', 'hall_name', name='uq_hall_sketch_session_hall')
+    )
+
+
+def downgrade():
+    op.drop_table('hall_sketch')
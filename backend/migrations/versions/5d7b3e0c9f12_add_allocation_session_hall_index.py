@@ -0,0 +1,26 @@
+"""Add (session_key, hall_name) index on allocation
+
+Revision ID: 5d7b3e0c9f12
+Revises: 8c4e2b9f1a07
+Create Date: 2026-10-19 13:41:05.207731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7b3e0c9f12'
+down_revision = '8c4e2b9f1a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('allocation', schema=None) as batch_op:
+        batch_op.create_index('ix_allocation_session_hall', ['session_key', 'hall_name'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('allocation', schema=None) as batch_op:
+        batch_op.drop_index('ix_allocation_session_hall')
@@ -0,0 +1,30 @@
+"""Add data_generation counter
+
+Revision ID: 8c4e2b9f1a07
+Revises: 3f9a1c2d7e41
+Create Date: 2026-10-19 11:03:12.554920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2b9f1a07'
+down_revision = '3f9a1c2d7e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_generation = op.create_table('data_generation',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Seed the single counter row so concurrently booting workers only UPDATE it
+    op.bulk_insert(data_generation, [{'id': 1, 'value': 0}])
+
+
+def downgrade():
+    op.drop_table('data_generation')
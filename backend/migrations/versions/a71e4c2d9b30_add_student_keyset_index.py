@@ -0,0 +1,26 @@
+"""Add (exam_date, session, register_number) index on student
+
+Revision ID: a71e4c2d9b30
+Revises: 5d7b3e0c9f12
+Create Date: 2026-10-19 14:02:17.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a71e4c2d9b30'
+down_revision = '5d7b3e0c9f12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('student', schema=None) as batch_op:
+        batch_op.create_index('ix_student_date_session_reg', ['exam_date', 'session', 'register_number'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('student', schema=None) as batch_op:
+        batch_op.drop_index('ix_student_date_session_reg')
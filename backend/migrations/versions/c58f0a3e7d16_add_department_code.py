@@ -0,0 +1,32 @@
+"""Add department_code overrides
+
+Revision ID: c58f0a3e7d16
+Revises: e3b8d51f6a24
+Create Date: 2026-10-19 16:12:40.318227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58f0a3e7d16'
+down_revision = 'e3b8d51f6a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('department_code',
+        sa.Column('code', sa.String(length=3), nullable=False),
+        sa.Column('department', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('code')
+    )
+    # Seed the table's version counter next to the data generation row
+    data_generation = sa.table('data_generation', sa.column('id', sa.Integer), sa.column('value', sa.Integer))
+    op.bulk_insert(data_generation, [{'id': 2, 'value': 0}])
+
+
+def downgrade():
+    op.execute('DELETE FROM data_generation WHERE id = 2')
+    op.drop_table('department_code')
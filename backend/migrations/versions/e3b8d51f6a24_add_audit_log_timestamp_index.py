@@ -0,0 +1,26 @@
+"""Add (timestamp, id) index on audit_log
+
+Revision ID: e3b8d51f6a24
+Revises: a71e4c2d9b30
+Create Date: 2026-10-19 14:37:52.106384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b8d51f6a24'
+down_revision = 'a71e4c2d9b30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('audit_log', schema=None) as batch_op:
+        batch_op.create_index('ix_audit_log_timestamp_id', ['timestamp', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('audit_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_audit_log_timestamp_id')
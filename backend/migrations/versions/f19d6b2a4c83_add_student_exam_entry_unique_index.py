@@ -0,0 +1,32 @@
+"""Add unique (register_number, subject_code, exam_date, session) index on student
+
+Revision ID: f19d6b2a4c83
+Revises: c58f0a3e7d16
+Create Date: 2026-10-19 17:25:09.640152
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f19d6b2a4c83'
+down_revision = 'c58f0a3e7d16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rosters may hold exact repeats; keep the first of each
+    op.execute(
+        'DELETE FROM student WHERE id NOT IN ('
+        'SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM student '
+        'GROUP BY register_number, subject_code, exam_date, session) AS firsts)'
+    )
+    with op.batch_alter_table('student', schema=None) as batch_op:
+        batch_op.create_index('uq_student_exam_entry', ['register_number', 'subject_code', 'exam_date', 'session'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('student', schema=None) as batch_op:
+        batch_op.drop_index('uq_student_exam_entry')
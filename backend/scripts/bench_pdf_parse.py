@@ -0,0 +1,236 @@
+"""
+PDF Parse Benchmark
+
+Writes a synthetic nominal-roll PDF (stdlib only, no PDF library needed)
+in the university layout parse_pdf expects, then times parse_pdf with each
+text extraction backend and checks they produce identical students.
+
+Layout of every page:
+- "Institution: ..." banner
+- "Exam Date: DD-Mon-YYYY / FN|AN" and "Subject: CODE:Name Question Paper Code : N"
+  headers, emitted only when the exam/subject changes (so context carries
+  across page breaks like the real rolls)
+- rows of 12-digit register numbers
+
+With --workers, the page-parallel parser is also timed at each process
+count (e.g. --workers 1 2 4 8) on the default backend.
+
+With --micro, no PDF is written: the line classifier + stitch pass run on
+the synthetic roll text directly and are compared with the original
+per-line loop (uncompiled regexes, department dict rebuilt per student).
+
+Usage (from backend/):
+    python scripts/bench_pdf_parse.py --pages 300
+    python scripts/bench_pdf_parse.py --pages 500 --workers 1 2 4 --keep roll.pdf
+    python scripts/bench_pdf_parse.py --pages 2000 --micro
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DEGREE_CODES = ['102', '103', '104', '105', '106', '114', '159', '205']
+LINES_PER_PAGE = 48
+REG_NOS_PER_LINE = 6
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+
+
+def roll_lines(pages, seed=7, students_per_subject=90):
+    """Return a list of pages, each a list of text lines"""
+    rng = random.Random(seed)
+    dates = [f'{day:02d}-Jan-2026' for day in range(5, 31)]
+    result, page = [], []
+    exam_index, serial = 0, 0
+    remaining = 0
+
+    def emit(line):
+        nonlocal page
+        if len(page) == LINES_PER_PAGE:
+            result.append(page)
+            page = []
+        if not page:
+            page.append('Institution: 7311 - Synthetic College of Engineering')
+        page.append(line)
+
+    while len(result) < pages:
+        if remaining <= 0:
+            if exam_index % 3 == 0:
+                emit(f'Exam Date: {dates[(exam_index // 3) % len(dates)]} / {"FN" if exam_index % 2 == 0 else "AN"}')
+            code = f'{rng.choice(["CS", "EE", "EC", "ME", "CE"])}{3000 + exam_index:04d}'
+            emit(f'Subject: {code}:Synthetic Paper {exam_index} Question Paper Code : {40000 + exam_index}')
+            exam_index += 1
+            remaining = students_per_subject
+        row = []
+        for _ in range(min(REG_NOS_PER_LINE, remaining)):
+            degree = DEGREE_CODES[serial % len(DEGREE_CODES)]
+            row.append(f'731122{degree}{serial % 1000:03d}')
+            serial += 1
+        remaining -= len(row)
+        emit(' '.join(row))
+    return result[:pages]
+
+
+def write_roll_pdf(path, pages_of_lines):
+    """
+    Write pages of text lines as a minimal PDF (Helvetica 10pt, 14pt leading).
+    A line is a str (drawn at the left margin) or a list of (x, dy, text)
+    cells drawn at x points from the page edge, dy points below the line's
+    baseline, like the columns of a real roll.
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+    pages_id = add(None)  # filled in once the kids are known
+    kids = []
+    for lines in pages_of_lines:
+        ops = ['BT', '/F1 10 Tf']
+        for n, line in enumerate(lines):
+            cells = [(40, 0, line)] if isinstance(line, str) else line
+            for x, dy, text in cells:
+                escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+                ops.append(f'1 0 0 1 {x} {PAGE_HEIGHT - 50 - 14 * n - dy} Tm ({escaped}) Tj')
+        ops.append('ET')
+        stream = '\n'.join(ops).encode('latin-1')
+        content_id = add(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        kids.append(add((
+            f'<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+            f'/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>'
+        ).encode()))
+    objects[pages_id - 1] = (
+        f'<< /Type /Pages /Kids [{" ".join(f"{k} 0 R" for k in kids)}] /Count {len(kids)} >>'
+    ).encode()
+    catalog_id = add(f'<< /Type /Catalog /Pages {pages_id} 0 R >>'.encode())
+
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+        xref = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b'%010d 00000 n \n' % offset)
+        f.write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                % (len(objects) + 1, catalog_id, xref))
+
+
+def legacy_parse_text(page_texts):
+    """The per-line loop parse_pdf used before the compiled classifier (for --micro)"""
+    import re
+
+    def dept(code):
+        mapping = {'102': 'AUTO', '103': 'CIVIL', '104': 'CSE', '105': 'EEE',
+                   '106': 'ECE', '114': 'MECH', '159': 'CSE(DS)', '205': 'IT'}
+        return mapping.get(code, str(code))
+
+    rows = []
+    exam_date = sess = subject = None
+    for text in page_texts:
+        for line in text.split('\n'):
+            m = re.search(r"Exam Date:\s*(\d{2}-[A-Za-z]{3}-\d{4})\s*/\s*(FN|AN)", line)
+            if m:
+                exam_date, sess = m.group(1), m.group(2)
+                continue
+            m = re.search(r"Subject:\s*([A-Z0-9]+):(.+?)(?:\s+Question Paper Code|$)", line)
+            if m:
+                subject = m.group(1).strip()
+                continue
+            if exam_date and sess and subject:
+                for reg_no in re.findall(r"\b\d{12}\b", line):
+                    rows.append((reg_no, subject, dept(reg_no[6:9]), exam_date, sess))
+    return rows
+
+
+def micro_benchmark(pages, repeat):
+    """Lines/s of the text -> student tuples stage alone"""
+    from app.services.pdf_parser import tokenise_page, iter_stitched, ParseStats
+
+    page_texts = ['\n'.join(lines) for lines in roll_lines(pages)]
+    line_count = sum(text.count('\n') + 1 for text in page_texts)
+    print(f'{pages} pages of roll text, {line_count} lines')
+
+    timings = {}
+    for label, run in (
+        ('original', lambda: legacy_parse_text(page_texts)),
+        ('classifier', lambda: list(iter_stitched((tokenise_page(t) for t in page_texts), ParseStats()))),
+    ):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        timings[label] = (best, rows)
+        print(f'{label:>12}: {best * 1000:8.1f}ms  {line_count / best:12,.0f} lines/s  {len(rows)} students')
+
+    identical = timings['original'][1] == timings['classifier'][1]
+    print('outputs identical' if identical else 'OUTPUTS DIFFER')
+    print(f'speedup: {timings["original"][0] / timings["classifier"][0]:.1f}x')
+    return 0 if identical else 1
+
+
+def student_tuples(students):
+    return [(s.register_number, s.subject_code, s.department, s.exam_date, s.session) for s in students]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parse_pdf text extraction backends')
+    parser.add_argument('--pages', type=int, default=200, help='Pages in the synthetic roll')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per backend (best is reported)')
+    parser.add_argument('--workers', type=int, nargs='*', default=[], help='Process counts for the parallel parser')
+    parser.add_argument('--micro', action='store_true', help='Benchmark only the line classifier on roll text')
+    parser.add_argument('--keep', help='Also save the synthetic PDF to this path')
+    args = parser.parse_args()
+
+    if args.micro:
+        return micro_benchmark(args.pages, max(args.repeat, 3))
+
+    from app import create_app
+    from app.services.pdf_parser import parse_pdf
+    from app.services.pdf_text import TEXT_BACKENDS
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(prefix='bench_pdf_'), 'roll.pdf')
+    write_roll_pdf(path, roll_lines(args.pages))
+    print(f'{args.pages} pages, {os.path.getsize(path) / 1024:.0f} KiB -> {path}')
+
+    app = create_app()
+    results = {}
+
+    def run(label, **kwargs):
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            students = parse_pdf(path, **kwargs)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results[label] = (best, student_tuples(students))
+        print(f'{label:>12}: {best:7.2f}s  {len(students)} students  {args.pages / best:7.1f} pages/s')
+
+    with app.app_context():
+        for backend in TEXT_BACKENDS:
+            run(backend, backend=backend, workers=1)
+        for workers in args.workers:
+            run(f'{workers} workers', workers=workers)
+
+    outputs = [tuples for _, tuples in results.values()]
+    identical = all(o == outputs[0] for o in outputs)
+    print('outputs identical' if identical else 'OUTPUTS DIFFER')
+    if 'pdfplumber' in results and 'pdfminer' in results:
+        print(f'speedup: {results["pdfplumber"][0] / results["pdfminer"][0]:.1f}x')
+    if not args.keep:
+        os.remove(path)
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+Exam-Morning Load Test for the Student Search Path
+
+Self-contained and offline:
+1. Seeds a synthetic generation (students -> /api/generate) into a SQLite
+   file (default) or the database given by --database-url.
+2. Boots the app locally under gunicorn, waitress or the Werkzeug dev
+   server (--server auto picks the first one installed).
+3. Replays a Zipf-skewed register-number distribution (hot students refresh
+   repeatedly) plus a share of unknown numbers at a fixed concurrency.
+4. Reports throughput, p50/p95/p99 latency, status/error counts and SQL
+   statements per request (from the X-DB-Queries header).
+
+Usage (from backend/):
+    python scripts/load_test_search.py --students 3000 --concurrency 32 --requests 20000
+    python scripts/load_test_search.py --database-url postgresql://localhost/hall_load --json result.json
+
+The same --seed gives the same data and request sequence, so runs on
+different commits can be compared.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+ADMIN_USERNAME = 'LoadTestAdmin'
+ADMIN_PASSWORD = 'load-test-password'
+
+# Degree codes understood by pdf_parser.get_dept_from_code
+DEGREE_CODES = ['102', '103', '104', '105', '106', '114', '159', '205']
+SUBJECTS_PER_DEGREE = 6
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load test POST /api/search')
+    parser.add_argument('--students', type=int, default=3000, help='Synthetic students to seed')
+    parser.add_argument('--exams', type=int, default=4, help='Exams (sessions) per student')
+    parser.add_argument('--sessions', type=int, default=8, help='Distinct exam sessions')
+    parser.add_argument('--requests', type=int, default=10000, help='Total search requests')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client threads')
+    parser.add_argument('--miss-ratio', type=float, default=0.05, help='Share of unknown register numbers')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Popularity skew (0 = uniform)')
+    parser.add_argument('--include-grid', action='store_true', help='Request ?include=grid')
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'waitress', 'werkzeug'], default='auto')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per worker')
+    parser.add_argument('--port', type=int, default=0, help='Port (0 = pick a free one)')
+    parser.add_argument('--database-url', default=None, help='Defaults to a temporary SQLite file')
+    parser.add_argument('--seed', type=int, default=1234, help='Random seed for data and requests')
+    parser.add_argument('--skip-seed', action='store_true', help='Reuse data already in --database-url')
+    parser.add_argument('--json', dest='json_path', default=None, help='Also write the report as JSON')
+    return parser.parse_args()
+
+
+# --- 1. Seed ---
+
+def seed_generation(args, env):
+    """Insert synthetic students and run /api/generate in-process"""
+    os.environ.update(env)
+    from app import create_app
+    from app.extensions import db
+    from app.models.sql import Student, Allocation, Hall, HallSketch
+    from app.services.generation import bump_generation
+    from app.services.pdf_parser import get_dept_from_code
+
+    app = create_app()
+    app.config.update({'TESTING': True, 'WTF_CSRF_ENABLED': False})
+    rng = random.Random(args.seed)
+
+    sessions = [f'{day + 1:02d}-Jan-2026_{"FN" if i % 2 == 0 else "AN"}'
+                for i, day in enumerate(range(args.sessions))]
+
+    register_numbers = []
+    with app.app_context():
+        db.create_all()
+        Allocation.query.delete()
+        HallSketch.query.delete()
+        Student.query.delete()
+
+        rows = []
+        per_degree = max(1, args.students // len(DEGREE_CODES))
+        for degree in DEGREE_CODES:
+            for serial in range(per_degree):
+                reg_no = f'731123{degree}{serial:03d}'
+                register_numbers.append(reg_no)
+                for session_key in rng.sample(sessions, min(args.exams, len(sessions))):
+                    exam_date, session_name = session_key.rsplit('_', 1)
+                    rows.append({
+                        'register_number': reg_no,
+                        'subject_code': f'S{degree}{rng.randrange(SUBJECTS_PER_DEGREE)}',
+                        'department': get_dept_from_code(degree),
+                        'exam_date': exam_date,
+                        'session': session_name
+                    })
+        db.session.bulk_insert_mappings(Student, rows)
+
+        # Make sure every session fits: add plain 6x10 halls as needed
+        per_session = Counter(f"{r['exam_date']}_{r['session']}" for r in rows)
+        capacity = sum(h.capacity for h in Hall.query.all())
+        extra = 0
+        while capacity < max(per_session.values()) * 2:
+            extra += 1
+            db.session.add(Hall(id=f'load-{extra}', name=f'LT{extra}', block='Load Test Block',
+                                rows=6, columns=10, capacity=60, priority=9000 + extra))
+            capacity += 60
+        bump_generation()
+        db.session.commit()
+
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD})
+    if response.status_code != 200:
+        raise SystemExit(f'Seed login failed: {response.status_code} {response.get_data(as_text=True)}')
+    started = time.perf_counter()
+    response = client.post('/api/generate')
+    if response.status_code != 200:
+        raise SystemExit(f'Seed generation failed: {response.get_data(as_text=True)}')
+    print(f'Seeded {len(register_numbers)} students / {len(rows)} exam rows '
+          f'in {len(sessions)} sessions (+{extra} halls), generate took {time.perf_counter() - started:.1f}s')
+    return register_numbers
+
+
+def load_register_numbers(env):
+    os.environ.update(env)
+    from app import create_app
+    from app.extensions import db
+    from app.models.sql import Allocation
+
+    app = create_app()
+    with app.app_context():
+        return [r for (r,) in db.session.query(Allocation.register_number).distinct()]
+
+
+# --- 2. Boot ---
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_command(args, port):
+    choice = args.server
+    if choice == 'auto':
+        if shutil.which('gunicorn') and sys.platform != 'win32':
+            choice = 'gunicorn'
+        elif shutil.which('waitress-serve'):
+            choice = 'waitress'
+        else:
+            choice = 'werkzeug'
+
+    if choice == 'gunicorn':
+        return choice, ['gunicorn', '-w', str(args.workers), '--threads', str(args.threads),
+                        '-b', f'127.0.0.1:{port}', '--log-level', 'warning', 'run:app']
+    if choice == 'waitress':
+        return choice, ['waitress-serve', f'--threads={args.threads}', '--host=127.0.0.1',
+                        f'--port={port}', 'run:app']
+    return choice, [sys.executable, '-c',
+                    f'from run import app; app.run(host="127.0.0.1", port={port}, threaded=True)']
+
+
+def wait_until_up(base_url, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit('Server exited during startup')
+        try:
+            urllib.request.urlopen(f'{base_url}/api/csrf-token', timeout=2).read()
+            return
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.3)
+    raise SystemExit('Server did not come up in time')
+
+
+# --- 3. Replay ---
+
+def build_workload(args, register_numbers):
+    rng = random.Random(args.seed + 1)
+    ranked = list(register_numbers)
+    rng.shuffle(ranked)
+    weights = [1.0 / ((rank + 1) ** args.zipf) for rank in range(len(ranked))]
+    hits = rng.choices(ranked, weights=weights, k=args.requests)
+    workload = []
+    for reg_no in hits:
+        if rng.random() < args.miss_ratio:
+            reg_no = f'9999{rng.randrange(10 ** 8):08d}'
+        workload.append(reg_no)
+    return workload
+
+
+class Client:
+    """One simulated browser: own cookie jar and CSRF token"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+        with self.opener.open(f'{base_url}/api/csrf-token', timeout=10) as response:
+            self.csrf_token = json.loads(response.read())['csrf_token']
+
+    def search(self, reg_no, path):
+        request = urllib.request.Request(
+            f'{self.base_url}{path}',
+            data=json.dumps({'registerNumber': reg_no}).encode(),
+            headers={'Content-Type': 'application/json', 'X-CSRFToken': self.csrf_token,
+                     'Accept-Encoding': 'gzip'},
+            method='POST'
+        )
+        started = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                response.read()
+                status, queries = response.status, response.headers.get('X-DB-Queries')
+        except urllib.error.HTTPError as e:
+            e.read()
+            status, queries = e.code, e.headers.get('X-DB-Queries')
+        except Exception:
+            status, queries = 'error', None
+        return time.perf_counter() - started, status, queries
+
+
+def replay(args, base_url, workload):
+    path = '/api/search?include=grid' if args.include_grid else '/api/search'
+    local = threading.local()
+    results = []
+    lock = threading.Lock()
+
+    def run(reg_no):
+        if not hasattr(local, 'client'):
+            local.client = Client(base_url)
+        outcome = local.client.search(reg_no, path)
+        with lock:
+            results.append(outcome)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(run, workload))
+    return results, time.perf_counter() - started
+
+
+# --- 4. Report ---
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_report(args, server, results, elapsed):
+    latencies = sorted(r[0] * 1000 for r in results)
+    statuses = Counter(str(r[1]) for r in results)
+    queries = sorted(int(r[2]) for r in results if r[2] is not None)
+    errors = sum(n for status, n in statuses.items() if status not in ('200', '404'))
+    return {
+        'server': server,
+        'requests': len(results),
+        'concurrency': args.concurrency,
+        'elapsedSeconds': round(elapsed, 3),
+        'throughputRps': round(len(results) / elapsed, 1) if elapsed else 0.0,
+        'latencyMs': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        },
+        'statuses': dict(statuses),
+        'errorRate': round(errors / len(results), 4) if results else 0.0,
+        'dbQueriesPerRequest': {
+            'mean': round(sum(queries) / len(queries), 3) if queries else None,
+            'p95': percentile(queries, 95) if queries else None,
+            'max': queries[-1] if queries else None
+        }
+    }
+
+
+def print_report(report):
+    print(f"\nServer: {report['server']}  requests: {report['requests']}  concurrency: {report['concurrency']}")
+    print(f"Throughput: {report['throughputRps']} req/s over {report['elapsedSeconds']}s")
+    lat = report['latencyMs']
+    print(f"Latency ms: p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}")
+    print(f"Statuses: {report['statuses']}  error rate: {report['errorRate']:.2%}")
+    q = report['dbQueriesPerRequest']
+    print(f"DB queries/request: mean {q['mean']}  p95 {q['p95']}  max {q['max']}")
+
+
+def main():
+    args = parse_args()
+    tmp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        tmp_dir = tempfile.mkdtemp(prefix='hall_load_')
+        database_url = 'sqlite:///' + os.path.join(tmp_dir, 'load.db')
+
+    env = {
+        'DATABASE_URL': database_url,
+        'SECRET_KEY': 'load-test-secret',
+        'SUPER_ADMIN_USERNAME': ADMIN_USERNAME,
+        'SUPER_ADMIN_PASSWORD': ADMIN_PASSWORD,
+        'RATELIMIT_ENABLED': 'false',
+        'DB_QUERY_COUNT_HEADER': '1',
+    }
+    os.chdir(BACKEND_DIR)
+
+    register_numbers = load_register_numbers(env) if args.skip_seed else seed_generation(args, env)
+    if not register_numbers:
+        raise SystemExit('No allocations to search for')
+
+    port = args.port or free_port()
+    server, command = server_command(args, port)
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, **env},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_up(base_url, process)
+        workload = build_workload(args, register_numbers)
+        print(f'Replaying {len(workload)} searches against {server} at concurrency {args.concurrency}...')
+        results, elapsed = replay(args, base_url, workload)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    report = build_report(args, server, results, elapsed)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,17 +13,21 @@ from app.extensions import db
 
 
 @pytest.fixture(scope='session')
-def app():
+def app(tmp_path_factory):
     """Create application for testing."""
     # Set test environment
     os.environ['FLASK_ENV'] = 'testing'
     os.environ['SECRET_KEY'] = 'test-secret-key'
+    # The default 50/hour per-endpoint limit would lock the suite out of /api/auth/login
+    os.environ['RATELIMIT_ENABLED'] = 'false'
     
     app = create_app()
     app.config.update({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
         'WTF_CSRF_ENABLED': False,
+        # Keep parsed rolls out of the source tree's instance/ folder
+        'PARSE_CACHE_DIR': str(tmp_path_factory.mktemp('parse_cache')),
     })
     
     with app.app_context():
@@ -72,3 +76,13 @@ def authenticated_client(client, app):
         })
         
         return client
+
+
+@pytest.fixture(scope='session')
+def roll_pdf(tmp_path_factory):
+    """Small synthetic nominal roll (headers carried across page breaks)"""
+    from scripts.bench_pdf_parse import write_roll_pdf, roll_lines
+
+    path = tmp_path_factory.mktemp('pdf') / 'roll.pdf'
+    write_roll_pdf(str(path), roll_lines(4))
+    return str(path)
@@ -166,3 +166,56 @@ class TestAuthRoutes:
         """Test /me endpoint when not authenticated."""
         response = client.get('/api/auth/me')
         assert response.status_code == 401
+
+
+class TestAuditLogs:
+    """Tests for the paginated, filterable audit log."""
+
+    @pytest.fixture
+    def logs(self, app, authenticated_client):
+        from datetime import datetime, timedelta
+        from app.extensions import db
+        from app.models.sql import Admin, AuditLog
+
+        with app.app_context():
+            AuditLog.query.delete()
+            admin_id = Admin.query.filter_by(username='TestSuperAdmin').first().id
+            base = datetime(2026, 1, 1, 9, 0, 0)
+            for i in range(25):
+                db.session.add(AuditLog(admin_id=admin_id if i % 2 == 0 else None,
+                                        action='UPLOAD' if i % 5 == 0 else 'GENERATE',
+                                        details=f'entry {i}', timestamp=base + timedelta(days=i)))
+            db.session.commit()
+        yield authenticated_client
+
+        with app.app_context():
+            AuditLog.query.delete()
+            db.session.commit()
+
+    def test_pages_are_newest_first_and_complete(self, logs):
+        ids, cursor = [], None
+        while True:
+            url = '/api/admin/logs?limit=10' + (f'&cursor={cursor}' if cursor else '')
+            data = logs.get(url).get_json()
+            assert len(data['logs']) <= 10
+            ids.extend(log['id'] for log in data['logs'])
+            cursor = data['nextCursor']
+            if not cursor:
+                break
+        assert len(ids) == len(set(ids)) == 25
+        first = logs.get('/api/admin/logs?limit=1').get_json()['logs'][0]
+        assert first['details'] == 'entry 24'
+
+    def test_filters(self, logs):
+        uploads = logs.get('/api/admin/logs?action=UPLOAD').get_json()['logs']
+        assert len(uploads) == 5
+
+        mine = logs.get('/api/admin/logs?admin=TestSuperAdmin').get_json()['logs']
+        assert len(mine) == 13
+        assert {log['admin_username'] for log in mine} == {'TestSuperAdmin'}
+
+        january = logs.get('/api/admin/logs?from=2026-01-10&to=2026-01-12').get_json()['logs']
+        assert [log['details'] for log in january] == ['entry 11', 'entry 10', 'entry 9']
+
+        assert logs.get('/api/admin/logs?from=yesterday').status_code == 400
+        assert logs.get('/api/admin/logs?cursor=bogus').status_code == 400
@@ -0,0 +1,105 @@
+"""
+Tests for Multi-File Batch Uploads
+"""
+import pytest
+
+
+def _tuples(students):
+    return [(s.register_number, s.subject_code, s.department, s.exam_date, s.session) for s in students]
+
+
+class TestBatchUpload:
+    """Tests for POST /api/upload/batch."""
+
+    @pytest.fixture
+    def batch_client(self, app, authenticated_client, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+        monkeypatch.setitem(app.config, 'PARSE_CACHE_MAX_BYTES', 0)
+        yield authenticated_client
+
+        from app.extensions import db
+        from app.models.sql import Student
+        with app.app_context():
+            Student.query.delete()
+            db.session.commit()
+
+    def test_merges_and_deduplicates_files(self, app, batch_client, roll_pdf):
+        import io
+        from app.models.sql import Student
+        from app.services.pdf_parser import parse_pdf
+
+        with app.app_context():
+            pdf_rows = _tuples(parse_pdf(roll_pdf))
+        reg_no, subject, dept, date, sess = pdf_rows[0]
+        csv_text = ('Register Number,Subject Code,Department,Exam Date,Session\n'
+                    f'{reg_no},{subject},{dept},{date},{sess}\n'
+                    '731120199001,XX9999,OTHER,30-Jan-2026,AN\n')
+
+        with open(roll_pdf, 'rb') as f:
+            response = batch_client.post('/api/upload/batch', data={'files': [
+                (f, 'roll.pdf'), (io.BytesIO(csv_text.encode()), 'late.csv')
+            ]}, content_type='multipart/form-data')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [r['filename'] for r in data['files']] == ['roll.pdf', 'late.csv']
+        assert data['files'][1]['duplicates'] == 1
+        assert data['files'][1]['students'] == 1
+        assert data['studentsCount'] == len(pdf_rows) + 1
+
+        with app.app_context():
+            assert Student.query.count() == len(pdf_rows) + 1
+
+    def test_pdf_falls_back_to_pdfplumber(self, app, batch_client, roll_pdf, monkeypatch):
+        from app.services import pdf_text
+        from app.services.pdf_parser import parse_pdf
+
+        with app.app_context():
+            expected = len(parse_pdf(roll_pdf))
+
+        def unreadable(file_path, pages=None):
+            raise RuntimeError('pdfminer cannot read this file')
+            yield
+
+        monkeypatch.setitem(pdf_text.TEXT_BACKENDS, 'pdfminer', unreadable)
+        with open(roll_pdf, 'rb') as f:
+            response = batch_client.post('/api/upload/batch', data={'files': [(f, 'roll.pdf')]},
+                                         content_type='multipart/form-data')
+        assert response.status_code == 200
+        assert response.get_json()['studentsCount'] == expected
+
+    def test_files_are_parsed_concurrently(self, app, batch_client, monkeypatch):
+        import io
+        from concurrent.futures import ThreadPoolExecutor
+        from app.services import batch_upload
+
+        pools = []
+
+        class RecordingPool(ThreadPoolExecutor):
+            def __init__(self, max_workers):
+                pools.append(max_workers)
+                super().__init__(max_workers=max_workers)
+
+        monkeypatch.setattr(batch_upload, 'ProcessPoolExecutor', RecordingPool)
+        monkeypatch.setitem(app.config, 'PDF_PARSE_WORKERS', 1)
+        monkeypatch.setitem(app.config, 'BATCH_PARSE_WORKERS', 8)
+        files = [(io.BytesIO(f'Register Number,Subject Code,Exam Date,Session\n73112010400{i},CS3401,05-Jan-2026,FN\n'
+                             .encode()), f'roll{i}.csv') for i in range(3)]
+        response = batch_client.post('/api/upload/batch', data={'files': files}, content_type='multipart/form-data')
+        assert response.status_code == 200
+        assert response.get_json()['studentsCount'] == 3
+        assert pools == [3]  # One worker per file, whatever PDF_PARSE_WORKERS says
+
+    def test_failed_file_writes_nothing(self, app, batch_client):
+        import io
+        from app.models.sql import Student
+
+        response = batch_client.post('/api/upload/batch', data={'files': [
+            (io.BytesIO(b'Register Number,Session\n731120104001,FN\n'), 'bad.csv')
+        ]}, content_type='multipart/form-data')
+        assert response.status_code == 422
+        assert 'Missing required columns' in response.get_json()['files'][0]['error']
+        with app.app_context():
+            assert Student.query.count() == 0
+
+        assert batch_client.post('/api/upload/batch', data={'files': [(io.BytesIO(b'x'), 'notes.txt')]},
+                                 content_type='multipart/form-data').status_code == 400
@@ -0,0 +1,123 @@
+"""
+Tests for Chunked, Resumable Roster Uploads
+"""
+import pytest
+
+
+def _tuples(students):
+    return [(s.register_number, s.subject_code, s.department, s.exam_date, s.session) for s in students]
+
+
+class TestChunkedUpload:
+    """Tests for the resumable /api/upload/chunked protocol."""
+
+    @pytest.fixture
+    def chunked_client(self, app, authenticated_client, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+        monkeypatch.setitem(app.config, 'PARSE_CACHE_MAX_BYTES', 0)
+        yield authenticated_client
+
+        from app.extensions import db
+        from app.models.sql import Student
+        with app.app_context():
+            Student.query.delete()
+            db.session.commit()
+
+    def test_resumed_upload_matches_direct_parse(self, app, chunked_client, roll_pdf):
+        import hashlib
+        from app.models.sql import Student
+        from app.services.pdf_parser import parse_pdf
+
+        with open(roll_pdf, 'rb') as f:
+            data = f.read()
+        started = chunked_client.post('/api/upload/chunked', json={'filename': 'roll.pdf', 'size': len(data)})
+        assert started.status_code == 201
+        upload_id = started.get_json()['uploadId']
+        url = f'/api/upload/chunked/{upload_id}'
+
+        chunk = len(data) // 3 + 1
+        assert chunked_client.put(f'{url}?offset=0', data=data[:chunk]).get_json()['offset'] == chunk
+        # A retried chunk is refused with the offset to resume from
+        retry = chunked_client.put(f'{url}?offset=0', data=data[:chunk])
+        assert retry.status_code == 409
+        offset = chunked_client.get(url).get_json()['offset']
+        assert retry.get_json()['offset'] == offset == chunk
+
+        early = chunked_client.post(f'{url}/complete', json={'sha256': hashlib.sha256(data).hexdigest()})
+        assert early.status_code == 400
+        while offset < len(data):
+            offset = chunked_client.put(f'{url}?offset={offset}', data=data[offset:offset + chunk]).get_json()['offset']
+
+        response = chunked_client.post(f'{url}/complete', json={'sha256': hashlib.sha256(data).hexdigest()})
+        assert response.status_code == 200
+        with app.app_context():
+            expected = _tuples(parse_pdf(roll_pdf))
+            assert _tuples(Student.query.order_by(Student.id).all()) == expected
+        assert response.get_json()['studentsCount'] == len(expected)
+        assert chunked_client.get(url).status_code == 404
+
+    def test_rejects_bad_checksum_and_overrun(self, app, chunked_client):
+        import os
+
+        data = b'Register Number,Subject Code,Exam Date,Session\n731120104001,CS3401,05-Jan-2026,FN\n'
+        upload_id = chunked_client.post('/api/upload/chunked', json={
+            'filename': 'roll.csv', 'size': len(data)}).get_json()['uploadId']
+        url = f'/api/upload/chunked/{upload_id}'
+
+        assert chunked_client.put(f'{url}?offset=0', data=data + b'x').status_code == 400
+        assert chunked_client.get(url).get_json()['offset'] == 0
+        chunked_client.put(f'{url}?offset=0', data=data)
+        response = chunked_client.post(f'{url}/complete', json={'sha256': '0' * 64})
+        assert response.status_code == 400
+        assert 'Checksum mismatch' in response.get_json()['error']
+        assert chunked_client.get(url).status_code == 404
+
+        assert chunked_client.post('/api/upload/chunked', json={'filename': 'roll.txt', 'size': 10}).status_code == 400
+        too_big = app.config['CHUNKED_UPLOAD_MAX_BYTES'] + 1
+        assert chunked_client.post('/api/upload/chunked', json={'filename': 'roll.pdf', 'size': too_big}).status_code == 400
+        assert chunked_client.get('/api/upload/chunked/../../etc').status_code == 404
+        assert not os.listdir(os.path.join(app.config['UPLOAD_FOLDER'], 'chunked'))
+
+    def test_chunk_checksums_replace_whole_file_hash(self, app, chunked_client):
+        import hashlib
+        from app.models.sql import Student
+
+        data = b'Register Number,Subject Code,Exam Date,Session\n731120104001,CS3401,05-Jan-2026,FN\n'
+        upload_id = chunked_client.post('/api/upload/chunked', json={
+            'filename': 'roll.csv', 'size': len(data)}).get_json()['uploadId']
+        url = f'/api/upload/chunked/{upload_id}'
+
+        corrupted = chunked_client.put(f'{url}?offset=0', data=data,
+                                       headers={'X-Content-SHA256': hashlib.sha256(b'other').hexdigest()})
+        assert corrupted.status_code == 400
+        assert chunked_client.get(url).get_json()['offset'] == 0
+        response = chunked_client.put(f'{url}?offset=0', data=data,
+                                      headers={'X-Content-SHA256': hashlib.sha256(data).hexdigest()})
+        assert response.get_json()['offset'] == len(data)
+
+        # No whole-file sha256: the server hashes the assembled file itself
+        response = chunked_client.post(f'{url}/complete', json={})
+        assert response.status_code == 200
+        with app.app_context():
+            assert Student.query.count() == 1
+
+    def test_failed_ingest_removes_file(self, app, chunked_client, monkeypatch):
+        import hashlib
+        import os
+        from app.routes import upload
+
+        def broken_write(rows):
+            raise RuntimeError('database went away')
+
+        monkeypatch.setattr(upload, 'replace_students', broken_write)
+        data = b'Register Number,Subject Code,Exam Date,Session\n731120104001,CS3401,05-Jan-2026,FN\n'
+        upload_id = chunked_client.post('/api/upload/chunked', json={
+            'filename': 'roll.csv', 'size': len(data)}).get_json()['uploadId']
+        url = f'/api/upload/chunked/{upload_id}'
+        chunked_client.put(f'{url}?offset=0', data=data)
+
+        response = chunked_client.post(f'{url}/complete', json={'sha256': hashlib.sha256(data).hexdigest()})
+        assert response.status_code == 500
+        folder = app.config['UPLOAD_FOLDER']
+        assert [name for name in os.listdir(folder) if name != 'chunked'] == []
+        assert not os.listdir(os.path.join(folder, 'chunked'))
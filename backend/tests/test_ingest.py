@@ -0,0 +1,113 @@
+"""
+Tests for streamed roster ingestion (replace / append) and its schema guard
+"""
+import pytest
+
+
+@pytest.fixture
+def empty_roster(app):
+    yield
+    from app.extensions import db
+    from app.models.sql import Student
+    with app.app_context():
+        Student.query.delete()
+        db.session.commit()
+
+
+class TestExamEntryIndex:
+    """Tests for ensure_exam_entry_index on databases built by create_all before the index existed."""
+
+    def test_creates_missing_index_and_append_deduplicates(self, app, empty_roster):
+        from sqlalchemy import inspect, text
+        from app.extensions import db
+        from app.models.sql import Student
+        from app.services.ingest import ensure_exam_entry_index, append_students
+
+        row = ('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN')
+        with app.app_context():
+            db.session.execute(text('DROP INDEX uq_student_exam_entry'))
+            for _ in range(2):
+                db.session.add(Student(register_number=row[0], subject_code=row[1], department=row[2],
+                                       exam_date=row[3], session=row[4]))
+            db.session.commit()
+
+            assert ensure_exam_entry_index() is True
+            assert 'uq_student_exam_entry' in {i['name'] for i in inspect(db.engine).get_indexes('student')}
+            assert Student.query.count() == 1
+            assert ensure_exam_entry_index() is False
+
+            assert append_students([row])['count'] == 0
+            assert append_students([row])['count'] == 0
+            assert Student.query.count() == 1
+
+
+class TestAppendUpload:
+    """Tests for mode=append uploads and pending-only regeneration."""
+
+    @pytest.fixture
+    def append_client(self, app, authenticated_client, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+        yield authenticated_client
+
+        from app.extensions import db
+        from app.models.sql import Student, Allocation, HallSketch
+        with app.app_context():
+            Allocation.query.delete()
+            Student.query.delete()
+            HallSketch.query.delete()
+            db.session.commit()
+
+    @staticmethod
+    def _upload(client, rows, mode):
+        import io
+        text = 'Register Number,Subject Code,Department,Exam Date,Session\n' + ''.join(
+            ','.join(row) + '\n' for row in rows)
+        return client.post('/api/upload/batch', data={'mode': mode, 'files': [(io.BytesIO(text.encode()), 'roll.csv')]},
+                           content_type='multipart/form-data')
+
+    def test_append_inserts_only_new_entries(self, app, append_client):
+        from app.models.sql import Student, Allocation
+
+        first = [('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN'),
+                 ('731120104002', 'CS3401', 'CSE', '05-Jan-2026', 'FN')]
+        assert self._upload(append_client, first, 'replace').status_code == 200
+        assert append_client.post('/api/generate').status_code == 200
+        with app.app_context():
+            kept_ids = sorted(a.id for a in Allocation.query.all())
+
+        late = [first[0], ('731120104001', 'CS3402', 'CSE', '06-Jan-2026', 'AN')]
+        data = self._upload(append_client, late, 'append').get_json()
+        assert data['mode'] == 'append'
+        assert data['studentsCount'] == 1
+        assert data['skipped'] == 1
+        assert data['affectedSessions'] == ['06-Jan-2026_AN']
+
+        with app.app_context():
+            assert Student.query.count() == 3
+            assert sorted(a.id for a in Allocation.query.all()) == kept_ids
+
+        assert append_client.get('/api/sessions').get_json()['pending'] == ['06-Jan-2026_AN']
+        generated = append_client.post('/api/generate', json={'pendingOnly': True}).get_json()
+        assert generated['sessions'] == ['06-Jan-2026_AN']
+        with app.app_context():
+            assert sorted(a.id for a in Allocation.query.filter_by(session_key='05-Jan-2026_FN')) == kept_ids
+            assert Allocation.query.filter_by(session_key='06-Jan-2026_AN').count() == 1
+        assert append_client.get('/api/sessions').get_json()['pending'] == []
+
+    def test_generate_rejects_bad_session_lists(self, app, append_client):
+        row = ('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN')
+        assert self._upload(append_client, [row], 'replace').status_code == 200
+
+        for sessions in ('abc', [], [1], ['05-Jan-2026_FN', '09-Jan-2026_AN']):
+            response = append_client.post('/api/generate', json={'sessions': sessions})
+            assert response.status_code == 400
+        assert 'Unknown sessions: 09-Jan-2026_AN' in response.get_json()['error']
+
+        generated = append_client.post('/api/generate', json={'sessions': ['05-Jan-2026_FN']}).get_json()
+        assert generated['sessions'] == ['05-Jan-2026_FN']
+
+    def test_replace_stores_repeated_entries_once(self, app, append_client):
+        row = ('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN')
+        data = self._upload(append_client, [row, row], 'replace').get_json()
+        assert data['studentsCount'] == 1
+        assert self._upload(append_client, [row], 'merge').status_code == 400
@@ -0,0 +1,103 @@
+"""
+Tests for Parquet Export / Import
+"""
+import pytest
+
+
+class TestParquetTransfer:
+    """Tests for /api/export/<kind>.parquet and /api/import/<kind>.parquet."""
+
+    @pytest.fixture
+    def generated(self, app, authenticated_client):
+        pytest.importorskip('pyarrow')
+        from app.extensions import db
+        from app.models.sql import Student, Allocation, HallSketch
+
+        with app.app_context():
+            for i in range(6):
+                db.session.add(Student(register_number=f'73112010400{i}', subject_code='CS3401',
+                                       department='CSE', exam_date='05-Jan-2026', session='FN'))
+                db.session.add(Student(register_number=f'73112010500{i}', subject_code='EE3401',
+                                       department='EEE', exam_date='05-Jan-2026', session='FN'))
+            db.session.commit()
+        assert authenticated_client.post('/api/generate').status_code == 200
+        yield authenticated_client
+
+        with app.app_context():
+            Allocation.query.delete()
+            Student.query.delete()
+            HallSketch.query.delete()
+            db.session.commit()
+
+    @staticmethod
+    def _snapshot(app):
+        from app.models.sql import Student, Allocation
+        from app.services.parquet_io import ALLOCATION_COLUMNS
+        from app.services.ingest import STUDENT_COLUMNS
+
+        with app.app_context():
+            students = [tuple(getattr(s, c) for c in STUDENT_COLUMNS) for s in Student.query.order_by(Student.id)]
+            allocations = [tuple(getattr(a, c) for c in ALLOCATION_COLUMNS)
+                           for a in Allocation.query.order_by(Allocation.id)]
+        return students, allocations
+
+    def test_round_trip(self, app, generated):
+        import io
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        before = self._snapshot(app)
+        files = {}
+        for kind in ('students', 'allocations'):
+            response = generated.get(f'/api/export/{kind}.parquet')
+            assert response.status_code == 200
+            files[kind] = response.data
+        schema = pq.read_schema(io.BytesIO(files['students']))
+        assert pa.types.is_dictionary(schema.field('department').type)
+        assert pq.read_metadata(io.BytesIO(files['allocations'])).num_rows == len(before[1])
+
+        assert generated.delete('/api/clear').status_code == 200
+        for kind in ('students', 'allocations'):
+            response = generated.post(f'/api/import/{kind}.parquet',
+                                      data={'file': (io.BytesIO(files[kind]), f'{kind}.parquet')},
+                                      content_type='multipart/form-data')
+            assert response.status_code == 200
+        assert self._snapshot(app) == before
+        assert generated.get('/api/seating/05-Jan-2026_FN').status_code == 200
+
+    def test_rejects_bad_files(self, app, generated):
+        import io
+        from app.services.ingest import STUDENT_COLUMNS
+
+        before = self._snapshot(app)
+        assert generated.get('/api/export/halls.parquet').status_code == 404
+        response = generated.post('/api/import/students.parquet',
+                                  data={'file': (io.BytesIO(b'Register Number\n'), 'roll.csv')},
+                                  content_type='multipart/form-data')
+        assert response.status_code == 400
+        assert generated.post('/api/import/allocations.parquet', data={'mode': 'append'}).status_code == 400
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        buffer = io.BytesIO()
+        pq.write_table(pa.table({
+            'register_number': ['731120104001'], 'subject_code': [None], 'department': ['CSE'],
+            'exam_date': ['05-Jan-2026'], 'session': ['FN'],
+        }), buffer)
+        response = generated.post('/api/import/students.parquet',
+                                  data={'file': (io.BytesIO(buffer.getvalue()), 'students.parquet')},
+                                  content_type='multipart/form-data')
+        assert response.status_code == 400
+        assert 'subject_code' in response.get_json()['error']
+        assert self._snapshot(app) == before
+
+        # A file with the columns but no rows must not wipe the roster
+        buffer = io.BytesIO()
+        pq.write_table(pa.table({c: pa.array([], pa.string()) for c in STUDENT_COLUMNS}), buffer)
+        response = generated.post('/api/import/students.parquet',
+                                  data={'file': (io.BytesIO(buffer.getvalue()), 'students.parquet'),
+                                        'mode': 'replace'},
+                                  content_type='multipart/form-data')
+        assert response.status_code == 400
+        assert 'No valid student records' in response.get_json()['error']
+        assert self._snapshot(app) == before
@@ -0,0 +1,297 @@
+"""
+Unit Tests for the PDF Roll Parser
+"""
+import pytest
+
+
+def _tuples(students):
+    return [(s.register_number, s.subject_code, s.department, s.exam_date, s.session) for s in students]
+
+
+@pytest.fixture(scope='module')
+def layout_pdf(tmp_path_factory):
+    """
+    Two pages in the university's layout: register numbers in columns at
+    different x offsets (alternate cells a point or two off the baseline),
+    subject names wrapped onto a second line, banner text beside headers
+    """
+    from scripts.bench_pdf_parse import write_roll_pdf
+
+    columns = [40, 128, 216, 304, 392, 480]
+
+    def reg_nos(first, count, dy=0):
+        return [(columns[i], dy if i % 2 else 0, f'7311201{first + i:05d}') for i in range(count)]
+
+    banner = (40, 0, 'Institution: 7311 - Government College of Engineering, Erode')
+    pages = [[
+        [banner, (430, 0, 'Page 1 of 2')],
+        [(40, 0, 'Exam Date: 05-Jan-2026 / FN'), (300, 0, 'Regulation: 2021')],
+        [(40, 0, 'Subject: CS3401:Algorithms and Data Structures for')],
+        [(88, 0, 'Engineering Applications'), (330, 0, 'Question Paper Code : 40001')],
+        reg_nos(4001, 6, 1.5),
+        reg_nos(4007, 6),
+        reg_nos(4013, 3, 2),
+        [(40, 0, 'Subject: EE3402:Linear Integrated Circuits'), (330, 0, 'Question Paper Code : 40002')],
+        reg_nos(5001, 4),
+    ], [
+        [banner, (430, 0, 'Page 2 of 2')],
+        reg_nos(5005, 6, 1),
+        [(40, 0, 'Exam Date: 06-Jan-2026 / AN')],
+        [(40, 0, 'Subject: MA3451:Transforms and Partial Differential')],
+        [(88, 0, 'Equations'), (330, 0, 'Question Paper Code : 40003')],
+        reg_nos(6001, 5),
+    ]]
+    path = tmp_path_factory.mktemp('pdf') / 'layout.pdf'
+    write_roll_pdf(str(path), pages)
+    return str(path)
+
+
+class TestPdfTextBackends:
+    """Tests for the pluggable text extraction backends."""
+
+    def test_backends_extract_identical_text(self, roll_pdf):
+        from app.services.pdf_text import TEXT_BACKENDS
+
+        fast = list(TEXT_BACKENDS['pdfminer'](roll_pdf))
+        reference = list(TEXT_BACKENDS['pdfplumber'](roll_pdf))
+        assert len(fast) == 4
+        assert fast == reference
+
+    def test_backends_parse_identical_students(self, app, roll_pdf):
+        from app.services.pdf_parser import parse_pdf
+
+        with app.app_context():
+            fast = _tuples(parse_pdf(roll_pdf, backend='pdfminer'))
+            reference = _tuples(parse_pdf(roll_pdf, backend='pdfplumber'))
+        assert fast == reference
+        assert len(fast) > 0
+        assert fast[0] == ('731122102000', fast[0][1], 'AUTO', '05-Jan-2026', 'FN')
+
+    def test_backends_agree_on_real_layout(self, app, layout_pdf):
+        from app.services.pdf_text import TEXT_BACKENDS
+        from app.services.pdf_parser import parse_pdf
+
+        fast = list(TEXT_BACKENDS['pdfminer'](layout_pdf))
+        assert fast == list(TEXT_BACKENDS['pdfplumber'](layout_pdf))
+        assert 'Engineering Applications Question Paper Code : 40001' in fast[0].split('\n')
+
+        with app.app_context():
+            students = _tuples(parse_pdf(layout_pdf, backend='pdfminer'))
+            assert students == _tuples(parse_pdf(layout_pdf, backend='pdfplumber'))
+        assert len(students) == 15 + 10 + 5
+        assert students[14] == ('731120104015', 'CS3401', 'CSE', '05-Jan-2026', 'FN')
+        assert students[24] == ('731120105010', 'EE3402', 'EEE', '05-Jan-2026', 'FN')
+        assert students[25] == ('731120106001', 'MA3451', 'ECE', '06-Jan-2026', 'AN')
+
+    def test_failure_on_later_page_falls_back(self, app, layout_pdf, monkeypatch):
+        from app.services import pdf_text
+        from app.services.pdf_parser import parse_pdf
+
+        with app.app_context():
+            expected = _tuples(parse_pdf(layout_pdf, backend='pdfplumber'))
+        pdfminer = pdf_text.TEXT_BACKENDS['pdfminer']
+
+        def fails_on_second_page(file_path, pages=None):
+            yield next(iter(pdfminer(file_path, pages)))
+            raise RuntimeError('pdfminer cannot read page 2')
+
+        monkeypatch.setitem(pdf_text.TEXT_BACKENDS, 'pdfminer', fails_on_second_page)
+        with app.app_context():
+            assert _tuples(parse_pdf(layout_pdf)) == expected
+            with pytest.raises(RuntimeError):
+                parse_pdf(layout_pdf, backend='pdfminer')  # An explicit backend is used alone
+
+    def test_unknown_backend(self, roll_pdf):
+        from app.services.pdf_text import iter_page_texts
+
+        with pytest.raises(ValueError):
+            iter_page_texts(roll_pdf, 'nope')
+
+
+class TestParallelParse:
+    """Tests for the page-parallel tokenise + sequential stitch parser."""
+
+    def test_parallel_matches_serial(self, app, roll_pdf, monkeypatch):
+        from app.services import pdf_parser
+
+        monkeypatch.setattr(pdf_parser, 'MIN_PARALLEL_PAGES', 1)
+        with app.app_context():
+            serial = _tuples(pdf_parser.parse_pdf(roll_pdf, backend='pdfminer', workers=1))
+            parallel = _tuples(pdf_parser.parse_pdf(roll_pdf, backend='pdfminer', workers=2))
+        assert parallel == serial
+
+    def test_context_carries_across_pages(self):
+        from app.services.pdf_parser import tokenise_page, stitch_page_events
+
+        pages = [
+            'Exam Date: 05-Jan-2026 / FN\nSubject: CS3401:Algorithms Question Paper Code : 1\n731120104001',
+            '731120104002 731120105003',
+            'Subject: EE3401:Machines\n731120105004',
+        ]
+        students = stitch_page_events(tokenise_page(text) for text in pages)
+        assert _tuples(students) == [
+            ('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN'),
+            ('731120104002', 'CS3401', 'CSE', '05-Jan-2026', 'FN'),
+            ('731120105003', 'CS3401', 'EEE', '05-Jan-2026', 'FN'),
+            ('731120105004', 'EE3401', 'EEE', '05-Jan-2026', 'FN'),
+        ]
+
+    def test_register_numbers_before_any_header_are_ignored(self):
+        from app.services.pdf_parser import tokenise_page, stitch_page_events
+
+        assert stitch_page_events([tokenise_page('731120104001')]) == []
+
+
+class TestStreamingIngest:
+    """Tests for the streamed upload pipeline (parse -> validate -> batched inserts)."""
+
+    @pytest.fixture
+    def cleanup(self, app):
+        yield
+        from app.extensions import db
+        from app.models.sql import Student
+
+        with app.app_context():
+            Student.query.delete()
+            db.session.commit()
+
+    def test_upload_streams_roll_into_students(self, app, authenticated_client, roll_pdf, tmp_path, monkeypatch, cleanup):
+        from app.models.sql import Student
+        from app.services import ingest
+        from app.services.pdf_parser import parse_pdf
+
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+        # Cache off: every run must exercise the streaming parse, not a cache hit
+        monkeypatch.setitem(app.config, 'PARSE_CACHE_MAX_BYTES', 0)
+        monkeypatch.setattr(ingest, 'INSERT_BATCH_ROWS', 100)
+        with open(roll_pdf, 'rb') as f:
+            response = authenticated_client.post('/api/upload', data={'file': (f, 'roll.pdf')},
+                                                 content_type='multipart/form-data')
+        assert response.status_code == 200
+        data = response.get_json()
+
+        with app.app_context():
+            expected = _tuples(parse_pdf(roll_pdf))
+            stored = _tuples(Student.query.order_by(Student.id).all())
+        assert stored == expected
+        assert data['parseCache'] == 'miss'
+        assert data['studentsCount'] == len(expected)
+        assert [s['registerNumber'] for s in data['students']] == [t[0] for t in expected[:10]]
+
+    def test_failure_keeps_previous_roster(self, app, cleanup):
+        from app.models.sql import Student
+        from app.services.ingest import replace_students
+
+        with app.app_context():
+            replace_students([('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN')])
+
+            def broken_rows():
+                yield ('731120104002', 'CS3401', 'CSE', '05-Jan-2026', 'FN')
+                raise RuntimeError('truncated PDF')
+
+            with pytest.raises(RuntimeError):
+                replace_students(broken_rows(), batch_rows=1)
+            assert [s.register_number for s in Student.query.all()] == ['731120104001']
+
+
+class TestLineClassifier:
+    """Tests for the compiled line classifier, department table and page counters."""
+
+    def test_page_counters(self):
+        from app.services.pdf_parser import tokenise_page, iter_stitched, ParseStats
+
+        pages = [
+            '731120104000\nExam Date: 05-Jan-2026 / AN\nSubject: CS3401:Algorithms\n731120104001 731120104002',
+            'Institution: 7311\n731120104003',
+        ]
+        stats = ParseStats()
+        rows = list(iter_stitched((tokenise_page(t) for t in pages), stats))
+        assert len(rows) == 3
+        assert stats.pages == [
+            {'page': 1, 'lines': 4, 'headers': 2, 'regNos': 3, 'students': 2},
+            {'page': 2, 'lines': 2, 'headers': 0, 'regNos': 1, 'students': 1},
+        ]
+        assert stats.summary()['students'] == 3
+
+    def test_department_overrides(self, app, authenticated_client):
+        from app.services.pdf_parser import get_dept_from_code
+        from app.services.generation import current_generation, department_codes_version
+
+        with app.app_context():
+            assert get_dept_from_code('104') == 'CSE'
+            assert get_dept_from_code('999') == '999'
+            generation, version = current_generation(), department_codes_version()
+
+        response = authenticated_client.put('/api/admin/department-codes', json={'999': 'aids', '104': 'CSE-A'})
+        assert response.status_code == 200
+        assert response.get_json()['departments']['999'] == 'AIDS'
+        with app.app_context():
+            assert get_dept_from_code('999') == 'AIDS'
+            assert get_dept_from_code('104') == 'CSE-A'
+            # Seating caches and ETags are keyed on the data generation, which must not move
+            assert current_generation() == generation
+            assert department_codes_version() == version + 1
+
+        authenticated_client.put('/api/admin/department-codes', json={'999': '', '104': None})
+        with app.app_context():
+            assert get_dept_from_code('999') == '999'
+            assert get_dept_from_code('104') == 'CSE'
+
+        assert authenticated_client.put('/api/admin/department-codes', json={'1x': 'BAD'}).status_code == 400
+
+
+class TestParseCache:
+    """Tests for the content-hash parse cache."""
+
+    def test_pack_round_trip(self):
+        from app.services.parse_cache import pack_rows, unpack_rows
+
+        rows = [('031120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN'),
+                ('731120105002', 'EE3401', 'EEE', '06-Jan-2026', 'AN'),
+                ('731120104003', 'CS3401', 'CSE', '05-Jan-2026', 'FN')]
+        assert unpack_rows(pack_rows(rows, {'pages': 1})) == (rows, {'pages': 1})
+
+    def test_eviction_by_size(self, tmp_path):
+        import os
+        from app.services.parse_cache import ParseCache, pack_rows
+
+        rows = [(f'7311201040{i:02d}', 'CS3401', 'CSE', '05-Jan-2026', 'FN') for i in range(50)]
+        size = len(pack_rows(rows, None))
+        cache = ParseCache(str(tmp_path), max_bytes=size * 2)
+        for n, key in enumerate(['a', 'b', 'c']):
+            cache.put(key, rows, None)
+            os.utime(tmp_path / f'{key}.roll', (n, n))
+        cache.evict()
+        assert cache.get('a') is None
+        assert cache.get('c') is not None
+
+    def test_reupload_is_served_from_cache(self, app, authenticated_client, roll_pdf, tmp_path, monkeypatch):
+        from app.extensions import db
+        from app.models.sql import Student
+        from app.services import pdf_parser
+
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+        monkeypatch.setitem(app.config, 'PARSE_CACHE_DIR', str(tmp_path / 'cache'))
+
+        def upload():
+            with open(roll_pdf, 'rb') as f:
+                return authenticated_client.post('/api/upload', data={'file': (f, 'roll.pdf')},
+                                                 content_type='multipart/form-data').get_json()
+
+        try:
+            first = upload()
+            assert first['parseCache'] == 'miss'
+            with app.app_context():
+                expected = _tuples(Student.query.order_by(Student.id).all())
+
+            monkeypatch.setattr(pdf_parser, 'iter_pdf_students', lambda *a, **k: pytest.fail('re-parsed'))
+            second = upload()
+            assert second['parseCache'] == 'hit'
+            assert second['studentsCount'] == first['studentsCount']
+            assert second['parseStats'] == first['parseStats']
+            with app.app_context():
+                assert _tuples(Student.query.order_by(Student.id).all()) == expected
+        finally:
+            with app.app_context():
+                Student.query.delete()
+                db.session.commit()
@@ -35,3 +35,504 @@ class TestSeatingRoutes:
         """Test clearing all allocations when authenticated."""
         response = authenticated_client.delete('/api/clear')
         assert response.status_code == 200
+
+
+class TestStudentSearch:
+    """Tests for POST /api/search."""
+
+    @pytest.fixture
+    def seeded(self, app):
+        """Seed one hall with a few allocations across several sessions."""
+        from app.extensions import db
+        from app.models.sql import Hall, Allocation
+        from app.services.generation import bump_generation
+
+        with app.app_context():
+            Allocation.query.delete()
+            hall = Hall(id='search-hall', name='SRCH1', block='Test Block',
+                        rows=2, columns=2, capacity=4)
+            db.session.add(hall)
+            for i, session_key in enumerate(['01-Jan-2026_FN', '02-Jan-2026_FN', '03-Jan-2026_AN']):
+                db.session.add(Allocation(register_number='731120104001', department='CSE',
+                                          subject_code=f'CS{i}', hall_name='SRCH1', row_num=0,
+                                          col_num=0, seat_number='1', session_key=session_key))
+                db.session.add(Allocation(register_number='731120105001', department='EEE',
+                                          subject_code=f'EE{i}', hall_name='SRCH1', row_num=1,
+                                          col_num=0, seat_number='2', session_key=session_key))
+            bump_generation()
+            db.session.commit()
+            yield
+            Allocation.query.delete()
+            db.session.delete(db.session.get(Hall, 'search-hall'))
+            bump_generation()
+            db.session.commit()
+
+    def test_search_not_found(self, client, seeded):
+        response = client.post('/api/search', json={'registerNumber': '999999999999'})
+        assert response.status_code == 404
+
+    def test_search_default_is_lightweight(self, client, seeded):
+        response = client.post('/api/search', json={'registerNumber': '731120104001'})
+        assert response.status_code == 200
+        match = response.get_json()['allocations'][0]
+        assert 'hallSeating' not in match
+        assert match['hallName'] == 'SRCH1'
+        assert match['block'] == 'Test Block'
+        assert (match['row'], match['col'], match['seatNumber']) == (0, 0, '1')
+
+    def test_hall_sketch_endpoint(self, client, seeded):
+        response = client.get('/api/halls/SRCH1/sketch?session=01-Jan-2026_FN')
+        assert response.status_code == 200
+        assert 'public' in response.headers['Cache-Control']
+        sketch = response.get_json()
+        assert sketch['hall']['name'] == 'SRCH1'
+        assert sketch['grid'][1][0]['student']['registerNumber'] == '731120105001'
+
+        assert client.get('/api/halls/SRCH1/sketch?session=09-Jan-2026_FN').status_code == 404
+
+    def test_search_builds_hall_grid(self, client, seeded):
+        response = client.post('/api/search?include=grid', json={'registerNumber': '731120104001'})
+        assert response.status_code == 200
+        allocations = response.get_json()['allocations']
+        assert len(allocations) == 3
+
+        sketch = allocations[0]['hallSeating']
+        assert sketch['hall']['name'] == 'SRCH1'
+        assert sketch['studentsCount'] == 2
+        assert sketch['grid'][0][0]['student']['registerNumber'] == '731120104001'
+        assert sketch['grid'][1][0]['student']['registerNumber'] == '731120105001'
+        assert sketch['grid'][0][1]['student'] is None
+        assert sketch['grid'][0][1]['seatNumber'] == '4'
+
+    def test_repeat_search_skips_sql(self, app, client, seeded):
+        """Once the index is built, lookups are served without SQL."""
+        from sqlalchemy import event
+        from app.extensions import db
+
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        client.post('/api/search', json={'registerNumber': '731120104001'})
+        event.listen(engine, 'before_cursor_execute', count)
+        try:
+            response = client.post('/api/search', json={'registerNumber': '731120104001'})
+        finally:
+            event.remove(engine, 'before_cursor_execute', count)
+
+        assert response.status_code == 200
+        assert len(response.get_json()['allocations']) == 3
+        assert statements == []
+
+    def test_search_sees_new_generation(self, app, client, seeded):
+        from app.extensions import db
+        from app.models.sql import Allocation
+        from app.services.generation import bump_generation
+
+        assert client.post('/api/search', json={'registerNumber': '731120106001'}).status_code == 404
+        with app.app_context():
+            db.session.add(Allocation(register_number='731120106001', department='ECE',
+                                      subject_code='EC1', hall_name='SRCH1', row_num=0,
+                                      col_num=1, seat_number='4', session_key='01-Jan-2026_FN'))
+            bump_generation()
+            db.session.commit()
+
+        response = client.post('/api/search', json={'registerNumber': '731120106001'})
+        assert response.status_code == 200
+        assert response.get_json()['allocations'][0]['seatNumber'] == '4'
+
+    def test_repeat_search_hits_response_cache(self, authenticated_client, seeded):
+        from app.services.response_cache import search_cache
+
+        before = search_cache.stats()
+        authenticated_client.post('/api/search', json={'registerNumber': '731120104001'})
+        authenticated_client.post('/api/search', json={'registerNumber': '731120104001'})
+        after = authenticated_client.get('/api/admin/cache-stats').get_json()['search']
+        assert after['hits'] >= before['hits'] + 1
+        assert after['size'] >= 1
+
+    def test_conditional_search_post_is_412(self, client, seeded):
+        first = client.post('/api/search', json={'registerNumber': '731120104001'})
+        assert first.status_code == 200
+        response = client.post('/api/search', json={'registerNumber': '731120104001'},
+                               headers={'If-None-Match': first.headers['ETag']})
+        assert response.status_code == 412
+
+    def test_batch_search_requires_login(self, client, seeded):
+        response = client.post('/api/search/batch', json={
+            'range': {'from': '731120104000', 'to': '731120104999'}
+        })
+        assert response.status_code == 401
+
+    def test_batch_search_by_list(self, authenticated_client, seeded):
+        response = authenticated_client.post('/api/search/batch', json={
+            'registerNumbers': ['731120104001', '731120105001', '999999999999']
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['count'] == 3
+        assert data['notFound'] == ['999999999999']
+        first = data['results'][0]
+        assert first['registerNumber'] == '731120104001'
+        assert len(first['allocations']) == 3
+        assert 'hallSeating' not in first['allocations'][0]
+
+    def test_batch_search_by_range_csv(self, authenticated_client, seeded):
+        response = authenticated_client.post('/api/search/batch?format=csv', json={
+            'range': {'from': '731120104000', 'to': '731120104999'}
+        })
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        lines = response.get_data(as_text=True).strip().splitlines()
+        assert lines[0] == 'registerNumber,session,subject,hallName,seatNumber'
+        assert len(lines) == 4
+        assert all(line.startswith('731120104001,') for line in lines[1:])
+
+    def test_batch_search_rejects_oversized(self, authenticated_client):
+        response = authenticated_client.post('/api/search/batch', json={
+            'range': {'from': '731120100000', 'to': '731120199999'}
+        })
+        assert response.status_code == 400
+
+
+class TestLRUCache:
+    """Tests for the bounded LRU used by the search cache."""
+
+    def test_evicts_least_recently_used(self):
+        from app.services.response_cache import LRUCache
+
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.stats()['evictions'] == 1
+
+    def test_expired_entries_miss(self):
+        from app.services.response_cache import LRUCache
+
+        cache = LRUCache(maxsize=2, ttl=0)
+        cache.put('a', 1)
+        assert cache.get('a') is None
+        assert cache.stats()['expirations'] == 1
+
+
+class TestHallSketchCache:
+    """Tests for the per-(session, hall) sketches stored at generation time."""
+
+    @pytest.fixture
+    def generated(self, app, authenticated_client):
+        """Upload-free generation: seed students directly and call /api/generate."""
+        from app.extensions import db
+        from app.models.sql import Student, Allocation, HallSketch
+
+        with app.app_context():
+            for i in range(6):
+                db.session.add(Student(register_number=f'73112010400{i}', subject_code='CS3401',
+                                       department='CSE', exam_date='05-Jan-2026', session='FN'))
+                db.session.add(Student(register_number=f'73112010500{i}', subject_code='EE3401',
+                                       department='EEE', exam_date='05-Jan-2026', session='FN'))
+            db.session.commit()
+
+        response = authenticated_client.post('/api/generate')
+        assert response.status_code == 200
+        yield authenticated_client
+
+        with app.app_context():
+            Allocation.query.delete()
+            Student.query.delete()
+            HallSketch.query.delete()
+            db.session.commit()
+
+    def test_generate_stores_sketches(self, app, generated):
+        from app.models.sql import Allocation, HallSketch
+
+        with app.app_context():
+            hall_names = {a.hall_name for a in Allocation.query.all()}
+            sketches = HallSketch.query.all()
+            assert {s.hall_name for s in sketches} == hall_names
+            assert all(s.session_key == '05-Jan-2026_FN' for s in sketches)
+
+    def test_session_seating_matches_reconstruction(self, app, generated):
+        from app.routes.seating import reconstruct_seating_result
+
+        data = generated.get('/api/seating/05-Jan-2026_FN').get_json()
+        assert data['totalStudents'] == 12
+        assert len(data['studentAllocation']) == 12
+
+        with app.app_context():
+            result = reconstruct_seating_result('05-Jan-2026_FN')
+        assert data['hallsUsed'] == result.hallsUsed
+        assert [h['hall']['name'] for h in data['halls']] == [hs.hall.name for hs in result.halls]
+        first = data['halls'][0]
+        seat = result.halls[0].grid[0][0]
+        assert first['grid'][0][0]['student']['registerNumber'] == seat.student.registerNumber
+        assert first['grid'][0][0]['student']['session'] == 'FN'
+
+    def test_hall_update_invalidates_sketch(self, app, generated):
+        from app.models.sql import Hall, HallSketch
+
+        with app.app_context():
+            sketch = HallSketch.query.first()
+            hall = Hall.query.filter_by(name=sketch.hall_name).first()
+            hall_id, hall_name = hall.id, hall.name
+
+        response = generated.put(f'/api/halls/{hall_id}', json={'capacity': hall.capacity})
+        assert response.status_code == 200
+
+        with app.app_context():
+            assert HallSketch.query.filter_by(hall_name=hall_name).count() == 0
+
+        # Still served, rebuilt from allocation rows
+        data = generated.get('/api/seating/05-Jan-2026_FN').get_json()
+        assert hall_name in [h['hall']['name'] for h in data['halls']]
+
+    def test_clear_drops_sketches(self, app, generated):
+        from app.models.sql import HallSketch
+
+        assert generated.delete('/api/clear').status_code == 200
+        with app.app_context():
+            assert HallSketch.query.count() == 0
+
+
+    def test_compact_format_matches_full(self, generated):
+        full = generated.get('/api/seating/05-Jan-2026_FN').get_json()
+        compact = generated.get('/api/seating/05-Jan-2026_FN?format=compact').get_json()
+
+        assert compact['format'] == 'compact'
+        assert compact['totalStudents'] == full['totalStudents']
+        assert [h['name'] for h in compact['halls']] == [h['hall']['name'] for h in full['halls']]
+
+        students = compact['students']
+        for hall, full_hall in zip(compact['halls'], full['halls']):
+            assert len(hall['seats']) == hall['rows'] * hall['columns']
+            for row in full_hall['grid']:
+                for seat in row:
+                    idx = hall['seats'][int(seat['seatNumber']) - 1]
+                    if seat['student'] is None:
+                        assert idx == -1
+                    else:
+                        assert students['registerNumber'][idx] == seat['student']['registerNumber']
+                        assert compact['subjects'][students['subject'][idx]] == seat['subject']
+                        assert compact['departments'][students['department'][idx]] == seat['department']
+
+
+    def test_session_seating_streams_gzip(self, generated):
+        import gzip
+        import json
+
+        plain = generated.get('/api/seating/05-Jan-2026_FN')
+        assert plain.is_streamed
+        zipped = generated.get('/api/seating/05-Jan-2026_FN', headers={'Accept-Encoding': 'gzip'})
+        assert zipped.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(zipped.get_data())) == plain.get_json()
+
+    def test_students_list_is_streamed(self, generated):
+        response = generated.get('/api/students')
+        assert response.status_code == 200
+        assert response.is_streamed
+        students = response.get_json()
+        assert len(students) == 12
+        assert students[0]['registerNumber'] == '731120104000'
+        assert students[0]['session'] == 'FN'
+
+    def test_students_keyset_pages(self, generated):
+        seen, cursor = [], None
+        while True:
+            url = '/api/students?limit=5' + (f'&cursor={cursor}' if cursor else '')
+            page = generated.get(url).get_json()
+            assert len(page['students']) <= 5
+            seen.extend(s['registerNumber'] for s in page['students'])
+            cursor = page['nextCursor']
+            if not cursor:
+                break
+        assert seen == sorted(seen)
+        assert len(seen) == 12
+
+        eee = generated.get('/api/students?limit=100&department=EEE').get_json()
+        assert {s['department'] for s in eee['students']} == {'EEE'}
+        assert len(eee['students']) == 6
+        assert eee['nextCursor'] is None
+        assert generated.get('/api/students?limit=5&cursor=garbage').status_code == 400
+
+    def test_students_export_formats(self, generated):
+        import json
+
+        ndjson = generated.get('/api/students?format=ndjson&subject=CS3401')
+        assert ndjson.mimetype == 'application/x-ndjson'
+        lines = ndjson.get_data(as_text=True).splitlines()
+        assert len(lines) == 6
+        assert json.loads(lines[0])['subjectCode'] == 'CS3401'
+
+        csv_response = generated.get('/api/students?format=csv')
+        assert csv_response.mimetype == 'text/csv'
+        rows = csv_response.get_data(as_text=True).splitlines()
+        assert rows[0] == 'registerNumber,subjectCode,department,examDate,session'
+        assert len(rows) == 13
+
+    def test_session_hall_summary_and_single_hall(self, generated):
+        full = generated.get('/api/seating/05-Jan-2026_FN').get_json()
+        summary = generated.get('/api/seating/05-Jan-2026_FN/halls').get_json()
+
+        assert [h['name'] for h in summary['halls']] == [h['hall']['name'] for h in full['halls']]
+        assert summary['totalStudents'] == 12
+        first = summary['halls'][0]
+        assert first['studentsCount'] == full['halls'][0]['studentsCount']
+        assert sum(first['departments'].values()) == first['studentsCount']
+        assert 'grid' not in first
+
+        one = generated.get(f"/api/seating/05-Jan-2026_FN/halls/{first['name']}").get_json()
+        assert one == full['halls'][0]
+        assert generated.get('/api/seating/05-Jan-2026_FN/halls/NOPE').status_code == 404
+
+
+class TestGenerationCounter:
+    """Tests for seeding the data generation row."""
+
+    def test_row_is_seeded_once(self, app):
+        from app.extensions import db
+        from app.models.sql import DataGeneration
+        from app.services.generation import ensure_generation_row, current_generation, GENERATION_ROW_ID
+
+        with app.app_context():
+            value = current_generation()
+            assert db.session.get(DataGeneration, GENERATION_ROW_ID) is not None
+            ensure_generation_row()
+            assert current_generation() == value
+
+    def test_concurrent_seed_is_ignored(self, app, monkeypatch):
+        from app.extensions import db
+        from app.models.sql import DataGeneration
+        from app.services.generation import ensure_generation_row, current_generation
+
+        with app.app_context():
+            value = current_generation()
+            # Another worker inserted the row between our check and our insert
+            monkeypatch.setattr(db.session, 'get', lambda *args, **kwargs: None)
+            ensure_generation_row()
+            monkeypatch.undo()
+            assert DataGeneration.query.count() == 2  # Data generation + department code version
+            assert current_generation() == value
+
+
+class TestConditionalGet:
+    """Tests for generation-based ETags on read endpoints."""
+
+    def test_unchanged_data_returns_304(self, authenticated_client):
+        first = authenticated_client.get('/api/sessions')
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+        assert 'no-cache' in first.headers['Cache-Control']
+
+        second = authenticated_client.get('/api/sessions', headers={'If-None-Match': etag})
+        assert second.status_code == 304
+        assert second.headers['ETag'] == etag
+
+    def test_compressed_etag_suffix_is_accepted(self, authenticated_client):
+        etag = authenticated_client.get('/api/halls').headers['ETag']
+        gzip_etag = etag[:-1] + ':gzip"'
+        response = authenticated_client.get('/api/halls', headers={'If-None-Match': gzip_etag})
+        assert response.status_code == 304
+
+    def test_gzipped_stream_has_its_own_etag(self, app, authenticated_client):
+        import gzip
+        from app.extensions import db
+        from app.models.sql import Student
+
+        with app.app_context():
+            db.session.add(Student(register_number='731120104001', subject_code='CS3401', department='CSE',
+                                   exam_date='05-Jan-2026', session='FN'))
+            db.session.commit()
+        try:
+            plain = authenticated_client.get('/api/students')
+            zipped = authenticated_client.get('/api/students', headers={'Accept-Encoding': 'gzip'})
+            assert gzip.decompress(zipped.get_data()) == plain.get_data()
+            assert zipped.headers['Content-Encoding'] == 'gzip'
+            assert zipped.headers['ETag'] == plain.headers['ETag'][:-1] + ':gzip"'
+
+            again = authenticated_client.get('/api/students', headers={
+                'Accept-Encoding': 'gzip', 'If-None-Match': zipped.headers['ETag']})
+            assert again.status_code == 304
+            assert again.headers['ETag'] == zipped.headers['ETag']
+        finally:
+            with app.app_context():
+                Student.query.delete()
+                db.session.commit()
+
+    def test_write_changes_etag(self, authenticated_client):
+        etag = authenticated_client.get('/api/halls').headers['ETag']
+        authenticated_client.post('/api/halls', json={
+            'name': 'ETag Hall', 'block': 'Block 1', 'rows': 2, 'columns': 2
+        })
+        response = authenticated_client.get('/api/halls', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+
+class TestStaticExport:
+    """Tests for the sharded static seat lookup export."""
+
+    def test_export_is_incremental(self, app, tmp_path):
+        import json
+        from app.extensions import db
+        from app.models.sql import Allocation
+        from app.services.static_export import export_student_shards
+
+        with app.app_context():
+            Allocation.query.delete()
+            for reg_no, hall in [('731120104001', 'I1'), ('731120104002', 'I1'), ('731120105001', 'I2')]:
+                db.session.add(Allocation(register_number=reg_no, department='CSE', subject_code='CS1',
+                                          hall_name=hall, row_num=0, col_num=0, seat_number='1',
+                                          session_key='07-Jan-2026_FN'))
+            db.session.commit()
+
+            first = export_student_shards(str(tmp_path))
+            assert first == {'shards': 2, 'written': 2, 'unchanged': 0, 'removed': 0}
+
+            manifest = json.loads((tmp_path / 'manifest.json').read_text())
+            shard = manifest['shards']['731120104']
+            assert (tmp_path / shard['file']).exists()
+            assert (tmp_path / (shard['file'] + '.gz')).exists()
+            data = json.loads((tmp_path / shard['file']).read_text())
+            assert data['731120104002'][0]['hallName'] == 'I1'
+
+            assert export_student_shards(str(tmp_path))['written'] == 0
+
+            Allocation.query.filter_by(register_number='731120105001').delete()
+            db.session.commit()
+            third = export_student_shards(str(tmp_path))
+            assert third == {'shards': 1, 'written': 0, 'unchanged': 1, 'removed': 1}
+            assert not (tmp_path / 'shards' / '731120105.json').exists()
+
+            Allocation.query.delete()
+            db.session.commit()
+
+    def test_generate_exports_only_when_enabled(self, app, authenticated_client, tmp_path, monkeypatch):
+        from app.extensions import db
+        from app.models.sql import Student, Allocation, HallSketch
+
+        with app.app_context():
+            db.session.add(Student(register_number='731120104001', subject_code='CS3401', department='CSE',
+                                   exam_date='05-Jan-2026', session='FN'))
+            db.session.commit()
+        monkeypatch.setitem(app.config, 'STATIC_EXPORT_DIR', str(tmp_path))
+
+        monkeypatch.setitem(app.config, 'STATIC_EXPORT_ON_GENERATE', False)
+        assert authenticated_client.post('/api/generate').status_code == 200
+        assert not (tmp_path / 'manifest.json').exists()
+
+        monkeypatch.setitem(app.config, 'STATIC_EXPORT_ON_GENERATE', True)
+        assert authenticated_client.post('/api/generate').status_code == 200
+        assert (tmp_path / 'manifest.json').exists()
+
+        with app.app_context():
+            Allocation.query.delete()
+            Student.query.delete()
+            HallSketch.query.delete()
+            db.session.commit()
@@ -0,0 +1,111 @@
+"""
+Tests for CSV / Excel Roster Uploads
+"""
+import pytest
+
+
+class TestTabularUpload:
+    """Tests for the vectorised CSV/XLSX path of POST /api/upload."""
+
+    @pytest.fixture
+    def tabular_client(self, app, authenticated_client, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+        yield authenticated_client
+
+        from app.extensions import db
+        from app.models.sql import Student
+        with app.app_context():
+            Student.query.delete()
+            db.session.commit()
+
+    def test_cleans_columns_in_chunks(self, app, tmp_path, monkeypatch):
+        from app.services import parser
+
+        path = tmp_path / 'roll.csv'
+        path.write_text(' Reg No ,Sub Code,Date,Shift\n'
+                        '731120104001, cs3401 ,2026-01-05,fn\n'
+                        ',CS3401,05-Jan-2026,FN\n'
+                        '031120205002,CS3402,06-Jan-2026 ,AN\n')
+        monkeypatch.setattr(parser, 'CSV_CHUNK_ROWS', 1)
+        with app.app_context():
+            rows = list(parser.iter_tabular_rows(str(path)))
+        assert rows == [
+            ('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN'),
+            ('031120205002', 'CS3402', 'IT', '06-Jan-2026', 'AN'),  # leading zero kept
+        ]
+
+    def test_rows_missing_a_field_are_dropped(self, app, tabular_client):
+        import io
+
+        csv_text = ('Register Number,Subject Code,Exam Date,Session\n'
+                    '731120104001,CS3401,05-Jan-2026,FN\n'
+                    '731120104002,,05-Jan-2026,FN\n'
+                    '731120104003,CS3401,,FN\n'
+                    '731120104004,CS3401,05-Jan-2026, \n')
+        response = tabular_client.post('/api/upload', data={'file': (io.BytesIO(csv_text.encode()), 'roll.csv')},
+                                       content_type='multipart/form-data')
+        assert response.status_code == 200
+        assert response.get_json()['studentsCount'] == 1
+        assert tabular_client.get('/api/sessions').get_json()['pending'] == ['05-Jan-2026_FN']
+
+    def test_upload_csv_and_xlsx(self, app, tabular_client, tmp_path):
+        import io
+        import pandas as pd
+        from app.models.sql import Student
+
+        csv_text = ('Register Number,Subject Code,Department,Exam Date,Session\n'
+                    '731120104001,CS3401,CSE,05-Jan-2026,FN\n')
+        response = tabular_client.post('/api/upload', data={'file': (io.BytesIO(csv_text.encode()), 'roll.csv')},
+                                       content_type='multipart/form-data')
+        assert response.status_code == 200
+        assert response.get_json()['parseStats'] == {'rows': 1}
+
+        xlsx = tmp_path / 'roll.xlsx'
+        pd.DataFrame({'Register Number': ['731120104002'], 'Subject Code': ['CS3402'],
+                      'Exam Date': ['06-Jan-2026'], 'Session': ['AN']}).to_excel(xlsx, index=False)
+        with open(xlsx, 'rb') as f:
+            response = tabular_client.post('/api/upload', data={'file': (f, 'roll.xlsx'), 'mode': 'append'},
+                                           content_type='multipart/form-data')
+        assert response.status_code == 200
+        with app.app_context():
+            assert [(s.register_number, s.department) for s in Student.query.order_by(Student.id)] == [
+                ('731120104001', 'CSE'), ('731120104002', 'CSE')]
+
+    def test_bad_file_keeps_roster(self, app, tabular_client):
+        import io
+        from app.models.sql import Student
+
+        good = b'Register Number,Subject Code,Exam Date,Session\n731120104001,CS3401,05-Jan-2026,FN\n'
+        assert tabular_client.post('/api/upload', data={'file': (io.BytesIO(good), 'roll.csv')},
+                                   content_type='multipart/form-data').status_code == 200
+        for body in (b'Register Number,Session\n731120104001,FN\n',
+                     b'Register Number,Subject Code,Exam Date,Session\n'):
+            response = tabular_client.post('/api/upload', data={'file': (io.BytesIO(body), 'roll.csv')},
+                                           content_type='multipart/form-data')
+            assert response.status_code == 400
+        with app.app_context():
+            assert Student.query.count() == 1
+
+    def test_large_csv_is_streamed_in_chunks(self, app, tmp_path, monkeypatch):
+        from app.services import parser
+
+        path = tmp_path / 'big.csv'
+        with open(path, 'w') as f:
+            f.write('Register Number,Subject Code,Department,Exam Date,Session\n')
+            for i in range(1000):
+                f.write(f'7311201{i:05d},CS3401,CSE,05-Jan-2026,FN\n')
+
+        cleaned = []
+        clean_chunk = parser._clean_chunk
+
+        def spy(chunk, columns, departments):
+            cleaned.append(len(chunk))
+            return clean_chunk(chunk, columns, departments)
+
+        monkeypatch.setattr(parser, 'CSV_CHUNK_ROWS', 100)
+        monkeypatch.setattr(parser, '_clean_chunk', spy)
+        rows = parser.iter_tabular_rows(str(path), departments={})
+        assert next(rows) == ('731120100000', 'CS3401', 'CSE', '05-Jan-2026', 'FN')
+        assert cleaned == [100]  # Later chunks are not read yet
+        assert len(list(rows)) == 999
+        assert cleaned == [100] * 10
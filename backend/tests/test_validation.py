@@ -0,0 +1,69 @@
+"""
+Unit Tests for the Roster Validator
+"""
+import pytest
+
+
+class TestValidation:
+    """Tests for the single-pass roster validator."""
+
+    def test_report(self):
+        from app.services.validation import StudentValidator
+
+        rows = [
+            ('731120104001', 'CS3401', 'CSE', '05-Jan-2026', 'FN'),
+            ('731120104001', 'CS3402', 'CSE', '06-Jan-2026', 'FN'),  # another paper: fine
+            ('731120104001', 'CS3403', 'CSE', '05-Jan-2026', 'FN'),  # same session: duplicate
+            ('73112010400', 'CS3401', 'CSE', '05-Jan-2026', 'FN'),   # 11 digits
+            ('731120999002', 'CS3401', 'CSE', '05-Jan-2026', 'EN'),  # unknown code, bad session
+        ]
+        report = StudentValidator({'104'}).add_many(rows).report()
+        issues = report['issues']
+        assert report['rows'] == 5
+        assert issues['duplicate']['count'] == 1
+        assert issues['duplicate']['samples'][0]['subjectCode'] == 'CS3403'
+        assert issues['malformed_reg_no']['count'] == 1
+        assert issues['unknown_department']['samples'] == [{'registerNumber': '731120999002', 'code': '999'}]
+        assert issues['invalid_session']['count'] == 1
+        assert issues['session_outlier']['count'] == 0
+
+    def test_session_outliers_and_sample_cap(self):
+        from app.services.validation import StudentValidator, SAMPLE_LIMIT
+
+        validator = StudentValidator()
+        for day, size in ((5, 40), (6, 40), (7, 40), (8, 400)):
+            for i in range(size):
+                # Only 100 distinct numbers: the big session repeats them
+                validator.add((f'731120104{i % 100:03d}', 'CS3401', 'CSE', f'{day:02d}-Jan-2026', 'FN'))
+        report = validator.report()
+        assert [s['session'] for s in report['issues']['session_outlier']['samples']] == ['08-Jan-2026_FN']
+        assert len(report['issues']['duplicate']['samples']) == SAMPLE_LIMIT
+        assert any(w.startswith('Sessions with an unusual') for w in validator.warnings())
+
+    def test_large_roster_is_single_pass(self):
+        from app.services.parser import validate_student_data
+        from app.models.sql import Student
+
+        class OnePassRoster(list):
+            """Counts iterations and refuses the O(n) per-row lookups"""
+            passes = 0
+
+            def __iter__(self):
+                self.passes += 1
+                return super().__iter__()
+
+            def count(self, value):
+                raise AssertionError('validator must not call list.count')
+
+            def index(self, *args):
+                raise AssertionError('validator must not call list.index')
+
+        students = OnePassRoster(
+            Student(register_number=f'7311201{i:05d}', subject_code='CS3401', department='CSE',
+                    exam_date='05-Jan-2026', session='FN') for i in range(5000))
+        assert validate_student_data(students) == []
+        students.append(Student(register_number='731120100000', subject_code='CS3402', department='CSE',
+                                exam_date='05-Jan-2026', session='FN'))
+        warnings = validate_student_data(students)
+        assert any(w.startswith('Register numbers listed more than once') for w in warnings)
+        assert students.passes == 2  # Once per call
@@ -1,11 +1,13 @@
 import { useState, useRef, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Upload as UploadIcon, FileSpreadsheet, CheckCircle2, AlertCircle, Download, RefreshCw, LayoutGrid, Trash2 } from 'lucide-react';
-import { uploadFile, generateSeating, getStudents, downloadHallWiseExcel, downloadStudentWiseExcel, getSessionSeating, clearAllocations, getSessions } from '../utils/api';
+import { uploadFile, uploadFileChunked, generateSeating, getStudentPage, downloadHallWiseExcel, downloadStudentWiseExcel, getSessionSeating, clearAllocations, getSessions } from '../utils/api';
 import type { SeatingResult, UploadFileResponse, Stats } from '../types';
 import SeatingGrid from '../components/seating/SeatingGrid';
 import StatCards from '../components/layout/StatCards';
 
+const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+
 const AdminDashboard = () => {
     const navigate = useNavigate();
     // State for Upload
@@ -32,7 +34,7 @@ const AdminDashboard = () => {
 
     const checkStudentsAndLoad = async () => {
         try {
-            const students = await getStudents();
+            const { students } = await getStudentPage(1);
             setBackendError(false);
             if (students.length > 0) {
                 setHasStudents(true);
@@ -94,10 +96,12 @@ const AdminDashboard = () => {
 
         const validTypes = [
             'application/pdf',
+            'text/csv',
+            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         ];
 
-        if (!validTypes.includes(file.type) && !file.name.match(/\.pdf$/i)) {
-            setError('Please upload a valid PDF (.pdf) file');
+        if (!validTypes.includes(file.type) && !file.name.match(/\.(pdf|csv|xlsx)$/i)) {
+            setError('Please upload a valid PDF (.pdf), Excel (.xlsx) or CSV (.csv) file');
             return;
         }
 
@@ -106,7 +110,8 @@ const AdminDashboard = () => {
             setError(null);
             setUploadResult(null);
 
-            const res = await uploadFile(file);
+            // Large rolls go up in resumable chunks
+            const res = file.size > CHUNKED_UPLOAD_THRESHOLD ? await uploadFileChunked(file) : await uploadFile(file);
             setUploadResult(res);
             setHasStudents(true);
 
@@ -395,7 +400,7 @@ const AdminDashboard = () => {
                     <input
                         ref={fileInputRef}
                         type="file"
-                        accept=".pdf"
+                        accept=".pdf,.csv,.xlsx"
                         onChange={handleChange}
                         className="hidden"
                         aria-label="Upload PDF file"
@@ -437,7 +442,7 @@ const AdminDashboard = () => {
                             {uploading ? 'Processing File...' : 'Drop PDF file here to upload'}
                         </h3>
                         <p className="text-sm text-gray-500 dark:text-gray-400">
-                            Supported: PDF
+                            Supported: PDF, Excel (.xlsx), CSV
                         </p>
                     </div>
 
@@ -1,15 +1,19 @@
 import { useState, useMemo } from 'react';
-import { Search, MapPin, Armchair, ChevronRight } from 'lucide-react';
-import { searchStudent } from '../utils/api';
+import { Search, MapPin, Armchair, ChevronRight, ChevronDown } from 'lucide-react';
+import { searchStudent, getHallSketch } from '../utils/api';
 import { validateRegisterNumber } from '../utils/validation';
 import SeatingGrid from '../components/seating/SeatingGrid';
 import GradientText from '../components/ui/GradientText';
+import type { HallSeating } from '../types';
 
 const StudentDashboard = () => {
     const [registerNumber, setRegisterNumber] = useState('');
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState<string | null>(null);
     const [allocations, setAllocations] = useState<any[] | null>(null);
+    // Hall grids, fetched only when the student opens that allocation's hall
+    const [openHalls, setOpenHalls] = useState<Record<number, boolean>>({});
+    const [sketches, setSketches] = useState<Record<number, HallSeating | 'loading' | 'error'>>({});
 
     // Simple Color Map for subjects (could be dynamic)
     const colorMap = useMemo(() => new Map<string, string>(), []);
@@ -18,6 +22,8 @@ const StudentDashboard = () => {
         e.preventDefault();
         setError(null);
         setAllocations(null);
+        setOpenHalls({});
+        setSketches({});
 
         if (!registerNumber.trim()) return;
 
@@ -46,6 +52,20 @@ const StudentDashboard = () => {
         }
     };
 
+    const toggleHall = async (idx: number, alloc: any) => {
+        const open = !openHalls[idx];
+        setOpenHalls(prev => ({ ...prev, [idx]: open }));
+        if (!open || (sketches[idx] && sketches[idx] !== 'error')) return;
+
+        setSketches(prev => ({ ...prev, [idx]: 'loading' }));
+        try {
+            const sketch = await getHallSketch(alloc.hallName, alloc.session);
+            setSketches(prev => ({ ...prev, [idx]: sketch }));
+        } catch {
+            setSketches(prev => ({ ...prev, [idx]: 'error' }));
+        }
+    };
+
     return (
         <div className="min-h-screen bg-white dark:bg-gray-950 pt-36 md:pt-32 pb-12 px-4 transition-colors duration-300">
             <div className="max-w-xl mx-auto space-y-8 animate-fade-in">
@@ -178,25 +198,44 @@ const StudentDashboard = () => {
 
 
 
-                                    {/* Seating Grid */}
-                                    {alloc.hallSeating && (
-                                        <div className="mt-8 border-t border-gray-100 dark:border-gray-800 pt-8">
-                                            <h4 className="text-lg font-semibold text-gray-900 dark:text-white mb-6 flex items-center gap-2">
-                                                <div className="w-2 h-8 bg-primary-500 rounded-full"></div>
-                                                Seating Arrangement
-                                            </h4>
-                                            {/* Adjusted Grid for Mobile/Desktop */}
-                                            <div className="bg-gray-50 dark:bg-gray-950/50 p-2 md:p-4 rounded-2xl overflow-x-auto">
-                                                <SeatingGrid
-                                                    hallSeating={alloc.hallSeating}
-                                                    colorMap={colorMap}
-                                                    highlightStudentId={registerNumber}
-                                                    compact={true}
-                                                />
+                                    {/* Seating Grid (loaded on demand) */}
+                                    <div className="mt-8 border-t border-gray-100 dark:border-gray-800 pt-8">
+                                        <button
+                                            type="button"
+                                            onClick={() => toggleHall(idx, alloc)}
+                                            aria-expanded={!!openHalls[idx]}
+                                            className="w-full text-lg font-semibold text-gray-900 dark:text-white flex items-center gap-2"
+                                        >
+                                            <div className="w-2 h-8 bg-primary-500 rounded-full"></div>
+                                            Seating Arrangement
+                                            <ChevronDown size={20} className={`ml-auto transition-transform ${openHalls[idx] ? 'rotate-180' : ''}`} />
+                                        </button>
+                                        {openHalls[idx] && (
+                                            <div className="mt-6">
+                                                {sketches[idx] === 'loading' && (
+                                                    <div className="flex justify-center py-6">
+                                                        <div className="w-6 h-6 border-2 border-primary-500/30 border-t-primary-500 rounded-full animate-spin" />
+                                                    </div>
+                                                )}
+                                                {sketches[idx] === 'error' && (
+                                                    <p className="text-sm text-red-600 dark:text-red-400 text-center">
+                                                        Could not load the hall layout. Please try again.
+                                                    </p>
+                                                )}
+                                                {sketches[idx] && typeof sketches[idx] === 'object' && (
+                                                    /* Adjusted Grid for Mobile/Desktop */
+                                                    <div className="bg-gray-50 dark:bg-gray-950/50 p-2 md:p-4 rounded-2xl overflow-x-auto">
+                                                        <SeatingGrid
+                                                            hallSeating={sketches[idx] as HallSeating}
+                                                            colorMap={colorMap}
+                                                            highlightStudentId={registerNumber}
+                                                            compact={true}
+                                                        />
+                                                    </div>
+                                                )}
                                             </div>
-
-                                        </div>
-                                    )}
+                                        )}
+                                    </div>
                                 </div>
                             </div>
                         ))}
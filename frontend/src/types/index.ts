@@ -73,6 +73,33 @@ export interface UploadFileResponse {
     message: string;
     studentsCount: number;
     students: Student[];
+    warnings?: string[];
+    validation?: ValidationReport;
+    mode?: 'replace' | 'append';
+    skipped?: number;
+    affectedSessions?: string[];
+}
+
+export interface ValidationReport {
+    rows: number;
+    sessions: number;
+    issueCount: number;
+    issues: Record<string, { count: number; samples: Record<string, unknown>[] }>;
+}
+
+export interface BatchFileReport {
+    filename: string;
+    students: number;
+    duplicates: number;
+    seconds: number;
+    cached: boolean;
+    warnings: string[];
+    error?: string;
+}
+
+export interface BatchUploadResponse extends UploadFileResponse {
+    files: BatchFileReport[];
+    seconds: number;
 }
 
 // Statistics
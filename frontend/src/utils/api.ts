@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Hall, Student, UploadFileResponse, SeatingResult, AdminUser, AuditLog, HallFormData, GenericResponse, AuthResponse, SecurityQuestionResponse } from '../types';
+import type { Hall, Student, UploadFileResponse, BatchUploadResponse, SeatingResult, HallSeating, AdminUser, AuditLog, HallFormData, GenericResponse, AuthResponse, SecurityQuestionResponse } from '../types';
 
 // Environment-aware API URL configuration
 const API_BASE_URL = import.meta.env.VITE_API_URL ||
@@ -170,9 +170,10 @@ export const updateProfile = async (data: { username?: string; current_password:
 };
 
 // File Upload
-export const uploadFile = async (file: File): Promise<UploadFileResponse> => {
+export const uploadFile = async (file: File, mode: 'replace' | 'append' = 'replace'): Promise<UploadFileResponse> => {
     const formData = new FormData();
     formData.append('file', file);
+    formData.append('mode', mode);
 
     const response = await axios.post(`${API_BASE_URL}/upload`, formData, {
         withCredentials: true, // Added for authentication
@@ -185,6 +186,75 @@ export const uploadFile = async (file: File): Promise<UploadFileResponse> => {
     return response.data;
 };
 
+// Upload several roster files (PDF/CSV/XLSX) as one dataset
+export const uploadFiles = async (files: File[], mode: 'replace' | 'append' = 'replace'): Promise<BatchUploadResponse> => {
+    const formData = new FormData();
+    files.forEach(file => formData.append('files', file));
+    formData.append('mode', mode);
+
+    const response = await axios.post(`${API_BASE_URL}/upload/batch`, formData, {
+        withCredentials: true,
+        headers: {
+            'Content-Type': 'multipart/form-data',
+            'X-CSRFToken': csrfToken,
+        },
+    });
+
+    return response.data;
+};
+
+const MAX_CHUNK_RETRIES = 5;
+
+// Hex SHA-256 of one chunk; crypto.subtle only exists in secure contexts (not plain-http LAN installs)
+const chunkSha256 = async (chunk: ArrayBuffer): Promise<string | undefined> => {
+    if (typeof crypto === 'undefined' || !crypto.subtle) return undefined;
+    const digest = await crypto.subtle.digest('SHA-256', chunk);
+    return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+};
+
+// Upload a large roster in resumable chunks; a dropped connection only resends the chunk in flight.
+// Each chunk carries its own checksum, so the file is never read into memory whole.
+export const uploadFileChunked = async (
+    file: File,
+    mode: 'replace' | 'append' = 'replace',
+    onProgress?: (sent: number, total: number) => void,
+): Promise<UploadFileResponse> => {
+    const started = await api.post('/upload/chunked', { filename: file.name, size: file.size, mode });
+    const { uploadId, chunkSize } = started.data;
+    let offset = 0;
+    let failures = 0;
+
+    while (offset < file.size) {
+        try {
+            const chunk = await file.slice(offset, offset + chunkSize).arrayBuffer();
+            const sha256 = await chunkSha256(chunk);
+            const response = await api.put(`/upload/chunked/${uploadId}`, chunk, {
+                params: { offset },
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                    ...(sha256 ? { 'X-Content-SHA256': sha256 } : {}),
+                },
+                timeout: 120000,
+            });
+            offset = response.data.offset;
+            failures = 0;
+            onProgress?.(offset, file.size);
+        } catch (error) {
+            if (++failures > MAX_CHUNK_RETRIES) throw error;
+            // Resume from what the server actually received (keep the offset if it is unreachable)
+            try {
+                const status = await api.get(`/upload/chunked/${uploadId}`);
+                offset = status.data.offset;
+            } catch {
+                await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+            }
+        }
+    }
+
+    const response = await api.post(`/upload/chunked/${uploadId}/complete`, {}, { timeout: 0 });
+    return response.data;
+};
+
 // Hall Management
 export const getHalls = async (): Promise<Hall[]> => {
     const response = await api.get('/halls');
@@ -227,12 +297,13 @@ export const initializeDefaultHalls = async (): Promise<Hall[]> => {
 };
 
 // Seating Generation
-export const generateSeating = async (): Promise<{ success: boolean, sessions: string[] }> => {
-    const response = await api.post('/generate');
+// options.pendingOnly regenerates only sessions left without allocations by an append upload
+export const generateSeating = async (options: { sessions?: string[], pendingOnly?: boolean } = {}): Promise<{ success: boolean, sessions: string[] }> => {
+    const response = await api.post('/generate', options);
     return response.data;
 };
 
-export const getSessions = async (): Promise<{ success: boolean, sessions: string[] }> => {
+export const getSessions = async (): Promise<{ success: boolean, sessions: string[], pending?: string[] }> => {
     const response = await api.get('/sessions'); // Note: bp prefix is /api, route is /sessions. So /api/sessions. Wait, bp url_prefix is /api in seating.py? Yes.  
     return response.data;
 };
@@ -246,6 +317,26 @@ export const getSessionSeating = async (session: string): Promise<SeatingResult>
     return response.data;
 };
 
+export interface SessionHallSummary {
+    name: string;
+    block: string;
+    studentsCount: number;
+    subjects: Record<string, number>;
+    departments: Record<string, number>;
+}
+
+// Per-hall summary of a session (no grids)
+export const getSessionHalls = async (session: string): Promise<{ success: boolean, totalStudents: number, hallsUsed: number, halls: SessionHallSummary[] }> => {
+    const response = await api.get(`/seating/${encodeURIComponent(session)}/halls`);
+    return response.data;
+};
+
+// Grid of a single hall in a session
+export const getSessionHallSeating = async (session: string, hallName: string): Promise<HallSeating> => {
+    const response = await api.get(`/seating/${encodeURIComponent(session)}/halls/${encodeURIComponent(hallName)}`);
+    return response.data;
+};
+
 // Download Excel
 // Download Excel
 export const downloadHallWiseExcel = async (session?: string): Promise<void> => {
@@ -322,11 +413,35 @@ export const getStudents = async (): Promise<Student[]> => {
     return response.data;
 };
 
-// Search Student Allocation
+export interface StudentPage {
+    students: Student[];
+    nextCursor: string | null;
+}
+
+export interface StudentFilters {
+    examDate?: string;
+    session?: string;
+    department?: string;
+    subject?: string;
+}
+
+// Keyset-paginated student list (ordered by exam date, session, register number)
+export const getStudentPage = async (limit = 100, cursor?: string | null, filters: StudentFilters = {}): Promise<StudentPage> => {
+    const response = await api.get('/students', { params: { ...filters, limit, cursor: cursor || undefined } });
+    return response.data;
+};
+
+// Search Student Allocation (seat facts only; hall grid via getHallSketch)
 export const searchStudent = async (registerNumber: string): Promise<any> => {
     const response = await api.post('/search', { registerNumber });
     return response.data;
 };
+
+// Hall grid for one hall in one session (cacheable)
+export const getHallSketch = async (hallName: string, session: string): Promise<HallSeating> => {
+    const response = await api.get(`/halls/${encodeURIComponent(hallName)}/sketch`, { params: { session } });
+    return response.data;
+};
 // Admin Management
 export const getAdmins = async (): Promise<AdminUser[]> => {
     const response = await api.get('/admin/users');
@@ -346,6 +461,21 @@ export const getAuditLogs = async (): Promise<AuditLog[]> => {
     return response.data.logs;
 };
 
+export interface AuditLogQuery {
+    limit?: number;
+    cursor?: string | null;
+    action?: string;
+    admin?: string | number;
+    from?: string;
+    to?: string;
+}
+
+// Newest-first keyset page of the audit log
+export const getAuditLogPage = async (query: AuditLogQuery = {}): Promise<{ logs: AuditLog[]; nextCursor: string | null }> => {
+    const response = await api.get('/admin/logs', { params: { ...query, cursor: query.cursor || undefined } });
+    return { logs: response.data.logs, nextCursor: response.data.nextCursor };
+};
+
 export const clearAuditLogs = async (): Promise<void> => {
     const response = await api.delete('/admin/logs');
     return response.data;